@@ -1,4 +1,19 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from anastruct.fem.system import SystemElements
 from anastruct.fem.util.load import LoadCase, LoadCombination
-from anastruct.preprocess import truss
+from anastruct.fem.util.result_store import ResultStore
 from anastruct.vertex import Vertex
+
+if TYPE_CHECKING:
+    from anastruct.preprocess import truss
+
+
+def __getattr__(name: str) -> Any:
+    # the truss generators are imported on first use
+    if name == "truss":
+        module = importlib.import_module("anastruct.preprocess.truss")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,6 @@
-from typing import Any, Sequence, Tuple
+import importlib
+from types import ModuleType
+from typing import Any, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -41,6 +43,28 @@ def integrate_array(y: np.ndarray, dx: float) -> np.ndarray:
     return np.cumsum(y) * dx
 
 
+class LazyModule:
+    """Module that is imported on first use, so that importing anastruct does not pay for heavy
+    dependencies like matplotlib and scipy that a program may never use."""
+
+    def __init__(self, name: str):
+        """Create a lazy module
+
+        Args:
+            name (str): Full name of the module, e.g. "scipy.linalg"
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name}>"
+
+
 class FEMException(Exception):
     def __init__(self, type_: str, message: str):
         """Exception for FEM
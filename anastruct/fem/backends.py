@@ -0,0 +1,818 @@
+"""Linear solver backends for the reduced system matrix.
+
+A backend factorizes the reduced system matrix once, after which the factorization solves any number of
+right hand sides (load cases, low-rank corrections, adjoint systems). The "auto" backend picks a backend
+from the symmetry, size, bandwidth and density of the matrix. Backends with a sparse matrix_format get a
+sparse (CSR) system matrix, which is never assembled dense. The auto backend decides the format from
+the size and bandwidth of the structure before it is assembled. Custom backends subclass SolverBackend
+and are passed to SystemElements.set_solver_backend.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import inspect
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from anastruct.basic import FEMException, LazyModule
+
+if TYPE_CHECKING:
+    from scipy import linalg, sparse  # type: ignore
+    from scipy.sparse import linalg as sparse_linalg  # type: ignore
+
+    from anastruct.types import SystemMatrix
+else:
+    # scipy is imported on the first solve
+    linalg = LazyModule("scipy.linalg")
+    sparse = LazyModule("scipy.sparse")
+    sparse_linalg = LazyModule("scipy.sparse.linalg")
+
+
+class Factorization(ABC):
+    """Factorized reduced system matrix"""
+
+    backend = ""
+
+    @abstractmethod
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        """Solve the factorized system
+
+        Args:
+            rhs (np.ndarray): Right hand side vector (n,) or matrix (n, k)
+            transposed (bool, optional): Solve with the transposed matrix. Defaults to False.
+
+        Returns:
+            np.ndarray: Solution with the shape of rhs
+        """
+
+    @abstractmethod
+    def pivots(self) -> Optional[np.ndarray]:
+        """Magnitudes of the pivots of the factorization. A (nearly) zero pivot indicates a singular
+        matrix, i.e. an unstable structure.
+
+        Returns:
+            Optional[np.ndarray]: Pivots, None if the backend does not determine them
+        """
+
+    def is_stable(self, min_pivot: float = 1e-9) -> bool:
+        """Whether all pivots exceed a minimum value. For symmetric matrices the pivots are positive
+        if and only if the matrix is positive definite. Backends without pivots are assumed stable.
+
+        Args:
+            min_pivot (float, optional): Minimum value of the pivots. Defaults to 1e-9.
+
+        Returns:
+            bool: True if the factorized structure is stable
+        """
+        pivots = self.pivots()
+        return pivots is None or bool(np.all(pivots > min_pivot))
+
+
+class SolverBackend(ABC):
+    """Factorizes reduced system matrices"""
+
+    name = ""
+    symmetric = False  # only valid for symmetric matrices
+    matrix_format = (
+        "dense"  # format in which the system matrix is assembled: dense or sparse
+    )
+
+    @abstractmethod
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        """Factorize a reduced system matrix
+
+        Args:
+            matrix (SystemMatrix): Reduced system matrix, in the matrix_format of the backend
+            dofs (Optional[np.ndarray], optional): System degree of freedom of every row,
+                (node_id - 1) * 3 + direction - 1, for node based methods. Defaults to None.
+
+        Raises:
+            FEMException: The matrix can not be factorized by this backend
+
+        Returns:
+            Factorization: Factorized matrix
+        """
+
+    def assembly_format(
+        self, size: int, half_bandwidth: int  # pylint: disable=unused-argument
+    ) -> str:
+        """Format in which to assemble a system matrix, known from the connectivity of the structure
+
+        Args:
+            size (int): Number of rows of the system matrix
+            half_bandwidth (int): Upper bound of the half bandwidth of the system matrix
+
+        Returns:
+            str: "dense" or "sparse"
+        """
+        return self.matrix_format
+
+    def accepts(self, matrix: "SystemMatrix") -> bool:
+        """Whether the backend is valid for a matrix, i.e. the matrix is symmetric if required
+
+        Args:
+            matrix (SystemMatrix): Reduced system matrix
+
+        Returns:
+            bool: True if the backend can be used
+        """
+        return not self.symmetric or is_symmetric(matrix)
+
+    def _check_symmetric(self, matrix: "SystemMatrix") -> None:
+        if not self.accepts(matrix):
+            raise FEMException(
+                "Solver error",
+                f"The {self.name} backend requires a symmetric system matrix. "
+                "Rotational springs make the system matrix unsymmetric, use the lu or sparse backend.",
+            )
+
+
+class LUFactorization(Factorization):
+    backend = "lu"
+
+    def __init__(self, lu_piv: Tuple[np.ndarray, np.ndarray]):
+        self.lu_piv = lu_piv
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        solution: np.ndarray = linalg.lu_solve(
+            self.lu_piv, rhs, trans=1 if transposed else 0
+        )
+        return solution
+
+    def pivots(self) -> Optional[np.ndarray]:
+        return np.abs(np.diag(self.lu_piv[0]))
+
+
+class LUBackend(SolverBackend):
+    """Dense LU factorization with partial pivoting, valid for any non-singular matrix"""
+
+    name = "lu"
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        return LUFactorization(linalg.lu_factor(to_dense(matrix)))
+
+
+class CholeskyFactorization(Factorization):
+    backend = "cholesky"
+
+    def __init__(self, factor: np.ndarray):
+        self.factor = factor  # upper triangular
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        solution: np.ndarray = linalg.cho_solve((self.factor, False), rhs)
+        return solution
+
+    def pivots(self) -> Optional[np.ndarray]:
+        return np.diag(self.factor) ** 2
+
+
+class CholeskyBackend(SolverBackend):
+    """Dense Cholesky factorization of a symmetric positive definite matrix, about twice as fast as LU"""
+
+    name = "cholesky"
+    symmetric = True
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        matrix = to_dense(matrix)
+        self._check_symmetric(matrix)
+        try:
+            factor, _ = linalg.cho_factor(matrix, lower=False)
+        except np.linalg.LinAlgError as e:
+            raise _not_positive_definite() from e
+        return CholeskyFactorization(factor)
+
+
+class BandedFactorization(Factorization):
+    backend = "banded"
+
+    def __init__(self, factor: np.ndarray):
+        self.factor = factor  # upper form band storage
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        solution: np.ndarray = linalg.cho_solve_banded((self.factor, False), rhs)
+        return solution
+
+    def pivots(self) -> Optional[np.ndarray]:
+        return np.asarray(self.factor[-1] ** 2)
+
+
+class BandedBackend(SolverBackend):
+    """Cholesky factorization in symmetric band storage. Memory is O(n b) and the factorization
+    O(n b^2) for a half bandwidth b, instead of O(n^2) and O(n^3). The system matrix is assembled
+    sparse and written into band storage, so it is never dense."""
+
+    name = "banded"
+    symmetric = True
+    matrix_format = "sparse"
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        self._check_symmetric(matrix)
+        try:
+            factor = linalg.cholesky_banded(band_storage(matrix), lower=False)
+        except np.linalg.LinAlgError as e:
+            raise _not_positive_definite() from e
+        return BandedFactorization(factor)
+
+
+class SparseFactorization(Factorization):
+    backend = "sparse"
+
+    def __init__(self, lu: sparse_linalg.SuperLU):
+        self.lu = lu
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        solution: np.ndarray = self.lu.solve(
+            np.asarray(rhs, dtype=float), trans="T" if transposed else "N"
+        )
+        return solution
+
+    def pivots(self) -> Optional[np.ndarray]:
+        pivots: np.ndarray = np.abs(self.lu.U.diagonal())
+        return pivots
+
+
+class SparseBackend(SolverBackend):
+    """Sparse direct LU factorization (SuperLU) with a fill reducing ordering, valid for any
+    non-singular matrix"""
+
+    name = "sparse"
+    matrix_format = "sparse"
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        try:
+            lu = sparse_linalg.splu(sparse.csc_matrix(matrix))
+        except RuntimeError as e:
+            raise FEMException(
+                "StabilityError",
+                "The stiffness matrix is singular, which indicates a instable structure. "
+                "Check your support conditions",
+            ) from e
+        return SparseFactorization(lu)
+
+
+class IterativeSolve(NamedTuple):
+    """Report of a solve of an iterative backend
+
+    Attributes:
+        method: "cg" or "minres"
+        preconditioner: Name of the preconditioner
+        iterations: Number of iterations
+        residual: Norm of the residual relative to the norm of the right hand side
+        rtol: Required relative residual
+        warm_started: Whether the previous solution was used as the initial guess
+        converged: Whether the residual reached the tolerance
+    """
+
+    method: str
+    preconditioner: str
+    iterations: int
+    residual: float
+    rtol: float
+    warm_started: bool
+    converged: bool
+
+
+class IterativeFactorization(Factorization):
+    """Not a factorization: the scaled sparse matrix S A S, with S = diag(A)^-1/2, and a preconditioner
+    for an iterative method. Iterating on the scaled system applies the tolerance to every degree of
+    freedom relative to its own stiffness, e.g. to the flexible rotations of slender elements.
+    """
+
+    def __init__(
+        self,
+        backend: "IterativeBackend",
+        matrix: sparse.csr_matrix,
+        scale: np.ndarray,
+        preconditioner: sparse_linalg.LinearOperator,
+    ):
+        self.backend = backend.method
+        self.settings = backend
+        self.matrix = matrix
+        self.scale = scale
+        self.preconditioner = preconditioner
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        # the matrix is symmetric, so the transposed system is the same
+        rhs = np.asarray(rhs, dtype=float)
+        if rhs.ndim == 2:
+            return np.column_stack([self._solve(column, False) for column in rhs.T])
+        return self._solve(rhs, not transposed)
+
+    def _solve(self, rhs: np.ndarray, warm_start: bool) -> np.ndarray:
+        settings = self.settings
+        rhs = self.scale * rhs
+        rhs_norm = float(np.linalg.norm(rhs))
+        if rhs_norm == 0:
+            return np.zeros_like(rhs)
+
+        guess = settings.previous_solution if warm_start else None
+        if guess is not None:
+            guess = guess / self.scale if guess.shape == rhs.shape else None
+        if guess is not None and np.linalg.norm(rhs - self.matrix @ guess) >= rhs_norm:
+            guess = None
+
+        iterations = 0
+
+        def count(_: np.ndarray) -> None:
+            nonlocal iterations
+            iterations += 1
+
+        method = sparse_linalg.cg if settings.method == "cg" else sparse_linalg.minres
+        maxiter = settings.maxiter or 10 * rhs.size
+        solution = guess
+        residual = 1.0 if guess is None else float("inf")
+        tolerance = settings.rtol
+        # minres stops on an estimate of the backward error, so it is restarted with a tighter
+        # tolerance until the actual residual reaches the required one
+        for _ in range(_MAX_RESTARTS):
+            solution, _ = method(
+                self.matrix,
+                rhs,
+                x0=solution,
+                maxiter=maxiter - iterations,
+                M=self.preconditioner,
+                callback=count,
+                **{_tolerance_keyword(settings.method): tolerance},
+            )
+            residual = float(np.linalg.norm(rhs - self.matrix @ solution)) / rhs_norm
+            if residual <= settings.rtol or iterations >= maxiter:
+                break
+            tolerance *= max(settings.rtol / residual, 1e-6)
+        converged = residual <= settings.rtol
+        settings.history.append(
+            IterativeSolve(
+                settings.method,
+                settings.preconditioner,
+                iterations,
+                residual,
+                settings.rtol,
+                guess is not None,
+                converged,
+            )
+        )
+        if not converged:
+            raise FEMException(
+                "Solver error",
+                f"{settings.method} did not converge in {iterations} iterations, "
+                f"the relative residual is {residual:.3g}.",
+            )
+        result: np.ndarray = self.scale * solution
+        if warm_start:
+            settings.previous_solution = result
+        return result
+
+    def pivots(self) -> Optional[np.ndarray]:
+        return None
+
+
+class IterativeBackend(SolverBackend):
+    """Preconditioned conjugate gradients (cg) or minimal residual (minres) iterations on the sparse
+    system matrix, for models too large for a direct factorization. The system matrix is assembled
+    sparse. Every solve starts from the previous solution if that is closer than zero, e.g. for
+    successive load cases and non-linear iterations, and is reported in history.
+
+    Preconditioners:
+        jacobi: Inverse of the diagonal, cheapest to set up.
+        ilu: Incomplete LU factorization with a symmetric ordering, the incomplete Cholesky
+            factorization of a symmetric matrix up to the drop tolerance. Fewest iterations, but
+            memory grows with the fill.
+        amg: Two-level smoothed aggregation of the nodes with a Jacobi smoother and a sparse direct
+            coarse solve. Scales best with the model size.
+    """
+
+    name = "iterative"
+    symmetric = True
+    matrix_format = "sparse"
+    preconditioners = ("jacobi", "ilu", "amg")
+
+    def __init__(
+        self,
+        method: str = "cg",
+        preconditioner: str = "amg",
+        rtol: float = 1e-10,
+        maxiter: Optional[int] = None,
+        drop_tol: float = 1e-4,
+        max_history: int = 1000,
+    ):
+        """Create an iterative backend
+
+        Args:
+            method (str, optional): "cg" for positive definite matrices or "minres", which also
+                handles indefinite ones. Defaults to "cg".
+            preconditioner (str, optional): "jacobi", "ilu" or "amg". Defaults to "amg".
+            rtol (float, optional): Relative tolerance of the residual. Defaults to 1e-10.
+            maxiter (Optional[int], optional): Maximum number of iterations per solve.
+                Defaults to None, which is 10 times the number of degrees of freedom.
+            drop_tol (float, optional): Drop tolerance of the ilu preconditioner. Defaults to 1e-4.
+            max_history (int, optional): Number of solve reports to keep. Defaults to 1000.
+
+        Raises:
+            FEMException: Unknown method or preconditioner
+        """
+        if (
+            method not in _ITERATIVE_METHODS
+            or preconditioner not in self.preconditioners
+        ):
+            raise FEMException(
+                "Wrong parameters",
+                f"Unknown iterative method {method} or preconditioner {preconditioner}.",
+            )
+        self.method = method
+        self.preconditioner = preconditioner
+        self.rtol = rtol
+        self.maxiter = maxiter
+        self.drop_tol = drop_tol
+        self.history: Deque[IterativeSolve] = collections.deque(maxlen=max_history)
+        self.previous_solution: Optional[np.ndarray] = None
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        matrix = sparse.csr_matrix(matrix)
+        self._check_symmetric(matrix)
+        diagonal = matrix.diagonal()
+        if np.any(diagonal <= 0 if self.method == "cg" else diagonal == 0):
+            raise _not_positive_definite()
+        scale = 1.0 / np.sqrt(np.abs(diagonal))
+        scaling = sparse.diags(scale)
+        matrix = (scaling @ matrix @ scaling).tocsr()
+        if self.preconditioner == "ilu":
+            preconditioner = ilu_preconditioner(matrix, self.drop_tol)
+        elif self.preconditioner == "amg":
+            preconditioner = aggregation_preconditioner(matrix, dofs)
+        else:
+            preconditioner = jacobi_preconditioner(matrix)
+        return IterativeFactorization(self, matrix, scale, preconditioner)
+
+
+def jacobi_preconditioner(matrix: sparse.csr_matrix) -> sparse_linalg.LinearOperator:
+    """Inverse of the diagonal of a matrix
+
+    Args:
+        matrix (sparse.csr_matrix): Symmetric matrix with a positive diagonal
+
+    Returns:
+        sparse_linalg.LinearOperator: Preconditioner
+    """
+    inverse_diagonal = 1.0 / np.abs(matrix.diagonal())
+    return sparse_linalg.LinearOperator(
+        matrix.shape, matvec=lambda x: inverse_diagonal * x.ravel(), dtype=float
+    )
+
+
+def ilu_preconditioner(
+    matrix: sparse.csr_matrix, drop_tol: float = 1e-4
+) -> sparse_linalg.LinearOperator:
+    """Incomplete factorization of a symmetric matrix (SuperLU's ILU with a symmetric ordering and
+    diagonal pivoting, so L and U^T have the same structure as an incomplete Cholesky factor)
+
+    Args:
+        matrix (sparse.csr_matrix): Symmetric matrix
+        drop_tol (float, optional): Entries below this tolerance are dropped. Defaults to 1e-4.
+
+    Raises:
+        FEMException: The matrix is singular
+
+    Returns:
+        sparse_linalg.LinearOperator: Preconditioner
+    """
+    try:
+        ilu = sparse_linalg.spilu(
+            sparse.csc_matrix(matrix),
+            drop_tol=drop_tol,
+            fill_factor=20,
+            permc_spec="MMD_AT_PLUS_A",
+            diag_pivot_thresh=0.0,
+            options={"SymmetricMode": True},
+        )
+    except RuntimeError as e:
+        raise _not_positive_definite() from e
+    return sparse_linalg.LinearOperator(matrix.shape, matvec=ilu.solve, dtype=float)
+
+
+def aggregation_preconditioner(
+    matrix: sparse.csr_matrix,
+    dofs: Optional[np.ndarray] = None,
+    theta: float = 0.1,
+) -> sparse_linalg.LinearOperator:
+    """Two-level smoothed aggregation preconditioner, a single level algebraic multigrid cycle.
+
+    Nodes are grouped into aggregates of strongly connected neighbours. Every aggregate gets one coarse
+    degree of freedom per direction (x, y, rotation), which is smoothed with a damped Jacobi step. The
+    coarse matrix P^T A P is factorized with a sparse LU. The cycle applies a Jacobi pre-smoothing step,
+    the coarse correction and a Jacobi post-smoothing step, which keeps the preconditioner symmetric.
+
+    Args:
+        matrix (sparse.csr_matrix): Symmetric positive definite matrix
+        dofs (Optional[np.ndarray], optional): System degree of freedom of every row,
+            (node_id - 1) * 3 + direction - 1. Defaults to None, which treats every row as a node.
+        theta (float, optional): Minimum relative strength of a connection between nodes.
+            Defaults to 0.1.
+
+    Returns:
+        sparse_linalg.LinearOperator: Preconditioner
+    """
+    n = matrix.shape[0]
+    if dofs is None:
+        dofs = np.arange(n) * 3
+    node = dofs // 3
+    direction = dofs % 3
+
+    # strength of the connections between the nodes, from the sums of the absolute block entries
+    _, node_index = np.unique(node, return_inverse=True)
+    n_nodes = int(node_index.max()) + 1 if n else 0
+    to_node = sparse.csr_matrix((np.ones(n), (np.arange(n), node_index)), (n, n_nodes))
+    node_matrix = (to_node.T @ abs(matrix) @ to_node).tocoo()
+    node_diagonal = node_matrix.diagonal()
+    strong = (node_matrix.row != node_matrix.col) & (
+        node_matrix.data
+        >= theta
+        * np.sqrt(node_diagonal[node_matrix.row] * node_diagonal[node_matrix.col])
+    )
+    graph = sparse.csr_matrix(
+        (
+            np.ones(int(strong.sum())),
+            (node_matrix.row[strong], node_matrix.col[strong]),
+        ),
+        (n_nodes, n_nodes),
+    )
+    aggregate = _aggregate(graph)
+
+    # tentative prolongation: one column per aggregate and direction
+    columns = aggregate[node_index] * 3 + direction
+    _, columns = np.unique(columns, return_inverse=True)
+    tentative = sparse.csr_matrix((np.ones(n), (np.arange(n), columns)))
+
+    inverse_diagonal = 1.0 / matrix.diagonal()
+    scaled = sparse.diags(inverse_diagonal) @ matrix
+    omega = 4.0 / (3.0 * _spectral_radius(scaled))
+    prolongation = (tentative - omega * (scaled @ tentative)).tocsr()
+    coarse = sparse_linalg.splu(
+        sparse.csc_matrix(prolongation.T @ matrix @ prolongation)
+    )
+
+    def cycle(residual: np.ndarray) -> np.ndarray:
+        residual = residual.ravel()
+        x = omega * inverse_diagonal * residual
+        x = x + prolongation @ coarse.solve(prolongation.T @ (residual - matrix @ x))
+        result: np.ndarray = x + omega * inverse_diagonal * (residual - matrix @ x)
+        return result
+
+    return sparse_linalg.LinearOperator(matrix.shape, matvec=cycle, dtype=float)
+
+
+def _aggregate(graph: sparse.csr_matrix) -> np.ndarray:
+    """Greedy aggregation: nodes of which no neighbour is aggregated yet form an aggregate with their
+    neighbours, the remaining nodes join an aggregate of a neighbour or form their own.
+    """
+    n = graph.shape[0]
+    aggregate = np.full(n, -1)
+    indptr, indices = graph.indptr, graph.indices
+    count = 0
+    for i in range(n):
+        neighbours = indices[indptr[i] : indptr[i + 1]]
+        if aggregate[i] < 0 and np.all(aggregate[neighbours] < 0):
+            aggregate[i] = count
+            aggregate[neighbours] = count
+            count += 1
+    for node in np.flatnonzero(aggregate < 0):
+        neighbours = indices[indptr[node] : indptr[node + 1]]
+        joined = aggregate[neighbours]
+        joined = joined[joined >= 0]
+        if joined.size:
+            aggregate[node] = joined[0]
+        else:
+            aggregate[node] = count
+            count += 1
+    return aggregate
+
+
+def _spectral_radius(matrix: sparse.csr_matrix, iterations: int = 15) -> float:
+    """Estimate of the spectral radius of a matrix by power iteration"""
+    x = np.random.default_rng(0).random(matrix.shape[0])
+    radius = 1.0
+    for _ in range(iterations):
+        y = matrix @ x
+        norm = float(np.linalg.norm(y))
+        if norm == 0:
+            break
+        radius = norm / float(np.linalg.norm(x))
+        x = y / norm
+    return radius
+
+
+class AutoBackend(SolverBackend):
+    """Choose a backend from the matrix: unsymmetric matrices use LU (sparse LU if large and sparse),
+    symmetric matrices Cholesky, banded Cholesky if the bandwidth is small relative to the size or
+    sparse LU if large and sparse. Matrices that are not positive definite fall back to LU.
+    Structures that qualify for the banded or sparse backends are assembled sparse.
+    """
+
+    name = "auto"
+    banded_min_size = 200
+    banded_max_ratio = 0.1  # maximum half bandwidth relative to the size
+    sparse_min_size = 1000
+    sparse_max_density = 0.05
+
+    def assembly_format(self, size: int, half_bandwidth: int) -> str:
+        if self._is_banded(size, half_bandwidth) or size >= self.sparse_min_size:
+            return "sparse"
+        return "dense"
+
+    def _is_banded(self, size: int, half_bandwidth: int) -> bool:
+        return (
+            size >= self.banded_min_size
+            and half_bandwidth <= self.banded_max_ratio * size
+        )
+
+    def select(self, matrix: "SystemMatrix") -> SolverBackend:
+        """Backend to use for a matrix
+
+        Args:
+            matrix (SystemMatrix): Reduced system matrix, dense or sparse
+
+        Returns:
+            SolverBackend: Selected backend
+        """
+        n = matrix.shape[0]
+        nonzeros = (
+            sparse.csr_matrix(matrix).count_nonzero()
+            if sparse.issparse(matrix)
+            else np.count_nonzero(matrix)
+        )
+        large_and_sparse = (
+            n >= self.sparse_min_size and nonzeros <= self.sparse_max_density * n**2
+        )
+        if not is_symmetric(matrix):
+            return SparseBackend() if large_and_sparse else LUBackend()
+        if self._is_banded(n, bandwidth(matrix)):
+            return BandedBackend()
+        if large_and_sparse:
+            return SparseBackend()
+        return CholeskyBackend()
+
+    def factorize(
+        self, matrix: "SystemMatrix", dofs: Optional[np.ndarray] = None
+    ) -> Factorization:
+        backend = self.select(matrix)
+        try:
+            return backend.factorize(matrix, dofs)
+        except FEMException:
+            if not backend.symmetric:
+                raise
+            # not positive definite, e.g. an unstable structure
+            return LUBackend().factorize(matrix)
+
+
+BACKENDS: Dict[str, Callable[[], SolverBackend]] = {
+    "auto": AutoBackend,
+    "lu": LUBackend,
+    "cholesky": CholeskyBackend,
+    "banded": BandedBackend,
+    "sparse": SparseBackend,
+    "cg": lambda: IterativeBackend("cg"),
+    "minres": lambda: IterativeBackend("minres"),
+}
+
+
+def get_backend(backend: Union[str, SolverBackend]) -> SolverBackend:
+    """Look up a backend by name
+
+    Args:
+        backend (Union[str, SolverBackend]): Name in BACKENDS or a backend
+
+    Raises:
+        FEMException: Unknown backend name
+
+    Returns:
+        SolverBackend: Backend
+    """
+    if isinstance(backend, SolverBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise FEMException(
+            "Wrong parameters",
+            f"Unknown solver backend {backend}, choose one of {', '.join(BACKENDS)}.",
+        )
+    return BACKENDS[backend]()
+
+
+def is_symmetric(matrix: "SystemMatrix", rtol: float = 1e-10) -> bool:
+    """Whether a matrix is symmetric, relative to its largest entry
+
+    Args:
+        matrix (SystemMatrix): Square dense or sparse matrix
+        rtol (float, optional): Tolerance relative to the largest entry. Defaults to 1e-10.
+
+    Returns:
+        bool: True if symmetric
+    """
+    if matrix.shape[0] == 0:
+        return True
+    if sparse.issparse(matrix):
+        difference = abs(matrix - matrix.T)
+        if difference.nnz == 0:
+            return True
+        return bool(difference.max() <= rtol * abs(matrix).max())
+    return bool(np.max(np.abs(matrix - matrix.T)) <= rtol * np.max(np.abs(matrix)))
+
+
+def to_dense(matrix: "SystemMatrix") -> np.ndarray:
+    """Dense array of a dense or sparse matrix
+
+    Args:
+        matrix (SystemMatrix): Matrix
+
+    Returns:
+        np.ndarray: Dense matrix, the matrix itself if it is dense already
+    """
+    if sparse.issparse(matrix):
+        dense: np.ndarray = sparse.csr_matrix(matrix).toarray()
+        return dense
+    return np.asarray(matrix)
+
+
+def bandwidth(matrix: "SystemMatrix") -> int:
+    """Half bandwidth of a matrix: the largest distance of a nonzero entry to the diagonal
+
+    Args:
+        matrix (SystemMatrix): Square dense or sparse matrix
+
+    Returns:
+        int: Half bandwidth
+    """
+    if sparse.issparse(matrix):
+        coo = sparse.coo_matrix(matrix)
+        rows, cols = coo.row[coo.data != 0], coo.col[coo.data != 0]
+    else:
+        rows, cols = np.nonzero(matrix)
+    return int(np.max(np.abs(rows - cols))) if rows.size else 0
+
+
+def band_storage(
+    matrix: "SystemMatrix", half_bandwidth: Optional[int] = None
+) -> np.ndarray:
+    """Upper form LAPACK band storage of a symmetric matrix: ab[b + i - j, j] = matrix[i, j].
+    The entries of a sparse matrix are written directly into the band storage.
+
+    Args:
+        matrix (SystemMatrix): Symmetric dense or sparse matrix
+        half_bandwidth (Optional[int], optional): Half bandwidth b. Defaults to None, which
+            determines it from the matrix.
+
+    Returns:
+        np.ndarray: (b + 1, n) band storage
+    """
+    b = bandwidth(matrix) if half_bandwidth is None else half_bandwidth
+    n = matrix.shape[0]
+    storage = np.zeros((b + 1, n))
+    if sparse.issparse(matrix):
+        upper = sparse.triu(matrix, format="coo")
+        np.add.at(storage, (b + upper.row - upper.col, upper.col), upper.data)
+        return storage
+    for k in range(b + 1):
+        storage[b - k, k:] = np.diagonal(matrix, k)
+    return storage
+
+
+def _not_positive_definite() -> FEMException:
+    return FEMException(
+        "StabilityError",
+        "The stiffness matrix is not positive definite, which indicates a instable structure. "
+        "Check your support conditions",
+    )
+
+
+_MAX_RESTARTS = 10
+
+_ITERATIVE_METHODS = ("cg", "minres")
+
+
+@functools.lru_cache(maxsize=None)
+def _tolerance_keyword(method: str) -> str:
+    """scipy renamed the tolerance of the iterative solvers from tol to rtol"""
+    parameters = inspect.signature(getattr(sparse_linalg, method)).parameters
+    return "rtol" if "rtol" in parameters else "tol"
@@ -0,0 +1,277 @@
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
+
+import numpy as np
+
+from anastruct.basic import FEMException, LazyModule
+from anastruct.fem.backends import (
+    LUBackend,
+    LUFactorization,
+    SparseBackend,
+    SparseFactorization,
+)
+
+if TYPE_CHECKING:
+    from scipy import linalg, sparse  # type: ignore
+    from scipy.sparse import linalg as sparse_linalg  # type: ignore
+
+    from anastruct.fem.system import SystemElements
+    from anastruct.types import AxisNumber, SystemMatrix
+else:
+    # scipy is imported on the first solve
+    linalg = LazyModule("scipy.linalg")
+    sparse = LazyModule("scipy.sparse")
+    sparse_linalg = LazyModule("scipy.sparse.linalg")
+
+
+class DenseLU(NamedTuple):
+    """LU factorization with partial pivoting of a dense matrix, see scipy.linalg.lu_factor
+
+    Attributes:
+        lu: Factors L and U in one matrix
+        piv: Pivot indices
+    """
+
+    lu: np.ndarray
+    piv: np.ndarray
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solve the factorized system for a vector (n,) or matrix (n, k)"""
+        solution: np.ndarray = linalg.lu_solve((self.lu, self.piv), rhs)
+        return solution
+
+    def pivots(self) -> np.ndarray:
+        """Magnitudes of the pivots"""
+        return np.abs(np.diag(self.lu))
+
+
+class SparseLU(NamedTuple):
+    """Sparse LU factorization Pr A Pc = L U of SuperLU (scipy.sparse.linalg.splu). Unlike the SuperLU
+    object it consists of arrays and sparse matrices, so it can be pickled.
+
+    Attributes:
+        lower: Unit lower triangular factor L, CSR
+        upper: Upper triangular factor U, CSR
+        perm_r: Row permutation Pr
+        perm_c: Column permutation Pc
+    """
+
+    lower: "sparse.csr_matrix"
+    upper: "sparse.csr_matrix"
+    perm_r: np.ndarray
+    perm_c: np.ndarray
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solve the factorized system for a vector (n,) or matrix (n, k)"""
+        permuted = np.empty(np.shape(rhs))
+        permuted[self.perm_r] = rhs
+        permuted = sparse_linalg.spsolve_triangular(
+            self.lower, permuted, lower=True, unit_diagonal=True
+        )
+        permuted = sparse_linalg.spsolve_triangular(self.upper, permuted, lower=False)
+        solution: np.ndarray = permuted[self.perm_c]
+        return solution
+
+    def pivots(self) -> np.ndarray:
+        """Magnitudes of the pivots"""
+        pivots: np.ndarray = np.abs(self.upper.diagonal())
+        return pivots
+
+
+class CompiledResults(NamedTuple):
+    """Results of CompiledSystem.solve. With multiple load cases every array has a leading load case axis.
+
+    Attributes:
+        displacements: System displacement vector(s)
+        element_forces: End forces (n_elements, 6) of the elements, in the order of element_ids
+        reactions: System vector(s) with the reaction forces at the supported degrees of freedom
+    """
+
+    displacements: np.ndarray
+    element_forces: np.ndarray
+    reactions: np.ndarray
+
+
+class CompiledSystem(NamedTuple):
+    """Immutable snapshot of the topology, supports and stiffness of a structure, with the factorization
+    of its reduced system matrix. Solving load cases needs no per-element Python work and the arrays are
+    read-only, so one object can be shared between threads. It is cheap to pickle.
+
+    Force vectors are system force vectors: index (node_id - 1) * 3 + direction - 1, see dof().
+
+    Attributes:
+        n_dofs: Number of degrees of freedom of the system
+        remainder_indexes: Free degrees of freedom
+        supported_indexes: Supported degrees of freedom
+        factorization: LU factorization of the reduced system matrix, sparse if the system matrix
+            is assembled sparse
+        support_rows: Rows of the system matrix of the supported degrees of freedom, in the format
+            of the system matrix
+        element_ids: Element ids, in the order of the element arrays
+        element_dofs: (n_elements, 6) system degrees of freedom of the element ends
+        element_stiffness: (n_elements, 6, 6) element stiffness matrices
+        force_vector: System force vector of the loads at compile time
+        primary_forces: (n_elements, 6) primary element forces of the loads at compile time
+    """
+
+    n_dofs: int
+    remainder_indexes: np.ndarray
+    supported_indexes: np.ndarray
+    factorization: Union[DenseLU, SparseLU]
+    support_rows: "SystemMatrix"
+    element_ids: np.ndarray
+    element_dofs: np.ndarray
+    element_stiffness: np.ndarray
+    force_vector: np.ndarray
+    primary_forces: np.ndarray
+
+    def dof(self, node_id: int, direction: "AxisNumber") -> int:
+        """Index of a degree of freedom in the system vectors
+
+        Args:
+            node_id (int): ID of the node
+            direction (AxisNumber): 1 = x, 2 = y, 3 = rotation
+
+        Returns:
+            int: Index in the force and displacement vectors
+        """
+        return (node_id - 1) * 3 + direction - 1
+
+    def solve(self, force_vectors: Optional[np.ndarray] = None) -> CompiledResults:
+        """Solve one or more load cases.
+
+        Args:
+            force_vectors (Optional[np.ndarray], optional): System force vector (n_dofs,) or one
+                row per load case (n_cases, n_dofs). Element forces only contain the nodal loads.
+                Defaults to None, which solves the loads at compile time including the primary
+                element forces of the distributed loads.
+
+        Returns:
+            CompiledResults: Displacements, element end forces and reaction forces
+        """
+        forces = self.force_vector if force_vectors is None else force_vectors
+        forces = np.asarray(forces, dtype=float)
+        if forces.shape[-1] != self.n_dofs:
+            raise FEMException(
+                "Wrong parameters",
+                f"The force vectors should have {self.n_dofs} degrees of freedom.",
+            )
+        cases = np.atleast_2d(forces)
+
+        displacements = np.zeros(cases.shape)
+        displacements[:, self.remainder_indexes] = self.factorization.solve(
+            cases[:, self.remainder_indexes].T
+        ).T
+        element_forces = np.einsum(
+            "eij,kej->kei", self.element_stiffness, displacements[:, self.element_dofs]
+        )
+        if force_vectors is None:
+            element_forces += self.primary_forces
+        reactions = np.zeros(cases.shape)
+        reactions[:, self.supported_indexes] = (
+            self.support_rows @ displacements.T
+        ).T - cases[:, self.supported_indexes]
+
+        if forces.ndim == 1:
+            return CompiledResults(displacements[0], element_forces[0], reactions[0])
+        return CompiledResults(displacements, element_forces, reactions)
+
+
+def compile_system(system: "SystemElements") -> CompiledSystem:
+    """Compile the current state of a structure, see SystemElements.compile
+
+    Args:
+        system (SystemElements): Structure to compile
+
+    Raises:
+        FEMException: The reduced system matrix is singular, which indicates an unstable structure
+
+    Returns:
+        CompiledSystem: Immutable model
+    """
+    if (
+        system._factorization is None
+        or system._loads_changed
+        or system._changed_elements
+    ):
+        # solve a fork, so the factorization and results of the structure itself are untouched
+        system = system.fork(results=False)
+        system.solve(force_linear=True, naked=True)
+    assert system._factorization is not None
+    assert system.system_matrix is not None
+    assert system.system_force_vector is not None
+
+    assert system.reduced_system_matrix is not None
+
+    factorization = system._factorization
+    if system._factorized_matrices or not isinstance(
+        factorization, (LUFactorization, SparseFactorization)
+    ):
+        # a plain (sparse) LU factorization is picklable and can be shared between threads, other
+        # backends and low-rank updates are replaced by one of the current matrix in its own format
+        matrix = system.reduced_system_matrix
+        backend = SparseBackend() if sparse.issparse(matrix) else LUBackend()
+        factorization = backend.factorize(matrix)
+    if isinstance(factorization, SparseFactorization):
+        compiled_factorization: Union[DenseLU, SparseLU] = SparseLU(
+            factorization.lu.L.tocsr(),
+            factorization.lu.U.tocsr(),
+            np.array(factorization.lu.perm_r),
+            np.array(factorization.lu.perm_c),
+        )
+    else:
+        assert isinstance(factorization, LUFactorization)
+        compiled_factorization = DenseLU(
+            np.array(factorization.lu_piv[0]), np.array(factorization.lu_piv[1])
+        )
+    pivots = compiled_factorization.pivots()
+    if pivots.size and pivots.min() <= 1e-14 * pivots.max():
+        raise FEMException(
+            "StabilityError",
+            "The stiffness matrix is singular, which indicates a instable structure. "
+            "Check your support conditions",
+        )
+
+    elements = list(system.element_map.values())
+    remainder_indexes = np.array(system._remainder_indexes, dtype=int)
+    supported = np.ones(system.system_matrix.shape[0], dtype=bool)
+    supported[remainder_indexes] = False
+    supported_indexes = np.flatnonzero(supported)
+
+    compiled = CompiledSystem(
+        n_dofs=system.system_matrix.shape[0],
+        remainder_indexes=remainder_indexes,
+        supported_indexes=supported_indexes,
+        factorization=compiled_factorization,
+        support_rows=_support_rows(system.system_matrix, supported_indexes),
+        element_ids=np.array([el.id for el in elements], dtype=int),
+        element_dofs=np.array(
+            [
+                [(el.node_1.id - 1) * 3 + i for i in range(3)]
+                + [(el.node_2.id - 1) * 3 + i for i in range(3)]
+                for el in elements
+            ],
+            dtype=int,
+        ),
+        element_stiffness=np.array([el.stiffness_matrix for el in elements]),
+        force_vector=np.array(system.system_force_vector),
+        primary_forces=np.array([el.element_primary_force_vector for el in elements]),
+    )
+    _freeze(tuple(compiled))
+    return compiled
+
+
+def _support_rows(matrix: "SystemMatrix", indexes: np.ndarray) -> "SystemMatrix":
+    if sparse.issparse(matrix):
+        return sparse.csr_matrix(matrix)[indexes]
+    return np.array(matrix[indexes])
+
+
+def _freeze(value: Any) -> None:
+    """Make the arrays of a value, or of the values in a tuple, read-only"""
+    if isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif sparse.issparse(value):
+        _freeze((value.data, value.indices, value.indptr))
@@ -0,0 +1,189 @@
+import sys
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Tuple
+
+import numpy as np
+
+from anastruct.basic import LazyModule
+from anastruct.fem.system_components.util import supported_dofs
+
+if TYPE_CHECKING:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse import csgraph  # type: ignore
+
+    from anastruct.fem.system import SystemElements
+else:
+    # scipy is imported on the first solve
+    sparse = LazyModule("scipy.sparse")
+    csgraph = LazyModule("scipy.sparse.csgraph")
+
+
+class ModelComplexity(NamedTuple):
+    """Size of a structure and estimated cost of solving it, see SystemElements.complexity.
+    Bandwidth and profile are those of the reduced system matrix (free degrees of freedom only).
+
+    Attributes:
+        n_nodes: Number of nodes
+        n_elements: Number of elements
+        n_dofs: Degrees of freedom of the system matrix
+        n_free_dofs: Degrees of freedom that remain after applying the supports
+        nnz: Structural nonzeros of the reduced system matrix
+        bandwidth: Half bandwidth of the reduced system matrix in the current node numbering
+        profile: Entries below the diagonal within the envelope (skyline) in the current numbering
+        optimized_bandwidth: Half bandwidth after reverse Cuthill-McKee reordering
+        optimized_profile: Profile after reverse Cuthill-McKee reordering
+        dense_bytes: Memory of the dense system matrix, reduced matrix and LU factorization
+        envelope_bytes: Memory of an envelope LU factorization in the optimized ordering, which
+            bounds the fill of a sparse factorization
+        element_array_bytes: Memory held by the arrays of the elements (matrices and results)
+        system_array_bytes: Memory held by the arrays of the system (system matrices and vectors)
+        object_bytes: Memory of the element and node objects themselves
+    """
+
+    n_nodes: int
+    n_elements: int
+    n_dofs: int
+    n_free_dofs: int
+    nnz: int
+    bandwidth: int
+    profile: int
+    optimized_bandwidth: int
+    optimized_profile: int
+    dense_bytes: int
+    envelope_bytes: int
+    element_array_bytes: int
+    system_array_bytes: int
+    object_bytes: int
+
+    def report(self) -> str:
+        """Human readable summary
+
+        Returns:
+            str: One line per quantity
+        """
+        mb = 1e-6
+        return "\n".join(
+            [
+                f"nodes / elements        {self.n_nodes} / {self.n_elements}",
+                f"dofs (free)             {self.n_dofs} ({self.n_free_dofs})",
+                f"nonzeros                {self.nnz}",
+                f"bandwidth (optimized)   {self.bandwidth} ({self.optimized_bandwidth})",
+                f"profile (optimized)     {self.profile} ({self.optimized_profile})",
+                f"dense solve memory      {self.dense_bytes * mb:.3f} MB",
+                f"envelope LU memory      {self.envelope_bytes * mb:.3f} MB",
+                f"element arrays          {self.element_array_bytes * mb:.3f} MB",
+                f"system arrays           {self.system_array_bytes * mb:.3f} MB",
+                f"objects                 {self.object_bytes * mb:.3f} MB",
+            ]
+        )
+
+
+def model_complexity(system: "SystemElements") -> ModelComplexity:
+    """Determine the complexity of a structure from its connectivity, without assembling it.
+
+    Args:
+        system (SystemElements): Structure
+
+    Returns:
+        ModelComplexity: Sizes and memory estimates
+    """
+    n_dofs = len(system.node_map) * 3
+    elements = list(system.element_map.values())
+
+    supported = np.zeros(n_dofs, dtype=bool)
+    supported[
+        [
+            (node_id - 1) * 3 + direction - 1
+            for node_id, direction in supported_dofs(system)
+        ]
+    ] = True
+    free = np.flatnonzero(~supported)
+    n_free = free.size
+    # position of every system dof in the reduced matrix
+    reduced_index = np.full(n_dofs, -1)
+    reduced_index[free] = np.arange(n_free)
+
+    # sparsity pattern of the reduced system matrix
+    dofs = np.array(
+        [
+            [(el.node_1.id - 1) * 3 + i for i in range(3)]
+            + [(el.node_2.id - 1) * 3 + i for i in range(3)]
+            for el in elements
+        ],
+        dtype=int,
+    ).reshape(-1, 6)
+    reduced = reduced_index[dofs]
+    rows = np.repeat(reduced, 6, axis=1).ravel()
+    cols = np.tile(reduced, (1, 6)).ravel()
+    # the condensed matrices of the superelements couple all their boundary dofs
+    for placed in system.superelement_map.values():
+        reduced = reduced_index[placed.dofs]
+        rows = np.concatenate([rows, np.repeat(reduced, reduced.size)])
+        cols = np.concatenate([cols, np.tile(reduced, reduced.size)])
+    keep = (rows >= 0) & (cols >= 0)
+    pattern = sparse.coo_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int8), (rows[keep], cols[keep])),
+        shape=(n_free, n_free),
+    ).tocsr()
+    pattern.sum_duplicates()
+    pattern.data[:] = 1
+
+    bandwidth, profile = _envelope(pattern, np.arange(n_free))
+    if n_free:
+        order = csgraph.reverse_cuthill_mckee(pattern, symmetric_mode=True)
+    else:
+        order = np.arange(0)
+    optimized_bandwidth, optimized_profile = _envelope(pattern, order)
+
+    float_bytes = np.dtype(float).itemsize
+    element_arrays = sum(_array_bytes(vars(el).values()) for el in elements)
+    system_arrays = _array_bytes(vars(system).values())
+    objects = sum(
+        sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+        for obj in [*elements, *system.node_map.values()]
+    )
+    return ModelComplexity(
+        n_nodes=len(system.node_map),
+        n_elements=len(elements),
+        n_dofs=n_dofs,
+        n_free_dofs=n_free,
+        nnz=pattern.nnz,
+        bandwidth=bandwidth,
+        profile=profile,
+        optimized_bandwidth=optimized_bandwidth,
+        optimized_profile=optimized_profile,
+        dense_bytes=(n_dofs**2 + 2 * n_free**2) * float_bytes,
+        envelope_bytes=(n_free + 2 * optimized_profile) * float_bytes,
+        element_array_bytes=element_arrays,
+        system_array_bytes=system_arrays,
+        object_bytes=objects,
+    )
+
+
+def _envelope(pattern: "sparse.csr_matrix", order: np.ndarray) -> Tuple[int, int]:
+    """Half bandwidth and profile of a symmetric sparsity pattern in the given ordering"""
+    n = pattern.shape[0]
+    if n == 0:
+        return 0, 0
+    position = np.empty(n, dtype=int)
+    position[order] = np.arange(n)
+    coo = pattern.tocoo()
+    rows = position[coo.row]
+    cols = position[coo.col]
+    first = np.arange(n)
+    np.minimum.at(first, rows, cols)
+    return int(np.max(np.abs(rows - cols))), int(np.sum(np.arange(n) - first))
+
+
+def _array_bytes(values: Iterable[object]) -> int:
+    """Memory held by the numpy arrays and sparse matrices among the values"""
+    total = 0
+    for value in values:
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif sparse.issparse(value):
+            total += sum(
+                getattr(value, name).nbytes
+                for name in ("data", "indices", "indptr", "row", "col")
+                if hasattr(value, name)
+            )
+    return total
@@ -0,0 +1,245 @@
+"""Connected components of a structure.
+
+A structure of independent parts, e.g. several frames in one model, has a block diagonal system
+matrix: one block per part. Every block is factorized and solved on its own, which is cheaper than
+factorizing the whole matrix, and large blocks are factorized in parallel. Parts without supports are
+reported by their nodes instead of failing the stability check of the whole structure.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+
+from anastruct.basic import LazyModule
+from anastruct.fem.backends import Factorization, SolverBackend
+
+if TYPE_CHECKING:
+    from scipy import sparse  # type: ignore
+    from scipy.sparse import csgraph  # type: ignore
+
+    from anastruct.fem.system import SystemElements
+    from anastruct.types import SystemMatrix
+else:
+    # scipy is imported on the first solve
+    sparse = LazyModule("scipy.sparse")
+    csgraph = LazyModule("scipy.sparse.csgraph")
+
+# minimum degrees of freedom of a component to factorize and solve it in a separate thread
+PARALLEL_MIN_DOFS = 500
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Component(NamedTuple):
+    """Independent part of a structure, see SystemElements.connected_components
+
+    Attributes:
+        node_ids: Ids of the nodes of the part
+        element_ids: Ids of the elements of the part
+        superelement_ids: Ids of the superelements of the part
+        supported: Whether the supports restrain the translation of the part in every direction.
+            Without, the part is floating and the structure is unstable.
+    """
+
+    node_ids: Tuple[int, ...]
+    element_ids: Tuple[int, ...]
+    superelement_ids: Tuple[int, ...]
+    supported: bool
+
+
+class ComponentFactorization(Factorization):
+    """Factorizations of the diagonal blocks of a block diagonal reduced system matrix,
+    one per connected component"""
+
+    backend = "components"
+
+    def __init__(
+        self,
+        blocks: Sequence[Tuple[np.ndarray, Factorization]],
+        parallel: bool = False,
+    ):
+        """Combine the factorizations of the blocks
+
+        Args:
+            blocks (Sequence[Tuple[np.ndarray, Factorization]]): Rows of every block in the reduced
+                system matrix and the factorization of the block
+            parallel (bool, optional): Solve the blocks in parallel. Defaults to False.
+        """
+        self.blocks = list(blocks)
+        self.parallel = parallel
+
+    def solve(self, rhs: np.ndarray, transposed: bool = False) -> np.ndarray:
+        rhs = np.asarray(rhs, dtype=float)
+        solution = np.zeros_like(rhs)
+        solutions = _map(
+            lambda block: block[1].solve(rhs[block[0]], transposed),
+            self.blocks,
+            self.parallel,
+        )
+        for (indexes, _), block_solution in zip(self.blocks, solutions):
+            solution[indexes] = block_solution
+        return solution
+
+    def pivots(self) -> Optional[np.ndarray]:
+        pivots = [factorization.pivots() for _, factorization in self.blocks]
+        if any(block_pivots is None for block_pivots in pivots):
+            return None
+        return np.concatenate([p for p in pivots if p is not None])
+
+
+def node_labels(system: "SystemElements") -> np.ndarray:
+    """Label the nodes by connected component. Nodes are connected by elements and by the boundary
+    nodes of superelements.
+
+    Args:
+        system (SystemElements): Structure
+
+    Returns:
+        np.ndarray: Component label of every node id - 1
+    """
+    n = max(system.node_map, default=0)
+    edges = [(el.node_id1, el.node_id2) for el in system.element_map.values()]
+    for placed in system.superelement_map.values():
+        edges.extend(zip(placed.node_ids[:-1], placed.node_ids[1:]))
+    pairs = np.array(edges, dtype=int).reshape(-1, 2) - 1
+    graph = sparse.coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(n, n),
+    )
+    _, labels = csgraph.connected_components(graph, directed=False)
+    return np.asarray(labels)
+
+
+def connected_components(system: "SystemElements") -> List[Component]:
+    """Find the independent parts of a structure
+
+    Args:
+        system (SystemElements): Structure
+
+    Returns:
+        List[Component]: Parts, in the order of their lowest node id
+    """
+    labels = node_labels(system)
+    # a single pass over the nodes, elements and superelements, grouped by label
+    groups: Dict[int, Tuple[List[int], List[int], List[int]]] = {}
+    for node_id in sorted(system.node_map):
+        groups.setdefault(int(labels[node_id - 1]), ([], [], []))[0].append(node_id)
+    for el in system.element_map.values():
+        groups[int(labels[el.node_id1 - 1])][1].append(el.id)
+    for superelement_id, placed in system.superelement_map.items():
+        groups[int(labels[placed.node_ids[0] - 1])][2].append(superelement_id)
+    supported = supported_labels(system, labels)
+    return [
+        Component(
+            node_ids=tuple(node_ids),
+            element_ids=tuple(element_ids),
+            superelement_ids=tuple(superelement_ids),
+            supported=label in supported,
+        )
+        for label, (node_ids, element_ids, superelement_ids) in groups.items()
+    ]
+
+
+def supported_labels(system: "SystemElements", labels: np.ndarray) -> Set[int]:
+    """Find the components whose supports restrain the translation in every direction. Springs
+    count as restraints. Rotation of a part about a single support point is not detected here; the
+    stability check of the factorization reports it.
+
+    Args:
+        system (SystemElements): Structure
+        labels (np.ndarray): Component label of every node id - 1, see node_labels
+
+    Returns:
+        Set[int]: Labels of the supported components
+    """
+    x, y = (1.0, 0.0), (0.0, 1.0)
+    # node id and unit vector of every restrained translation
+    restraints: List[Tuple[int, Tuple[float, float]]] = []
+    for node in system.supports_fixed + system.supports_hinged:
+        restraints += [(node.id, x), (node.id, y)]
+    for node, direction in zip(system.supports_roll, system.supports_roll_direction):
+        angle = system.inclined_roll.get(node.id)
+        if angle is not None:
+            restraints.append((node.id, (np.sin(angle), np.cos(angle))))
+        else:
+            restraints.append((node.id, x if direction == 1 else y))
+    for node, roll in system.supports_spring_x:
+        restraints += [(node.id, x)] + ([] if roll else [(node.id, y)])
+    for node, roll in system.supports_spring_y:
+        restraints += [(node.id, y)] + ([] if roll else [(node.id, x)])
+    for node, roll in system.supports_spring_z:
+        if not roll:
+            restraints += [(node.id, x), (node.id, y)]
+    if not restraints:
+        return set()
+    node_ids = np.array([node_id for node_id, _ in restraints])
+    vectors = np.array([vector for _, vector in restraints])
+    # the restrained directions of a component span the plane if the sum of their outer
+    # products is not singular
+    gram = np.zeros((int(labels.max()) + 1, 2, 2))
+    np.add.at(gram, labels[node_ids - 1], vectors[:, :, None] * vectors[:, None, :])
+    return set(np.flatnonzero(np.linalg.det(gram) > 1e-9).tolist())
+
+
+def factorize_components(
+    system: "SystemElements",
+    backend: SolverBackend,
+    matrix: "SystemMatrix",
+    dofs: np.ndarray,
+    parallel_min_dofs: int = PARALLEL_MIN_DOFS,
+) -> Factorization:
+    """Factorize a reduced system matrix per connected component of the structure
+
+    Args:
+        system (SystemElements): Structure of the matrix
+        backend (SolverBackend): Backend that factorizes every block
+        matrix (SystemMatrix): Reduced system matrix
+        dofs (np.ndarray): System degree of freedom of every row of the matrix
+        parallel_min_dofs (int, optional): Minimum size of a block to factorize it in a separate
+            thread, when there are several. Defaults to PARALLEL_MIN_DOFS.
+
+    Raises:
+        FEMException: A block can not be factorized by the backend
+
+    Returns:
+        Factorization: Factorization of the matrix, a ComponentFactorization for several components
+    """
+    dofs = np.asarray(dofs, dtype=int)
+    _, inverse = np.unique(node_labels(system)[dofs // 3], return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+    if len(groups) <= 1:
+        return backend.factorize(matrix, dofs)
+
+    def factorize(indexes: np.ndarray) -> Factorization:
+        if sparse.issparse(matrix):
+            block = sparse.csr_matrix(matrix)[indexes][:, indexes]
+        else:
+            block = matrix[np.ix_(indexes, indexes)]
+        return backend.factorize(block, dofs[indexes])
+
+    parallel = sum(group.size >= parallel_min_dofs for group in groups) > 1
+    factorizations = _map(factorize, groups, parallel)
+    return ComponentFactorization(list(zip(groups, factorizations)), parallel)
+
+
+def _map(function: Callable[[T], R], items: Sequence[T], parallel: bool) -> List[R]:
+    """Apply a function to the items, in a thread pool if parallel. Numpy and scipy release the
+    GIL in the factorizations and solves."""
+    if not parallel:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(function, items))
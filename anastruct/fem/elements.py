@@ -3,7 +3,16 @@ from __future__ import annotations
 import copy
 from functools import lru_cache
 from math import cos, sin
-from typing import TYPE_CHECKING, Dict, List, Literal, Optional
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
 
@@ -31,6 +40,22 @@ except ImportError:
 CACHE_BOUND = 32000
 
 
+class ElementMatrixKey(NamedTuple):
+    """Content key of an element's stiffness matrices. Geometrically identical elements with the same
+    section properties and end conditions share one key, and thereby one (read-only) matrix.
+    """
+
+    EA: float
+    EI: float
+    l: float
+    a1: float
+    a2: float
+    spring_1: Optional[float]
+    spring_2: Optional[float]
+    node_1_hinge: bool
+    node_2_hinge: bool
+
+
 class Element:
     def __init__(
         self,
@@ -44,6 +69,7 @@ class Element:
         type_: ElementType,
         section_name: str,
         spring: Optional[Spring] = None,
+        matrices: Optional[Tuple[ElementMatrixKey, np.ndarray, np.ndarray]] = None,
     ):
         """Create an element object
 
@@ -59,6 +85,9 @@ class Element:
             section_name (str): Section name (for element annotation)
             spring (Optional[Spring], optional): Set a spring at node 1 or node 2.
                 spring={1: k, 2: k}. Defaults to None.
+            matrices (Optional[Tuple[ElementMatrixKey, np.ndarray, np.ndarray]], optional): Matrix
+                key, constitutive and stiffness matrix compiled for many elements at once, see
+                batch_matrices. Defaults to None, which compiles them for this element.
         """
         self.id = id_
         self.type = type_
@@ -72,6 +101,8 @@ class Element:
         self.kinematic_matrix = kinematic_matrix(angle, angle, l)
         self.constitutive_matrix: np.ndarray
         self.stiffness_matrix: np.ndarray
+        # None if the constitutive matrix has been modified and may not be shared
+        self.matrix_key: Optional[ElementMatrixKey] = None
         self.node_id1: int
         self.node_id2: int
         self.node_map: Dict[int, Node]
@@ -97,8 +128,11 @@ class Element:
         self.max_total_deflection: Optional[float] = None
         self.max_extension: Optional[float] = None
         self.nodes_plastic: List[bool] = [False, False]
-        self.compile_constitutive_matrix(initial=True)
-        self.compile_stiffness_matrix()
+        if matrices is None:
+            self.compile_constitutive_matrix()
+            self.compile_stiffness_matrix()
+        else:
+            self.matrix_key, self.constitutive_matrix, self.stiffness_matrix = matrices
         self.section_name = section_name  # needed for element annotation
 
     @property
@@ -190,29 +224,40 @@ class Element:
 
     def compile_stiffness_matrix(self) -> None:
         """Compile the stiffness matrix of the element"""
-        self.stiffness_matrix = stiffness_matrix(
-            self.constitutive_matrix, self.kinematic_matrix
-        )
+        if self.matrix_key is not None:
+            self.stiffness_matrix = cached_stiffness_matrix(
+                self.matrix_key._replace(a1=self.a1, a2=self.a2)
+            )
+        else:
+            self.stiffness_matrix = stiffness_matrix(
+                self.constitutive_matrix, self.kinematic_matrix
+            )
 
     def compile_kinematic_matrix(self) -> None:
         """Compile the kinematic matrix of the element"""
         self.kinematic_matrix = kinematic_matrix(self.a1, self.a2, self.l)
 
-    def compile_constitutive_matrix(self, initial: bool = False) -> None:
-        """Compile the constitutive matrix of the element"""
-        if initial:  # if element is just being created
-            self.constitutive_matrix = constitutive_matrix(
-                self.EA, self.EI, self.l, self.springs, False, False
-            )
-        else:
-            self.constitutive_matrix = constitutive_matrix(
-                self.EA,
-                self.EI,
-                self.l,
-                self.springs,
-                self.node_1.hinge,
-                self.node_2.hinge,
-            )
+    def compile_constitutive_matrix(self) -> None:
+        """Compile the constitutive matrix of the element. End releases (springs of 0) are condensed
+        out of the matrix, which is shared between elements with the same key.
+        """
+        springs = self.springs if self.springs is not None else {}
+        node_1_hinge = springs.get(1) == 0
+        node_2_hinge = springs.get(2) == 0
+        self.matrix_key = ElementMatrixKey(
+            self.EA,
+            self.EI,
+            self.l,
+            self.a1,
+            self.a2,
+            springs.get(1),
+            springs.get(2),
+            node_1_hinge,
+            node_2_hinge,
+        )
+        self.constitutive_matrix = cached_constitutive_matrix(
+            self.matrix_key._replace(a1=0.0, a2=0.0)
+        )
 
     def update_stiffness(self, factor: float, node: Literal[1, 2]) -> None:
         """Update the stiffness matrix of the element
@@ -221,6 +266,9 @@ class Element:
             factor (float): Factor to multiply the stiffness matrix with
             node (Literal[1, 2]): Node ID of the node to update (1 or 2)
         """
+        # the cached matrix is shared with identical elements, so modify a private copy
+        self.constitutive_matrix = np.array(self.constitutive_matrix)
+        self.matrix_key = None
         if node == 1:
             self.constitutive_matrix[1][1] *= factor
             self.constitutive_matrix[1][2] *= factor
@@ -235,7 +283,7 @@ class Element:
         """Compile the geometric non-linear stiffness matrix of the element"""
         self.compile_stiffness_matrix()
         assert self.N_1 is not None
-        self.stiffness_matrix += geometric_stiffness_matrix(
+        self.stiffness_matrix = self.stiffness_matrix + geometric_stiffness_matrix(
             self.l, self.N_1, self.a1, self.a2
         )
 
@@ -311,13 +359,16 @@ def kinematic_matrix(a1: float, a2: float, l: float) -> np.ndarray:
     s1 = sin(a1)
     c2 = cos(a2)
     s2 = sin(a2)
-    return np.array(
+    matrix = np.array(
         [
             [-c1, s1, 0, c2, -s2, 0],
             [s1 / l, c1 / l, -1, -s2 / l, -c2 / l, 0],
             [-s1 / l, -c1 / l, 0, s2 / l, c2 / l, 1],
         ]
     )
+    # the matrix is shared by every element with the same angles and length
+    matrix.setflags(write=False)
+    return matrix
 
 
 def constitutive_matrix(
@@ -335,8 +386,8 @@ def constitutive_matrix(
         EI (float): Bending stiffness
         l (float): Length
         spring (Optional[Spring]): Spring stiffnesses at node 1 and node 2
-        node_1_hinge (Optional[bool]): Whether node 1 is a hinge
-        node_2_hinge (Optional[bool]): Whether node 2 is a hinge
+        node_1_hinge (Optional[bool]): Whether the rotation at node 1 is released
+        node_2_hinge (Optional[bool]): Whether the rotation at node 2 is released
 
     Returns:
         np.ndarray: Constitutive matrix of the element
@@ -345,13 +396,18 @@ def constitutive_matrix(
         [[EA / l, 0, 0], [0, 4 * EI / l, -2 * EI / l], [0, -2 * EI / l, 4 * EI / l]]
     )
 
-    if node_1_hinge or (spring is not None and 1 in spring and spring[1] == 0):
-        matrix[1][1] = matrix[1][2] = matrix[2][1] = 0
+    release_1 = node_1_hinge or (spring is not None and 1 in spring and spring[1] == 0)
+    release_2 = node_2_hinge or (spring is not None and 2 in spring and spring[2] == 0)
 
-    if node_2_hinge or (spring is not None and 2 in spring and spring[2] == 0):
+    # static condensation of a released end rotation: the other end keeps 4 - 2 * 2 / 4 = 3 EI / l
+    if release_1:
+        matrix[1][1] = matrix[1][2] = matrix[2][1] = 0
+        matrix[2][2] = 0 if release_2 else 3 * EI / l
+    if release_2:
         matrix[1][2] = matrix[2][1] = matrix[2][2] = 0
+        matrix[1][1] = 0 if release_1 else 3 * EI / l
 
-    if spring is not None:
+    if spring is not None and EI != 0:  # a truss element has no bending to release
         # stiffness matrix K:
         # [[ k, k ]
         # [ k, k ]]
@@ -391,6 +447,72 @@ def stiffness_matrix(
     return kinematic_transposed_times_constitutive @ var_kinematic_matrix  # type: ignore
 
 
+@lru_cache(CACHE_BOUND)
+def cached_constitutive_matrix(key: ElementMatrixKey) -> np.ndarray:
+    """Generate the constitutive matrix of an element, shared between elements with the same key.
+    The angles in the key should be zeroed, as the constitutive matrix does not depend on them.
+
+    Args:
+        key (ElementMatrixKey): Content key of the element
+
+    Returns:
+        np.ndarray: Read-only constitutive matrix of the element
+    """
+    spring: Spring = {}
+    if key.spring_1 is not None:
+        spring[1] = key.spring_1
+    if key.spring_2 is not None:
+        spring[2] = key.spring_2
+    matrix = constitutive_matrix(
+        key.EA, key.EI, key.l, spring, key.node_1_hinge, key.node_2_hinge
+    )
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(CACHE_BOUND)
+def cached_stiffness_matrix(key: ElementMatrixKey) -> np.ndarray:
+    """Generate the stiffness matrix of an element, shared between elements with the same key
+
+    Args:
+        key (ElementMatrixKey): Content key of the element
+
+    Returns:
+        np.ndarray: Read-only stiffness matrix of the element
+    """
+    matrix = stiffness_matrix(
+        cached_constitutive_matrix(key._replace(a1=0.0, a2=0.0)),
+        kinematic_matrix(key.a1, key.a2, key.l),
+    )
+    matrix.setflags(write=False)
+    return matrix
+
+
+def element_matrix_cache_info() -> Dict[str, Dict[str, Optional[int]]]:
+    """Hit and miss statistics of the element matrix caches, for tuning CACHE_BOUND
+
+    Returns:
+        Dict[str, Dict[str, Optional[int]]]: "hits", "misses", "maxsize" and "currsize" of the
+            kinematic, constitutive and stiffness matrix caches
+    """
+    caches = {
+        "kinematic": kinematic_matrix,
+        "constitutive": cached_constitutive_matrix,
+        "stiffness": cached_stiffness_matrix,
+    }
+    return {
+        name: cache.cache_info()._asdict()  # pylint: disable=no-value-for-parameter
+        for name, cache in caches.items()
+    }
+
+
+def clear_element_matrix_cache() -> None:
+    """Empty the element matrix caches and reset their statistics"""
+    kinematic_matrix.cache_clear()
+    cached_constitutive_matrix.cache_clear()
+    cached_stiffness_matrix.cache_clear()
+
+
 def geometric_stiffness_matrix(l: float, N: float, a1: float, a2: float) -> np.ndarray:
     """Generate the geometric stiffness matrix of an element
 
@@ -465,3 +587,27 @@ def geometric_stiffness_matrix(l: float, N: float, a1: float, a2: float) -> np.n
         )
         * np.array([1, -1, 1, 1, -1, 1])
     )  # conversion from coordinate system
+
+
+def batch_matrices(
+    keys: Sequence[ElementMatrixKey],
+) -> List[Tuple[ElementMatrixKey, np.ndarray, np.ndarray]]:
+    """Compile the matrices of many elements, once per distinct key, as Element.__init__ would
+
+    Args:
+        keys (Sequence[ElementMatrixKey]): Content key of every element, with the element angle
+            as a1 and a2
+
+    Returns:
+        List[Tuple[ElementMatrixKey, np.ndarray, np.ndarray]]: Key, read-only constitutive matrix
+            and read-only stiffness matrix of every element
+    """
+    matrices = {
+        key: (
+            key,
+            cached_constitutive_matrix(key._replace(a1=0.0, a2=0.0)),
+            cached_stiffness_matrix(key),
+        )
+        for key in dict.fromkeys(keys)
+    }
+    return [matrices[key] for key in keys]
@@ -0,0 +1,256 @@
+"""Streaming export of the results of a structure to tabular files, see SystemElements.export_results.
+
+The results are written chunk by chunk, a chunk being a dictionary of equally long column arrays, so
+the size of the structure does not limit the export. Tables:
+    nodes: node_id, Fx, Fy, Tz, ux, uy, phi_z, with the signs of get_node_results_system
+    reactions: node_id, Fx, Fy, Tz of the supported nodes, as in reaction_forces
+    elements: element_id, station, x, N, V, M, w, a row per station of the diagrams of the elements
+        (axial force, shear force, bending moment and deflection), x along the element
+
+Formats:
+    csv: comma separated text with a header line
+    parquet: Apache Parquet file, requires pyarrow
+    npy: directory with a NumPy .npy file per column
+    columnar: parquet if pyarrow is installed, npy otherwise
+"""
+
+import os
+import pathlib
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Union,
+)
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.util.result_store import append_rows
+
+if TYPE_CHECKING:
+    from anastruct.fem.system import SystemElements
+
+ResultTable = Literal["nodes", "reactions", "elements"]
+ExportFormat = Literal["csv", "parquet", "npy", "columnar"]
+ExportTarget = Union[str, "os.PathLike[str]", IO[str]]
+Chunk = Dict[str, np.ndarray]
+
+# columns with integer values
+INTEGER_COLUMNS = ("node_id", "element_id", "station")
+
+
+def export_results(
+    system: "SystemElements",
+    path: ExportTarget,
+    table: ResultTable = "elements",
+    file_format: ExportFormat = "csv",
+    chunk_size: int = 1000,
+) -> str:
+    """Write a result table of a solved structure, see SystemElements.export_results
+
+    Args:
+        system (SystemElements): Solved structure
+        path (ExportTarget): File, or directory of the npy format. A text
+            file object for csv.
+        table (ResultTable, optional): "nodes", "reactions" or "elements". Defaults to "elements".
+        file_format (ExportFormat, optional): "csv", "parquet", "npy" or "columnar".
+            Defaults to "csv".
+        chunk_size (int, optional): Number of nodes or elements per chunk. Defaults to 1000.
+
+    Raises:
+        FEMException: The structure has no results, or parquet is requested without pyarrow
+
+    Returns:
+        str: Format that was written, "parquet" or "npy" for the columnar format
+    """
+    if system.system_displacement_vector is None:
+        raise FEMException(
+            "Export error", "The structure has to be solved before exporting results."
+        )
+    chunks = TABLES[table](system, chunk_size)
+    if file_format == "columnar":
+        file_format = "parquet" if _pyarrow() is not None else "npy"
+    if file_format == "csv":
+        write_csv(chunks, path)
+    elif file_format == "parquet":
+        write_parquet(chunks, _path(path))
+    elif file_format == "npy":
+        write_npy(chunks, _path(path))
+    else:
+        raise FEMException("Export error", f"Unknown format {file_format}.")
+    return file_format
+
+
+def node_chunks(system: "SystemElements", chunk_size: int) -> Iterator[Chunk]:
+    """Node results, chunk by chunk"""
+    nodes = list(system.node_map.values())
+    for start in range(0, len(nodes), chunk_size):
+        values = np.array(
+            [
+                (node.id, node.Fx, node.Fy_neg, node.Tz, node.ux, -node.uy, node.phi_z)
+                for node in nodes[start : start + chunk_size]
+            ],
+            dtype=float,
+        )
+        yield _columns(
+            ("node_id", "Fx", "Fy", "Tz", "ux", "uy", "phi_z"), values.reshape(-1, 7)
+        )
+
+
+def reaction_chunks(system: "SystemElements", chunk_size: int) -> Iterator[Chunk]:
+    """Reaction forces, chunk by chunk"""
+    nodes = list(system.reaction_forces.values())
+    for start in range(0, len(nodes), chunk_size):
+        values = np.array(
+            [
+                (node.id, node.Fx, node.Fy, node.Tz)
+                for node in nodes[start : start + chunk_size]
+            ],
+            dtype=float,
+        )
+        yield _columns(("node_id", "Fx", "Fy", "Tz"), values.reshape(-1, 4))
+
+
+def element_chunks(system: "SystemElements", chunk_size: int) -> Iterator[Chunk]:
+    """Diagrams of the elements, a row per station, chunk by chunk"""
+    elements = list(system.element_map.values())
+    stations = system.plotter.mesh
+    fractions = np.linspace(0, 1, stations)
+    for start in range(0, len(elements), chunk_size):
+        chunk = elements[start : start + chunk_size]
+        n = len(chunk)
+        yield {
+            "element_id": np.repeat([el.id for el in chunk], stations),
+            "station": np.tile(np.arange(stations), n),
+            "x": np.outer([el.l for el in chunk], fractions).ravel(),
+            "N": _diagrams(chunk, "axial_force", stations),
+            "V": _diagrams(chunk, "shear_force", stations),
+            "M": _diagrams(chunk, "bending_moment", stations),
+            "w": _diagrams(chunk, "deflection", stations),
+        }
+
+
+TABLES: Dict[str, Callable[["SystemElements", int], Iterator[Chunk]]] = {
+    "nodes": node_chunks,
+    "reactions": reaction_chunks,
+    "elements": element_chunks,
+}
+
+
+def write_csv(
+    chunks: Iterable[Chunk],
+    path: ExportTarget,
+    float_format: str = "%.12g",
+) -> None:
+    """Write chunks to a csv file with a header line
+
+    Args:
+        chunks (Iterable[Chunk]): Chunks of column arrays
+        path (ExportTarget): File name or text file object
+        float_format (str, optional): printf format of the floats. Defaults to "%.12g".
+    """
+    if isinstance(path, (str, os.PathLike)):
+        with open(path, "w", encoding="utf-8", newline="") as fp:
+            write_csv(chunks, fp, float_format)
+        return
+    header = False
+    for chunk in chunks:
+        if not header:
+            path.write(",".join(chunk) + "\n")
+            header = True
+        np.savetxt(
+            path,
+            np.column_stack(list(chunk.values())),
+            fmt=[
+                "%d" if column in INTEGER_COLUMNS else float_format for column in chunk
+            ],
+            delimiter=",",
+        )
+
+
+def write_parquet(chunks: Iterable[Chunk], path: pathlib.Path) -> None:
+    """Write chunks to a Parquet file, a row group per chunk
+
+    Args:
+        chunks (Iterable[Chunk]): Chunks of column arrays
+        path (pathlib.Path): File name
+
+    Raises:
+        FEMException: pyarrow is not installed
+    """
+    pyarrow = _pyarrow()
+    if pyarrow is None:
+        raise FEMException(
+            "Export error", "The parquet format requires pyarrow to be installed."
+        )
+    pa, pq = pyarrow
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.table(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_npy(chunks: Iterable[Chunk], path: pathlib.Path) -> None:
+    """Write chunks to a directory with a .npy file per column, which can be read lazily with
+    np.load(file, mmap_mode="r")
+
+    Args:
+        chunks (Iterable[Chunk]): Chunks of column arrays
+        path (pathlib.Path): Directory, created if it does not exist
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    for chunk in chunks:
+        for column, values in chunk.items():
+            file = path / f"{column}.npy"
+            if rows == 0 and file.exists():
+                file.unlink()
+            append_rows(file, values, rows)
+        rows += len(next(iter(chunk.values())))
+
+
+def _columns(names: tuple, values: np.ndarray) -> Chunk:
+    return {
+        name: values[:, i].astype(int) if name in INTEGER_COLUMNS else values[:, i]
+        for i, name in enumerate(names)
+    }
+
+
+def _diagrams(elements: List[Any], name: str, stations: int) -> np.ndarray:
+    """Values of a diagram at the stations of the elements, NaN for elements without it"""
+    values = np.full((len(elements), stations), np.nan)
+    for i, el in enumerate(elements):
+        diagram = getattr(el, name)
+        if diagram is not None:
+            values[i] = diagram
+    return values.ravel()
+
+
+def _path(path: ExportTarget) -> pathlib.Path:
+    if not isinstance(path, (str, os.PathLike)):
+        raise FEMException("Export error", "This format is written to a path.")
+    return pathlib.Path(path)
+
+
+def _pyarrow() -> Any:
+    """pyarrow and pyarrow.parquet, None if pyarrow is not installed"""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        from pyarrow import parquet
+    except ImportError:
+        return None
+    return pyarrow, parquet
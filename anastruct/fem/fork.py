@@ -0,0 +1,210 @@
+"""Copies of a structure for what-if analyses, see SystemElements.fork.
+
+The stiffness arrays of the elements, the system matrix and its factorization are replaced, never
+modified in place, when a structure changes. A fork shares them with the original (copy-on-write) and
+only copies the objects that a solve modifies: nodes, elements, supports, loads and results.
+"""
+
+import contextlib
+import copy
+import gc
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, TypeVar
+
+import numpy as np
+
+from anastruct.fem import plotter
+from anastruct.fem.postprocess import SystemLevel
+
+if TYPE_CHECKING:
+    from anastruct.fem.elements import Element
+    from anastruct.fem.node import Node
+    from anastruct.fem.system import SystemElements
+
+T = TypeVar("T")
+
+# results of an element, which are recomputed by every solve
+ELEMENT_RESULTS = (
+    "N_1",
+    "N_2",
+    "bending_moment",
+    "shear_force",
+    "axial_force",
+    "deflection",
+    "total_deflection",
+    "extension",
+    "max_deflection",
+    "max_total_deflection",
+    "max_extension",
+)
+_NO_RESULTS = dict.fromkeys(ELEMENT_RESULTS)
+
+
+def fork_system(
+    system: "SystemElements", results: bool = True, deep: bool = False
+) -> "SystemElements":
+    """Copy a structure, see SystemElements.fork
+
+    Args:
+        system (SystemElements): Structure to copy
+        results (bool, optional): Copy the results of the last solve. Defaults to True.
+        deep (bool, optional): Copy the stiffness arrays and the system matrix as well, without
+            results. Defaults to False.
+
+    Returns:
+        SystemElements: Copy of the structure
+    """
+    with paused_gc():
+        return _fork_system(system, results and not deep, deep)
+
+
+@contextlib.contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector while a structure is copied or built. That allocates many
+    small objects without references to existing ones, so a collection would free nothing and only
+    cost time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _fork_system(
+    system: "SystemElements", results: bool, deep: bool
+) -> "SystemElements":
+    """Copy a structure, see fork_system"""
+    clone = copy.copy(system)
+
+    nodes: Dict[int, "Node"] = {}
+    for node_id, node in system.node_map.items():
+        nodes[node_id] = _shallow_copy(node)
+        nodes[node_id].elements = {}
+        if not results:
+            nodes[node_id].reset()
+    elements: Dict[int, "Element"] = {}
+    for element_id, element in system.element_map.items():
+        elements[element_id] = _fork_element(
+            element, system.node_map, nodes, results, deep
+        )
+        for node_id in (element.node_id1, element.node_id2):
+            nodes[node_id].elements[element_id] = elements[element_id]
+
+    clone.node_map = nodes
+    clone.element_map = elements
+    clone.node_element_map = {
+        node_id: [elements[el.id] for el in connected]
+        for node_id, connected in system.node_element_map.items()
+    }
+    clone.superelement_map = dict(system.superelement_map)
+    clone._vertices = dict(system._vertices)
+
+    # supports
+    clone.supports_fixed = [nodes[node.id] for node in system.supports_fixed]
+    clone.supports_hinged = [nodes[node.id] for node in system.supports_hinged]
+    clone.supports_rotational = [nodes[node.id] for node in system.supports_rotational]
+    clone.internal_hinges = [nodes[node.id] for node in system.internal_hinges]
+    clone.supports_roll = [nodes[node.id] for node in system.supports_roll]
+    clone.supports_roll_direction = list(system.supports_roll_direction)
+    clone.supports_roll_rotate = list(system.supports_roll_rotate)
+    clone.inclined_roll = dict(system.inclined_roll)
+    clone.supports_spring_x = [(nodes[n.id], r) for n, r in system.supports_spring_x]
+    clone.supports_spring_y = [(nodes[n.id], r) for n, r in system.supports_spring_y]
+    clone.supports_spring_z = [(nodes[n.id], r) for n, r in system.supports_spring_z]
+    clone.supports_spring_args = list(system.supports_spring_args)
+    clone.system_spring_map = dict(system.system_spring_map)
+
+    # loads
+    clone.loads_point = dict(system.loads_point)
+    clone.loads_q = {k: list(v) for k, v in system.loads_q.items()}
+    clone.loads_moment = dict(system.loads_moment)
+    clone.loads_dead_load = set(system.loads_dead_load)
+    clone.non_linear_elements = {
+        k: dict(v) for k, v in system.non_linear_elements.items()
+    }
+
+    # solve state, the factorization is never modified and is shared
+    clone._remainder_indexes = list(system._remainder_indexes)
+    clone._changed_elements = dict(system._changed_elements)
+    clone._factorized_matrices = dict(system._factorized_matrices)
+    clone.system_force_vector = _copy(system.system_force_vector)
+    clone.reduced_force_vector = _copy(system.reduced_force_vector)
+    clone._support_displacement_vector = _copy(system._support_displacement_vector)
+    if deep:
+        clone.system_matrix = _copy(system.system_matrix)
+        clone.reduced_system_matrix = _copy(system.reduced_system_matrix)
+    clone.solve_stats = None
+
+    # results
+    if results:
+        clone.system_displacement_vector = _copy(system.system_displacement_vector)
+        clone.reaction_forces = {
+            node_id: _shallow_copy(node)
+            for node_id, node in system.reaction_forces.items()
+        }
+    else:
+        clone.system_displacement_vector = None
+        clone.reaction_forces = {}
+        clone.buckling_factor = None
+
+    mesh = system.plotter.mesh
+    clone.plotter = plotter.Plotter(clone, mesh)
+    clone.plotter.plot_colors = dict(system.plotter.plot_colors)
+    clone.post_processor = SystemLevel(clone)
+    clone.plot_values = plotter.PlottingValues(clone, mesh)
+    return clone
+
+
+def _fork_element(
+    element: "Element",
+    originals: Dict[int, "Node"],
+    nodes: Dict[int, "Node"],
+    results: bool,
+    deep: bool,
+) -> "Element":
+    """Copy an element with the arrays that a solve modifies in place"""
+    clone = _shallow_copy(element)
+    clone.springs = None if element.springs is None else dict(element.springs)
+    clone.nodes_plastic = list(element.nodes_plastic)
+    clone.element_primary_force_vector = element.element_primary_force_vector.copy()
+    if deep:
+        clone.kinematic_matrix = np.array(element.kinematic_matrix)
+        clone.constitutive_matrix = np.array(element.constitutive_matrix)
+        clone.stiffness_matrix = np.array(element.stiffness_matrix)
+    if results:
+        clone.element_displacement_vector = element.element_displacement_vector.copy()
+        # the nodes of an element hold its results after a solve, before it the system nodes
+        clone.node_map = {
+            node_id: (
+                nodes[node_id]
+                if node is originals.get(node_id)
+                else _shallow_copy(node)
+            )
+            for node_id, node in element.node_map.items()
+        }
+    else:
+        clone.__dict__.update(_NO_RESULTS)
+        clone.element_displacement_vector = np.zeros(6)
+        clone.element_force_vector = np.array([])
+        clone.node_map = {
+            element.node_id1: nodes[element.node_id1],
+            element.node_id2: nodes[element.node_id2],
+        }
+    return clone
+
+
+def _shallow_copy(obj: T) -> T:
+    """Shallow copy of a plain object, without the generic protocol of copy.copy"""
+    clone: T = object.__new__(type(obj))
+    clone.__dict__ = obj.__dict__.copy()
+    return clone
+
+
+def _copy(value: Optional[T]) -> Optional[T]:
+    """Copy of a dense or sparse array, None stays None"""
+    if value is None:
+        return None
+    copied: T = value.copy()  # type: ignore[attr-defined]
+    return copied
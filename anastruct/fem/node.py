@@ -128,10 +128,27 @@ class Node:
             hinge=self.hinge,
         )
 
+    def __isub__(self, other: Node) -> Node:
+        """Subtract the forces of another node in place, which keeps the identity of the node and
+        the elements connected to it
+
+        Args:
+            other (Node): Node to subtract
+
+        Returns:
+            Node: This node
+        """
+        assert (
+            self.id == other.id
+        ), "Cannot subtract nodes as the ID's don't match. The nodes positions don't match."
+        self.Fx -= other.Fx
+        self.Fy -= other.Fy
+        self.Tz -= other.Tz
+        return self
+
     def reset(self) -> None:
-        """Reset the node to zero forces and displacements"""
+        """Reset the node to zero forces and displacements. The hinge status is kept."""
         self.Fx = self.Fy = self.Tz = self.ux = self.uy = self.phi_z = 0
-        self.hinge = False
 
     def add_results(self, other: Node) -> None:
         """Add the results of another node to this node
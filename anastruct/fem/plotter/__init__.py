@@ -1,5 +1,8 @@
-try:
+from importlib.util import find_spec
+
+# the matplotlib plotter imports matplotlib on the first plot
+if find_spec("matplotlib") is not None:
     from .mpl import Plotter
-except ImportError:
+else:
     from .null import Plotter  # type: ignore
 from .values import PlottingValues
@@ -1,12 +1,9 @@
 import math
 from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
-import matplotlib.colors
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
 import numpy as np
 
-from anastruct.basic import find_nearest, rotate_xy
+from anastruct.basic import LazyModule, find_nearest, rotate_xy
 from anastruct.fem.plotter.values import (
     PlottingValues,
     det_scaling_factor,
@@ -18,11 +15,19 @@ from anastruct.fem.plotter.values import (
 )
 
 if TYPE_CHECKING:
+    import matplotlib.colors as mcolors
+    import matplotlib.patches as mpatches
+    import matplotlib.pyplot as plt
     from matplotlib.axes import Axes
     from matplotlib.figure import Figure
 
     from anastruct.fem.node import Node
     from anastruct.fem.system import SystemElements
+else:
+    # matplotlib is imported on the first plot
+    mcolors = LazyModule("matplotlib.colors")
+    mpatches = LazyModule("matplotlib.patches")
+    plt = LazyModule("matplotlib.pyplot")
 
 
 PATCH_SIZE = 0.03
@@ -86,7 +91,7 @@ class Plotter:
                 print(
                     str(item) + " is not a valid plot component to change the color of"
                 )
-            elif not matplotlib.colors.is_color_like(color):
+            elif not mcolors.is_color_like(color):
                 print(str(color + "is not a valid matplotlib color"))
             else:
                 self.plot_colors[item] = color
@@ -1,10 +1,20 @@
 import copy
 import math
-from typing import TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
 
-from anastruct.basic import integrate_array
+from anastruct.basic import FEMException, integrate_array
 from anastruct.fem.node import Node
 
 if TYPE_CHECKING:
@@ -31,7 +41,19 @@ class SystemLevel:
         """Determines the node results on the system level.
         Results place in SystemElements class: self.system.node_map (list)
         """
-        for k, v in self.system.node_element_map.items():
+        superelement_forces: Dict[int, List[np.ndarray]] = {}
+        displacements = self.system.system_displacement_vector
+        for placed in self.system.superelement_map.values():
+            assert displacements is not None
+            forces = placed.superelement.end_forces(displacements[placed.dofs])
+            for index, node_id in enumerate(placed.node_ids):
+                superelement_forces.setdefault(node_id, []).append(
+                    forces[index * 3 : index * 3 + 3]
+                )
+
+        node_ids = list(self.system.node_element_map)
+        node_ids += [k for k in superelement_forces if k not in node_ids]
+        for k in node_ids:
             # reset nodes in case of iterative calculation
             self.system.node_map[k].reset()
 
@@ -43,7 +65,7 @@ class SystemLevel:
                 self.system.node_map[k].Fx += Fx
                 self.system.node_map[k].Fy += Fy
 
-            for vi in v:
+            for vi in self.system.node_element_map.get(k, []):
                 node = vi.node_map[k]
                 self.system.node_map[k] -= node
 
@@ -56,6 +78,15 @@ class SystemLevel:
                 self.system.node_map[k].uy = -node.uy
                 self.system.node_map[k].phi_z = -node.phi_z
 
+            for Fx, Fy, Tz in superelement_forces.get(k, []):
+                self.system.node_map[k] -= Node(k, Fx, Fy, Tz)
+            if k not in self.system.node_element_map:
+                assert displacements is not None
+                ux, uy, phi_z = displacements[(k - 1) * 3 : k * 3]
+                self.system.node_map[k].ux = -ux
+                self.system.node_map[k].uy = -uy
+                self.system.node_map[k].phi_z = -phi_z
+
     def reaction_forces(self) -> None:
         """Determines the reaction forces on the system level.
         Results place in SystemElements class: self.system.reaction_forces (list)
@@ -320,3 +351,98 @@ class ElementLevel:
         )
 
         element.max_total_deflection = np.max(np.abs(element.total_deflection))
+
+
+# Fields of SystemElements.get_element_results: (element attribute, reduction of the diagram)
+ELEMENT_FIELDS: Dict[str, Tuple[str, Optional[Callable[[np.ndarray], float]]]] = {
+    "length": ("l", None),
+    "alpha": ("angle", None),
+    "umax": ("extension", np.max),
+    "umin": ("extension", np.min),
+    "u": ("extension", None),
+    "wmax": ("deflection", np.min),
+    "wmin": ("deflection", np.max),
+    "w": ("deflection", None),
+    "wtotmax": ("total_deflection", np.min),
+    "wtotmin": ("total_deflection", np.max),
+    "wtot": ("total_deflection", None),
+    "Mmin": ("bending_moment", np.min),
+    "Mmax": ("bending_moment", np.max),
+    "M": ("bending_moment", None),
+    "Qmin": ("shear_force", np.min),
+    "Qmax": ("shear_force", np.max),
+    "Q": ("shear_force", None),
+    "Nmin": ("axial_force", np.min),
+    "Nmax": ("axial_force", np.max),
+    "N": ("axial_force", None),
+    "q": ("q_load", None),
+}
+DIAGRAM_FIELDS = ("u", "w", "wtot", "M", "Q", "N")
+# fields that get_element_results leaves out for truss elements
+BEAM_FIELDS = ("wmax", "wmin", "w", "Mmin", "Mmax", "M", "Qmin", "Qmax", "Q", "q")
+
+
+def iter_element_results(
+    system: "SystemElements",
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Compute the element results element by element, see SystemElements.iter_element_results"""
+    if fields is None:
+        fields = [field for field in ELEMENT_FIELDS if field not in DIAGRAM_FIELDS]
+    for field in fields:
+        if field not in ELEMENT_FIELDS:
+            raise FEMException("Flawed inputs", f"Unknown element result {field}.")
+    elements = system.element_map.values()
+    if chunk_size is None:
+        for el in elements:
+            record: Dict[str, Any] = {"id": el.id}
+            for field in fields:
+                if el.type != "truss" or field not in BEAM_FIELDS:
+                    record[field] = _element_field(el, field)
+            yield record
+        return
+
+    chunk: List["Element"] = []
+    for el in elements:
+        chunk.append(el)
+        if len(chunk) == chunk_size:
+            yield _element_chunk(chunk, fields, system.plotter.mesh)
+            chunk = []
+    if chunk:
+        yield _element_chunk(chunk, fields, system.plotter.mesh)
+
+
+def _element_field(el: "Element", field: str) -> Any:
+    attribute, reduce = ELEMENT_FIELDS[field]
+    value = getattr(el, attribute)
+    if reduce is None or value is None:
+        return value
+    return reduce(value)
+
+
+def _element_chunk(
+    elements: List["Element"], fields: Sequence[str], mesh: int
+) -> Dict[str, np.ndarray]:
+    """Results of some elements as arrays, NaN for the results that an element does not have,
+    such as the bending results of truss elements"""
+    chunk = {"id": np.array([el.id for el in elements])}
+    for field in fields:
+        if field == "q":
+            q = np.full((len(elements), 2), np.nan)
+            for i, el in enumerate(elements):
+                if el.type != "truss":
+                    q[i] = el.q_load
+            chunk[field] = q
+            continue
+        values = np.full(
+            (len(elements), mesh) if field in DIAGRAM_FIELDS else len(elements), np.nan
+        )
+        for i, el in enumerate(elements):
+            if el.type == "truss" and field in BEAM_FIELDS:
+                continue
+            value = _element_field(el, field)
+            if value is not None:
+                values[i] = value
+        chunk[field] = values
+    return chunk
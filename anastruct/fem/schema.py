@@ -0,0 +1,443 @@
+"""JSON-compatible dictionary representation of a structure, see SystemElements.to_dict.
+
+Tables are dictionaries of equally long columns, which JSON parses much faster than a list of
+objects and which are inserted at once with system_components.bulk. Optional columns and keys may be
+left out, null means the default.
+
+Schema version 1:
+    {
+        "version": 1,
+        "settings": {"EA": 15000, "EI": 5000, "load_factor": 1, "mesh": 50, "invert_y_loads": true,
+                     "figsize": [12, 8]},
+        "nodes": {"id": [1, 2, ...], "x": [0, 5, ...], "y": [0, 0, ...]},
+        "sections": {"name": ["IPE 300", ...], "EA": [...], "EI": [...], "g": [...]},
+        "elements": {"id": [...], "node_1": [...], "node_2": [...], "EA": [...], "EI": [...],
+                     "type": ["general" or "truss", ...], "section": [...], "g": [...],
+                     "spring_1": [...], "spring_2": [...], "mp_1": [...], "mp_2": [...]},
+        "supports": {"fixed": [node ids], "hinged": [...], "rotational": [...],
+                     "roll": {"node": [...], "direction": ["x" or "y", ...], "angle": [...],
+                              "rotate": [...]},
+                     "spring": {"node": [...], "translation": [1, 2 or 3, ...], "k": [...],
+                                "roll": [...]}},
+        "hinges": [node ids],
+        "loads": {"point": {"node": [...], "Fx": [...], "Fy": [...], "rotation": [...]},
+                  "moment": {"node": [...], "Tz": [...]},
+                  "q": {"element": [...], "q_1": [...], "q_2": [...], "q_perp_1": [...],
+                        "q_perp_2": [...], "direction": [...], "rotation": [...]}},
+        "load_cases": [{"name": "wind", "loads": [{"type": "point_load", "node_id": 2, ...}]}],
+        "combinations": [{"name": "ULS", "factors": {"wind": 1.5}}]
+    }
+
+Elements take EA, EI and g from their section when they are null, and otherwise EA and EI from the
+settings. The springs (0 for a hinge) and maximum plastic moments are those at node_1 and node_2.
+The loads are given like the arguments of point_load, moment_load and q_load, with the rotations in
+degrees. q_2 and q_perp_2 default to q_1 and q_perp_1. The load cases have the keyword arguments of
+the LoadCase methods.
+"""
+
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.fork import paused_gc
+from anastruct.fem.system_components import bulk
+from anastruct.fem.util.load import LoadCase, LoadCombination
+
+if TYPE_CHECKING:
+    from anastruct.fem.system import SystemElements
+
+SCHEMA_VERSION = 1
+
+
+def system_to_dict(
+    system: "SystemElements",
+    load_cases: Sequence[LoadCase] = (),
+    combinations: Sequence[LoadCombination] = (),
+) -> Dict[str, Any]:
+    """Representation of a structure, see SystemElements.to_dict
+
+    Args:
+        system (SystemElements): Structure
+        load_cases (Sequence[LoadCase], optional): Load cases to include. Defaults to ().
+        combinations (Sequence[LoadCombination], optional): Load combinations to include, with their
+            load cases. Defaults to ().
+
+    Raises:
+        FEMException: The structure contains superelements
+
+    Returns:
+        Dict[str, Any]: JSON-compatible representation, see the module documentation
+    """
+    if system.superelement_map:
+        raise FEMException(
+            "Flawed inputs", "Structures with superelements can not be exported."
+        )
+    load_factor = system.load_factor
+    orientation = system.orientation_cs * load_factor
+    elements = list(system.element_map.values())
+    springs = [el.springs or {} for el in elements]
+    mps = [system.non_linear_elements.get(el.id, {}) for el in elements]
+    q_elements = [system.element_map[element_id] for element_id in system.loads_q]
+    spring_supports = [
+        (node, translation, roll)
+        for translation, supports in (
+            (1, system.supports_spring_x),
+            (2, system.supports_spring_y),
+            (3, system.supports_spring_z),
+        )
+        for node, roll in supports
+    ]
+    cases = {lc.name: lc for lc in load_cases}
+    for combination in combinations:
+        cases.update({lc.name: lc for lc, _ in combination.spec.values()})
+
+    return {
+        "version": SCHEMA_VERSION,
+        "settings": {
+            "EA": system.EA,
+            "EI": system.EI,
+            "load_factor": load_factor,
+            "mesh": system.plotter.mesh,
+            "invert_y_loads": system.orientation_cs == -1,
+            "figsize": None if system.figsize is None else list(system.figsize),
+        },
+        "nodes": {
+            "id": list(system.node_map),
+            "x": [float(node.vertex.x) for node in system.node_map.values()],
+            "y": [float(node.vertex.y) for node in system.node_map.values()],
+        },
+        "elements": {
+            "id": [el.id for el in elements],
+            "node_1": [el.node_id1 for el in elements],
+            "node_2": [el.node_id2 for el in elements],
+            "EA": [float(el.EA) for el in elements],
+            "EI": [float(el.EI) for el in elements],
+            "type": [el.type for el in elements],
+            "section": [el.section_name for el in elements],
+            "g": [float(el.dead_load) for el in elements],
+            "spring_1": [spring.get(1) for spring in springs],
+            "spring_2": [spring.get(2) for spring in springs],
+            "mp_1": [mp.get(1) for mp in mps],
+            "mp_2": [mp.get(2) for mp in mps],
+        },
+        "supports": {
+            "fixed": [node.id for node in system.supports_fixed],
+            "hinged": [node.id for node in system.supports_hinged],
+            "rotational": [node.id for node in system.supports_rotational],
+            "roll": {
+                "node": [node.id for node in system.supports_roll],
+                "direction": [
+                    "x" if direction == 2 else "y"
+                    for direction in system.supports_roll_direction
+                ],
+                "angle": [
+                    (
+                        -math.degrees(system.inclined_roll[node.id])
+                        if node.id in system.inclined_roll
+                        else None
+                    )
+                    for node in system.supports_roll
+                ],
+                "rotate": list(system.supports_roll_rotate),
+            },
+            "spring": {
+                "node": [node.id for node, _, _ in spring_supports],
+                "translation": [translation for _, translation, _ in spring_supports],
+                "k": [
+                    system.system_spring_map[(node.id - 1) * 3 + translation - 1]
+                    for node, translation, _ in spring_supports
+                ],
+                "roll": [roll for _, _, roll in spring_supports],
+            },
+        },
+        "hinges": [node.id for node in system.internal_hinges],
+        "loads": {
+            "point": {
+                "node": list(system.loads_point),
+                "Fx": [
+                    float(Fx / load_factor) for Fx, _ in system.loads_point.values()
+                ],
+                "Fy": [
+                    float(Fy / orientation) for _, Fy in system.loads_point.values()
+                ],
+                "rotation": [0.0] * len(system.loads_point),
+            },
+            "moment": {
+                "node": list(system.loads_moment),
+                "Tz": [float(Tz / load_factor) for Tz in system.loads_moment.values()],
+            },
+            "q": {
+                "element": list(system.loads_q),
+                "q_1": [el.q_load[0] / orientation for el in q_elements],
+                "q_2": [el.q_load[1] / orientation for el in q_elements],
+                "q_perp_1": [el.q_perp_load[0] / load_factor for el in q_elements],
+                "q_perp_2": [el.q_perp_load[1] / load_factor for el in q_elements],
+                "direction": [
+                    "element" if el.q_direction == "angle" else el.q_direction
+                    for el in q_elements
+                ],
+                "rotation": [
+                    (
+                        math.degrees(el.q_angle)
+                        if el.q_direction == "angle" and el.q_angle is not None
+                        else None
+                    )
+                    for el in q_elements
+                ],
+            },
+        },
+        "load_cases": [lc.to_dict() for lc in cases.values()],
+        "combinations": [combination.to_dict() for combination in combinations],
+    }
+
+
+def system_from_dict(data: Mapping[str, Any]) -> "SystemElements":
+    """Create a structure from its representation, see SystemElements.from_dict
+
+    Args:
+        data (Mapping[str, Any]): Representation, see the module documentation
+
+    Raises:
+        FEMException: The representation is invalid or of a newer schema version
+
+    Returns:
+        SystemElements: Structure with the supports and loads, without the load cases
+    """
+    # pylint: disable=import-outside-toplevel
+    from anastruct.fem.system import SystemElements
+
+    version = data.get("version", SCHEMA_VERSION)
+    if version > SCHEMA_VERSION:
+        raise FEMException(
+            "Flawed inputs",
+            f"The model has schema version {version}, this version of anaStruct reads up to "
+            f"version {SCHEMA_VERSION}.",
+        )
+    with paused_gc():
+        settings = data.get("settings", {})
+        figsize = settings.get("figsize", (12, 8))
+        system = SystemElements(
+            figsize=None if figsize is None else (figsize[0], figsize[1]),
+            EA=settings.get("EA", 15e3),
+            EI=settings.get("EI", 5e3),
+            load_factor=settings.get("load_factor", 1.0),
+            mesh=settings.get("mesh", 50),
+            invert_y_loads=settings.get("invert_y_loads", True),
+        )
+
+        nodes = _table(data.get("nodes", {}), "nodes", ("id", "x", "y"))
+        bulk.add_nodes(
+            system,
+            nodes["id"],
+            np.column_stack([_floats(nodes["x"]), _floats(nodes["y"])]),
+        )
+        _add_elements(system, data)
+        _add_supports(system, data.get("supports", {}))
+        if data.get("hinges"):
+            system.add_internal_hinge(data["hinges"])
+        _add_loads(system, data.get("loads", {}))
+    return system
+
+
+def load_cases_from_dict(data: Mapping[str, Any]) -> Dict[str, LoadCase]:
+    """Load cases of a representation
+
+    Args:
+        data (Mapping[str, Any]): Representation, see the module documentation
+
+    Returns:
+        Dict[str, LoadCase]: Load cases by name
+    """
+    return {lc["name"]: LoadCase.from_dict(lc) for lc in data.get("load_cases", [])}
+
+
+def combinations_from_dict(data: Mapping[str, Any]) -> Dict[str, LoadCombination]:
+    """Load combinations of a representation, with its load cases
+
+    Args:
+        data (Mapping[str, Any]): Representation, see the module documentation
+
+    Raises:
+        FEMException: A combination refers to an unknown load case
+
+    Returns:
+        Dict[str, LoadCombination]: Load combinations by name
+    """
+    load_cases = load_cases_from_dict(data)
+    return {
+        combination["name"]: LoadCombination.from_dict(combination, load_cases)
+        for combination in data.get("combinations", [])
+    }
+
+
+def _add_elements(system: "SystemElements", data: Mapping[str, Any]) -> None:
+    """Add the elements of a representation with their sections"""
+    elements = _table(
+        data.get("elements", {}),
+        "elements",
+        ("node_1", "node_2"),
+        (
+            "id",
+            "EA",
+            "EI",
+            "type",
+            "section",
+            "g",
+            "spring_1",
+            "spring_2",
+            "mp_1",
+            "mp_2",
+        ),
+    )
+    sections = _table(
+        data.get("sections", {}), "sections", ("name",), ("EA", "EI", "g")
+    )
+    section_names = [name or "" for name in elements["section"]]
+    section_values = {
+        name: (EA, EI, g)
+        for name, EA, EI, g in zip(
+            sections["name"], sections["EA"], sections["EI"], sections["g"]
+        )
+    }
+    unknown = set(section_names).difference(section_values, [""])
+    if sections["name"] and unknown:
+        raise FEMException("Flawed inputs", f"Unknown sections {sorted(unknown)}.")
+
+    defaults = (system.EA, system.EI, 0.0)
+    columns = []
+    for i, column in enumerate(("EA", "EI", "g")):
+        values = _floats(elements[column])
+        missing = np.flatnonzero(np.isnan(values)).tolist()
+        for row in missing:
+            section = section_values.get(section_names[row])
+            value = None if section is None else section[i]
+            values[row] = defaults[i] if value is None else value
+        columns.append(values)
+
+    bulk.add_elements(
+        system,
+        elements["node_1"],
+        elements["node_2"],
+        columns[0].tolist(),
+        columns[1].tolist(),
+        element_type=[element_type or "general" for element_type in elements["type"]],
+        spring=np.column_stack(
+            [_floats(elements["spring_1"]), _floats(elements["spring_2"])]
+        ),
+        mp=np.column_stack([_floats(elements["mp_1"]), _floats(elements["mp_2"])]),
+        g=columns[2].tolist(),
+        section_name=section_names,
+        element_ids=(
+            None if all(id_ is None for id_ in elements["id"]) else elements["id"]
+        ),
+    )
+
+
+def _add_supports(system: "SystemElements", supports: Mapping[str, Any]) -> None:
+    """Add the supports of a representation"""
+    if supports.get("fixed"):
+        system.add_support_fixed(supports["fixed"])
+    if supports.get("hinged"):
+        system.add_support_hinged(supports["hinged"])
+    if supports.get("rotational"):
+        system.add_support_rotational(supports["rotational"])
+    roll = _table(
+        supports.get("roll", {}),
+        "roll supports",
+        ("node",),
+        ("direction", "angle", "rotate"),
+    )
+    if roll["node"]:
+        system.add_support_roll(
+            roll["node"],
+            [direction or "x" for direction in roll["direction"]],
+            roll["angle"],
+            [True if rotate is None else rotate for rotate in roll["rotate"]],
+        )
+    spring = _table(
+        supports.get("spring", {}),
+        "spring supports",
+        ("node", "translation", "k"),
+        ("roll",),
+    )
+    if spring["node"]:
+        system.add_support_spring(
+            spring["node"],
+            spring["translation"],
+            spring["k"],
+            [bool(roll) for roll in spring["roll"]],
+        )
+
+
+def _add_loads(system: "SystemElements", loads: Mapping[str, Any]) -> None:
+    """Apply the loads of a representation"""
+    point = _table(
+        loads.get("point", {}), "point loads", ("node",), ("Fx", "Fy", "rotation")
+    )
+    if point["node"]:
+        system.point_load(
+            point["node"],
+            _zero_default(point["Fx"]),
+            _zero_default(point["Fy"]),
+            _zero_default(point["rotation"]),
+        )
+    moment = _table(loads.get("moment", {}), "moment loads", ("node", "Tz"))
+    if moment["node"]:
+        system.moment_load(moment["node"], moment["Tz"])
+    q = _table(
+        loads.get("q", {}),
+        "q-loads",
+        ("element", "q_1"),
+        ("q_2", "q_perp_1", "q_perp_2", "direction", "rotation"),
+    )
+    if q["element"]:
+        q_1 = _floats(q["q_1"])
+        q_2 = _floats(q["q_2"])
+        q_perp_1 = np.nan_to_num(_floats(q["q_perp_1"]))
+        q_perp_2 = _floats(q["q_perp_2"])
+        bulk.q_loads(
+            system,
+            q["element"],
+            np.column_stack([q_1, np.where(np.isnan(q_2), q_1, q_2)]),
+            np.column_stack(
+                [q_perp_1, np.where(np.isnan(q_perp_2), q_perp_1, q_perp_2)]
+            ),
+            [direction or "element" for direction in q["direction"]],
+            q["rotation"],
+        )
+
+
+def _table(
+    table: Mapping[str, Any],
+    name: str,
+    required: Sequence[str],
+    optional: Sequence[str] = (),
+) -> Dict[str, List[Any]]:
+    """Columns of a table, with None for the rows of missing optional columns
+
+    Raises:
+        FEMException: A required column is missing or the columns differ in length
+    """
+    missing = [column for column in required if column not in table]
+    if missing and any(table.get(column) for column in (*required, *optional)):
+        raise FEMException("Flawed inputs", f"The {name} have no column {missing[0]}.")
+    n = len(table[required[0]]) if required[0] in table else 0
+    columns = {column: list(table.get(column, [])) for column in required}
+    for column in optional:
+        columns[column] = list(table[column]) if column in table else [None] * n
+    if any(len(values) != n for values in columns.values()):
+        raise FEMException(
+            "Flawed inputs", f"The columns of the {name} differ in length."
+        )
+    return columns
+
+
+def _floats(values: Sequence[Optional[float]]) -> np.ndarray:
+    """Array of a column, NaN for null"""
+    return np.array(values, dtype=float).reshape(len(values))
+
+
+def _zero_default(values: Sequence[Optional[float]]) -> List[float]:
+    return [0.0 if value is None else value for value in values]
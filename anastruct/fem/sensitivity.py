@@ -0,0 +1,202 @@
+"""Adjoint sensitivity analysis of linear responses with respect to the element stiffnesses.
+
+The derivative of a response r with respect to all EA and EI of the elements costs a single extra
+solve with the factorization of the last (linear) solve:
+
+    dr/dp = (B (w - lambda))^T dC/dp (B u)
+
+where K^T lambda = dr/du, B is the kinematic matrix of an element, C its constitutive matrix and w the
+(explicit) weights of the element forces in the response. The loads are assumed to be independent of
+the stiffness.
+"""
+
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.elements import constitutive_matrix
+from anastruct.fem.system_components.solver import low_rank_solve
+
+if TYPE_CHECKING:
+    from anastruct.fem.elements import Element
+    from anastruct.fem.system import SystemElements
+    from anastruct.types import AxisNumber
+
+
+class Sensitivity(NamedTuple):
+    """Derivatives of a response with respect to the stiffness of every element"""
+
+    element_ids: np.ndarray
+    EA: np.ndarray  # d response / d EA, in the order of element_ids
+    EI: np.ndarray  # d response / d EI, in the order of element_ids
+
+
+def displacement_sensitivity(
+    system: "SystemElements", node_id: int, direction: "AxisNumber"
+) -> Sensitivity:
+    """Sensitivity of a node displacement, as in the system displacement vector
+
+    Args:
+        system (SystemElements): Solved system
+        node_id (int): ID of the node
+        direction (AxisNumber): 1 = x, 2 = y, 3 = rotation
+
+    Returns:
+        Sensitivity: Derivatives of the displacement to the EA and EI of every element
+    """
+    assert system.shape_system_matrix is not None
+    weights = np.zeros(system.shape_system_matrix)
+    weights[(node_id - 1) * 3 + direction - 1] = 1.0
+    return adjoint_sensitivity(system, weights, {})
+
+
+def reaction_force_sensitivity(
+    system: "SystemElements", node_id: int, direction: "AxisNumber"
+) -> Sensitivity:
+    """Sensitivity of a reaction force (Fx, Fy or Tz of system.reaction_forces[node_id])
+
+    Args:
+        system (SystemElements): Solved system
+        node_id (int): ID of the supported node
+        direction (AxisNumber): 1 = Fx, 2 = Fy, 3 = Tz
+
+    Returns:
+        Sensitivity: Derivatives of the reaction force to the EA and EI of every element
+    """
+    element_weights = {}
+    for element in system.node_element_map[node_id]:
+        weights = np.zeros(6)
+        offset = 0 if element.node_1.id == node_id else 3
+        weights[offset + direction - 1] = 1.0
+        element_weights[element.id] = weights
+    return adjoint_sensitivity(system, None, element_weights)
+
+
+def element_force_sensitivity(
+    system: "SystemElements",
+    element_id: int,
+    node: int,
+    direction: "AxisNumber",
+) -> Sensitivity:
+    """Sensitivity of an element end force, e.g. the end moment (direction 3).
+    The end forces are those of the element's force vector plus its primary force vector.
+
+    Args:
+        system (SystemElements): Solved system
+        element_id (int): ID of the element
+        node (int): End of the element (1 or 2)
+        direction (AxisNumber): 1 = Fx, 2 = Fy, 3 = Tz
+
+    Returns:
+        Sensitivity: Derivatives of the end force to the EA and EI of every element
+    """
+    weights = np.zeros(6)
+    weights[(node - 1) * 3 + direction - 1] = 1.0
+    return adjoint_sensitivity(system, None, {element_id: weights})
+
+
+def adjoint_sensitivity(
+    system: "SystemElements",
+    displacement_weights: Optional[np.ndarray],
+    element_weights: Dict[int, np.ndarray],
+) -> Sensitivity:
+    """Sensitivity of a response that is linear in the displacements:
+    r = displacement_weights^T u + sum(element_weights[e]^T K_e u_e) + constant
+
+    Args:
+        system (SystemElements): Solved system
+        displacement_weights (Optional[np.ndarray]): Weights of the system displacement vector
+        element_weights (Dict[int, np.ndarray]): Maps element ids to the weights of their end forces
+
+    Raises:
+        FEMException: The system has not been solved (linearly) for its current state
+
+    Returns:
+        Sensitivity: Derivatives of the response to the EA and EI of every element
+    """
+    factorization = system._factorization
+    u = system.system_displacement_vector
+    changed = (
+        system._stiffness_changed or system._supports_changed or system._loads_changed
+    )
+    if factorization is None or u is None or changed or system._changed_elements:
+        raise FEMException(
+            "Sensitivity error",
+            "The system has to be solved linearly before determining sensitivities.",
+        )
+
+    elements = list(system.element_map.values())
+    if any(el.matrix_key is None for el in elements):
+        raise FEMException(
+            "Sensitivity error",
+            "Sensitivities are not available for elements with an adapted stiffness.",
+        )
+    element_ids = np.array([el.id for el in elements])
+    dofs = np.array(
+        [
+            [(el.node_1.id - 1) * 3 + i for i in range(3)]
+            + [(el.node_2.id - 1) * 3 + i for i in range(3)]
+            for el in elements
+        ]
+    )
+    weights = np.zeros((len(elements), 6))
+    for index, el in enumerate(elements):
+        if el.id in element_weights:
+            weights[index] = element_weights[el.id]
+
+    # adjoint load: the derivative of the response with respect to the displacements
+    adjoint_load = np.zeros(u.size)
+    if displacement_weights is not None:
+        adjoint_load += displacement_weights
+    stiffness = np.array([el.stiffness_matrix for el in elements])
+    np.add.at(adjoint_load, dofs, np.einsum("eji,ej->ei", stiffness, weights))
+
+    remainder = system._remainder_indexes
+    adjoint = np.zeros(u.size)
+    # the system matrix is not symmetric for elements with rotational springs
+    adjoint[remainder] = low_rank_solve(
+        factorization,
+        adjoint_load[remainder],
+        system._low_rank_update,
+        transposed=True,
+    )
+
+    kinematic = np.array([el.kinematic_matrix for el in elements])
+    deformation = np.einsum("eij,ej->ei", kinematic, u[dofs])
+    adjoint_deformation = np.einsum("eij,ej->ei", kinematic, weights - adjoint[dofs])
+
+    length = np.array([el.l for el in elements])
+    d_EA = adjoint_deformation[:, 0] * deformation[:, 0] / length
+    d_constitutive = np.array([_bending_derivative(el) for el in elements])
+    d_EI = np.einsum("ei,eij,ej->e", adjoint_deformation, d_constitutive, deformation)
+    return Sensitivity(element_ids, d_EA, d_EI)
+
+
+def _bending_derivative(element: "Element") -> np.ndarray:
+    """Derivative of the constitutive matrix of an element with respect to EI.
+
+    Rotational springs modify the entries c = a * EI as c' = 1 / (1 / c + 1 / k), so
+    dc'/dEI = (c' / c)^2 * a = c'^2 / (c * EI). Truss elements have no bending stiffness.
+    """
+    derivative = np.zeros((3, 3))
+    if element.type == "truss":
+        return derivative
+    springs = element.springs if element.springs is not None else {}
+    hinges = {k: v for k, v in springs.items() if v == 0}
+    base = constitutive_matrix(
+        element.EA,
+        element.EI,
+        element.l,
+        hinges,
+        element.node_1.hinge,
+        element.node_2.hinge,
+    )
+    np.divide(
+        element.constitutive_matrix**2,
+        base * element.EI,
+        out=derivative,
+        where=base != 0,
+    )
+    derivative[0, 0] = 0.0
+    return derivative
@@ -0,0 +1,167 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+PhaseCallback = Callable[[str, float, int], None]
+
+
+class PhaseStats:
+    def __init__(self) -> None:
+        """Accumulated statistics of one phase of a solve"""
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated_blocks = (
+            0  # net number of memory blocks allocated by the interpreter
+        )
+        self.peak_bytes = 0  # only with track_memory
+
+    def add(self, seconds: float, allocated_blocks: int, peak_bytes: int = 0) -> None:
+        """Add a call of the phase
+
+        Args:
+            seconds (float): Wall time of the call
+            allocated_blocks (int): Net number of allocated memory blocks
+            peak_bytes (int, optional): Peak traced memory. Defaults to 0.
+        """
+        self.calls += 1
+        self.seconds += seconds
+        self.allocated_blocks += allocated_blocks
+        self.peak_bytes = max(self.peak_bytes, peak_bytes)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Statistics as a dictionary
+
+        Returns:
+            Dict[str, float]: {"calls": int, "seconds": float, "allocated_blocks": int, "peak_bytes": int}
+        """
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "allocated_blocks": self.allocated_blocks,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class SolveStats:
+    """
+    Opt-in instrumentation of SystemElements.solve. Records the wall time and allocations of every phase
+    of the last solve, including the nested solves of non-linear and buckling calculations.
+
+    Attributes:
+        phases: (dict) Maps phase names to PhaseStats, in the order the phases first occurred.
+        solves: (int) Number of (nested) solve calls.
+        total_seconds: (float) Wall time of the outer solve call.
+        callbacks: (list) Functions called after every phase with (phase name, seconds, allocated blocks).
+        track_memory: (bool) Whether to trace the peak memory of the phases with tracemalloc. This slows
+            down the solve considerably. The peak of a phase that contains other phases only covers the
+            part after its last inner phase.
+    """
+
+    def __init__(
+        self,
+        callbacks: Optional[Sequence[PhaseCallback]] = None,
+        track_memory: bool = False,
+    ):
+        """Create the statistics of a solve
+
+        Args:
+            callbacks (Optional[Sequence[PhaseCallback]], optional): Functions called after every phase
+                with (phase name, seconds, allocated blocks). Defaults to None.
+            track_memory (bool, optional): Trace the peak memory of every phase. Defaults to False.
+        """
+        self.callbacks: List[PhaseCallback] = list(callbacks or [])
+        self.track_memory = track_memory
+        self.phases: Dict[str, PhaseStats] = {}
+        self.solves = 0
+        self.total_seconds = 0.0
+        self._depth = 0
+        self._started_tracing = False
+
+    def reset(self) -> None:
+        """Clear the recorded statistics"""
+        self.phases = {}
+        self.solves = 0
+        self.total_seconds = 0.0
+
+    @contextmanager
+    def solve(self) -> Iterator[None]:
+        """Record a solve. The outer solve resets the statistics, nested solves add to them."""
+        if self._depth == 0:
+            self.reset()
+            if self.track_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        self._depth += 1
+        self.solves += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.total_seconds = time.perf_counter() - start
+                if self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record a phase of a solve
+
+        Args:
+            name (str): Name of the phase
+        """
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated_blocks = sys.getallocatedblocks() - blocks
+            peak_bytes = tracemalloc.get_traced_memory()[1] if tracing else 0
+            self.phases.setdefault(name, PhaseStats()).add(
+                seconds, allocated_blocks, peak_bytes
+            )
+            for callback in self.callbacks:
+                callback(name, seconds, allocated_blocks)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Statistics as a dictionary, e.g. for logging as JSON
+
+        Returns:
+            Dict[str, Any]: {"solves": int, "total_seconds": float, "phases": {name: {...}}}
+        """
+        return {
+            "solves": self.solves,
+            "total_seconds": self.total_seconds,
+            "phases": {name: stats.as_dict() for name, stats in self.phases.items()},
+        }
+
+    def report(self) -> str:
+        """Table of the phases, sorted by their time
+
+        Returns:
+            str: Human readable report
+        """
+        lines = [
+            f"{self.solves} solve(s) in {self.total_seconds:.6f} s",
+            f"{'phase':<24}{'calls':>8}{'seconds':>12}{'share':>8}{'blocks':>10}"
+            + (f"{'peak MB':>10}" if self.track_memory else ""),
+        ]
+        for name, stats in sorted(
+            self.phases.items(), key=lambda item: item[1].seconds, reverse=True
+        ):
+            share = stats.seconds / self.total_seconds if self.total_seconds else 0.0
+            line = (
+                f"{name:<24}{stats.calls:>8}{stats.seconds:>12.6f}{share:>8.1%}"
+                f"{stats.allocated_blocks:>10}"
+            )
+            if self.track_memory:
+                line += f"{stats.peak_bytes / 1e6:>10.2f}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,492 @@
+"""Compact, versioned binary format of a structure and its results.
+
+A structure is stored as named NumPy arrays in a .npz file: nodes, elements, supports, springs, loads,
+plastic moment limits and optionally the results of the last solve. Loading rebuilds the structure
+with the bulk insertion path of system_components.bulk, and never unpickles objects. The arrays of a
+.npz file are read on access, so the results can be read lazily with load_results.
+
+Format version 1, missing values are NaN:
+    settings: EA, EI, load_factor, orientation_cs, mesh, element count, figure width and height
+    node_ids, node_coordinates (n, 2)
+    element_ids, element_nodes (n, 2), element_EA, element_EI, element_type, element_section,
+    element_spring (n, 2), element_mp (n, 2), element_dead_load, element_q_load (n, 2),
+    element_q_perp_load (n, 2), element_q_direction, element_q_angle
+    supports_fixed, supports_hinged, supports_rotational, internal_hinges: node ids
+    supports_roll: (n, 3) node id, direction and rotate; supports_roll_angle: inclination, NaN if none
+    supports_spring: (n, 4) node id, translation, stiffness and roll
+    loads_point: (n, 3) node id, Fx, Fy; loads_moment: (n, 2) node id, Tz
+    loads_q_ids, loads_q (n, 2, 2), loads_dead_load: element ids
+    result_*: results of the last solve, see RESULTS
+"""
+
+from typing import TYPE_CHECKING, IO, Callable, Dict, List, Literal, Mapping, Union
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.fork import paused_gc
+from anastruct.fem.node import Node
+from anastruct.fem.system_components import bulk
+
+if TYPE_CHECKING:
+    import os
+
+    from anastruct.fem.system import SystemElements
+
+    FileLike = Union[str, "os.PathLike[str]", IO[bytes]]
+
+FORMAT_VERSION = 1
+
+# diagrams of the elements, stored as one (n_elements, mesh) array per quantity
+DIAGRAMS = (
+    "bending_moment",
+    "shear_force",
+    "axial_force",
+    "deflection",
+    "total_deflection",
+    "extension",
+)
+# scalar results of the elements
+SCALARS = (
+    "N_1",
+    "N_2",
+    "max_deflection",
+    "max_total_deflection",
+    "max_extension",
+)
+# stored results, prefixed with result_
+RESULTS = (
+    "displacements",
+    "nodes",
+    "reaction_ids",
+    "reactions",
+    "element_displacements",
+    "element_forces",
+    "element_primary_forces",
+    "buckling_factor",
+    *DIAGRAMS,
+    *SCALARS,
+)
+
+
+def save_system(
+    system: "SystemElements",
+    file: "FileLike",
+    results: bool = True,
+    compress: bool = True,
+) -> None:
+    """Save a structure, see SystemElements.save
+
+    Args:
+        system (SystemElements): Structure to save
+        file (FileLike): File name or binary file object
+        results (bool, optional): Also save the results of the last solve. Defaults to True.
+        compress (bool, optional): Compress the arrays. Defaults to True.
+
+    Raises:
+        FEMException: The structure contains superelements, which can not be saved
+    """
+    arrays = model_arrays(system)
+    if results and system.system_displacement_vector is not None:
+        arrays.update(
+            {f"result_{name}": array for name, array in result_arrays(system).items()}
+        )
+    savez: Callable[..., None] = np.savez_compressed if compress else np.savez
+    savez(file, **arrays)
+
+
+def load_system(file: "FileLike", results: bool = True) -> "SystemElements":
+    """Load a structure, see SystemElements.load
+
+    Args:
+        file (FileLike): File name or binary file object
+        results (bool, optional): Also load the results, if saved. Defaults to True.
+
+    Raises:
+        FEMException: The file is not a structure of a supported version
+
+    Returns:
+        SystemElements: Structure
+    """
+    with paused_gc(), np.load(file, allow_pickle=False) as arrays:
+        system = build_system(arrays)
+        if results and "result_displacements" in arrays.files:
+            restore_results(
+                system,
+                {name: arrays[f"result_{name}"] for name in RESULTS},
+            )
+    return system
+
+
+def load_results(file: "FileLike") -> Mapping[str, np.ndarray]:
+    """Read the results of a saved structure lazily, without building the structure. Every array
+    is read from the file when it is accessed.
+
+    Args:
+        file (FileLike): File name or binary file object
+
+    Raises:
+        FEMException: The file is not a structure of a supported version, or has no results
+
+    Returns:
+        Mapping[str, np.ndarray]: Results by name, see RESULTS. The element arrays are in the order
+            of the element_ids array, the node results (n, 6) Fx, Fy, Tz, ux, uy, phi_z in the order
+            of the node_ids array.
+    """
+    arrays = np.load(file, allow_pickle=False)
+    _check_version(arrays)
+    if "result_displacements" not in arrays.files:
+        raise FEMException("Storage error", "The file contains no results.")
+    return _Results(arrays)
+
+
+class _Results(Mapping[str, np.ndarray]):
+    """Lazy view of the result arrays of an open .npz file"""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        self.arrays = arrays
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in ("node_ids", "element_ids"):
+            return self.arrays[name]
+        return self.arrays[f"result_{name}"]
+
+    def __iter__(self):  # type: ignore[no-untyped-def]
+        return iter(("node_ids", "element_ids", *RESULTS))
+
+    def __len__(self) -> int:
+        return len(RESULTS) + 2
+
+
+def model_arrays(system: "SystemElements") -> Dict[str, np.ndarray]:
+    """Arrays of the model, without results
+
+    Args:
+        system (SystemElements): Structure
+
+    Raises:
+        FEMException: The structure contains superelements
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays by name, see the module documentation
+    """
+    if system.superelement_map:
+        raise FEMException(
+            "Storage error", "Structures with superelements can not be saved."
+        )
+    elements = list(system.element_map.values())
+    figsize = system.figsize if system.figsize is not None else (np.nan, np.nan)
+    return {
+        "format_version": np.array(FORMAT_VERSION),
+        "settings": np.array(
+            [
+                system.EA,
+                system.EI,
+                system.load_factor,
+                system.orientation_cs,
+                system.plotter.mesh,
+                system.count,
+                *figsize,
+            ],
+            dtype=float,
+        ),
+        "node_ids": np.array(list(system.node_map), dtype=int),
+        "node_coordinates": np.array(
+            [node.vertex.coordinates for node in system.node_map.values()],
+            dtype=np.float32,
+        ).reshape(-1, 2),
+        "element_ids": np.array([el.id for el in elements], dtype=int),
+        "element_nodes": np.array(
+            [(el.node_id1, el.node_id2) for el in elements], dtype=int
+        ).reshape(-1, 2),
+        "element_EA": np.array([el.EA for el in elements], dtype=float),
+        "element_EI": np.array([el.EI for el in elements], dtype=float),
+        "element_type": np.array([el.type for el in elements], dtype=str),
+        "element_section": np.array([el.section_name for el in elements], dtype=str),
+        "element_spring": _end_array([el.springs or {} for el in elements]),
+        "element_mp": _end_array(
+            [system.non_linear_elements.get(el.id, {}) for el in elements]
+        ),
+        "element_dead_load": np.array([el.dead_load for el in elements], dtype=float),
+        "element_q_load": np.array([el.q_load for el in elements], dtype=float).reshape(
+            -1, 2
+        ),
+        "element_q_perp_load": np.array(
+            [el.q_perp_load for el in elements], dtype=float
+        ).reshape(-1, 2),
+        "element_q_direction": np.array(
+            [el.q_direction or "" for el in elements], dtype=str
+        ),
+        "element_q_angle": np.array(
+            [np.nan if el.q_angle is None else el.q_angle for el in elements],
+            dtype=float,
+        ),
+        "supports_fixed": _ids(system.supports_fixed),
+        "supports_hinged": _ids(system.supports_hinged),
+        "supports_rotational": _ids(system.supports_rotational),
+        "internal_hinges": _ids(system.internal_hinges),
+        "supports_roll": np.array(
+            [
+                (node.id, direction, rotate)
+                for node, direction, rotate in zip(
+                    system.supports_roll,
+                    system.supports_roll_direction,
+                    system.supports_roll_rotate,
+                )
+            ],
+            dtype=int,
+        ).reshape(-1, 3),
+        "supports_roll_angle": np.array(
+            [
+                system.inclined_roll.get(node.id, np.nan)
+                for node in system.supports_roll
+            ],
+            dtype=float,
+        ),
+        "supports_spring": np.array(
+            [
+                (node.id, translation, system.system_spring_map[dof], roll)
+                for translation, springs in (
+                    (1, system.supports_spring_x),
+                    (2, system.supports_spring_y),
+                    (3, system.supports_spring_z),
+                )
+                for node, roll in springs
+                for dof in [(node.id - 1) * 3 + translation - 1]
+            ],
+            dtype=float,
+        ).reshape(-1, 4),
+        "loads_point": np.array(
+            [(node_id, *load) for node_id, load in system.loads_point.items()],
+            dtype=float,
+        ).reshape(-1, 3),
+        "loads_moment": np.array(
+            list(system.loads_moment.items()), dtype=float
+        ).reshape(-1, 2),
+        "loads_q_ids": np.array(list(system.loads_q), dtype=int),
+        "loads_q": np.array(list(system.loads_q.values()), dtype=float).reshape(
+            (-1, 2, 2)
+        ),
+        "loads_dead_load": np.array(sorted(system.loads_dead_load), dtype=int),
+        "plot_load_maxima": np.array(
+            [system.plotter.max_q, system.plotter.max_system_point_load], dtype=float
+        ),
+    }
+
+
+def build_system(arrays: Mapping[str, np.ndarray]) -> "SystemElements":
+    """Build a structure from the arrays of model_arrays
+
+    Args:
+        arrays (Mapping[str, np.ndarray]): Arrays by name
+
+    Raises:
+        FEMException: The arrays are not a structure of a supported version
+
+    Returns:
+        SystemElements: Structure
+    """
+    # pylint: disable=import-outside-toplevel
+    from anastruct.fem.system import SystemElements
+
+    _check_version(arrays)
+    EA, EI, load_factor, orientation_cs, mesh, count, width, height = arrays[
+        "settings"
+    ].tolist()
+    system = SystemElements(
+        figsize=None if np.isnan(width) else (width, height),
+        EA=EA,
+        EI=EI,
+        load_factor=load_factor,
+        mesh=int(mesh),
+        invert_y_loads=orientation_cs == -1,
+    )
+    bulk.add_nodes(system, arrays["node_ids"].tolist(), arrays["node_coordinates"])
+    element_ids = arrays["element_ids"].tolist()
+    nodes = arrays["element_nodes"]
+    bulk.add_elements(
+        system,
+        nodes[:, 0].tolist(),
+        nodes[:, 1].tolist(),
+        arrays["element_EA"].tolist(),
+        arrays["element_EI"].tolist(),
+        element_type=arrays["element_type"].tolist(),
+        spring=arrays["element_spring"],
+        mp=arrays["element_mp"],
+        g=arrays["element_dead_load"].tolist(),
+        section_name=arrays["element_section"].tolist(),
+        element_ids=element_ids,
+    )
+    system.count = int(count)
+    system.loads_dead_load = set(arrays["loads_dead_load"].tolist())
+
+    # q-loads as applied, in the orientation of the elements
+    q_angles = arrays["element_q_angle"].tolist()
+    for element_id, q_load, q_perp_load, direction, angle in zip(
+        element_ids,
+        arrays["element_q_load"].tolist(),
+        arrays["element_q_perp_load"].tolist(),
+        arrays["element_q_direction"].tolist(),
+        q_angles,
+    ):
+        element = system.element_map[element_id]
+        element.q_load = tuple(q_load)
+        element.q_perp_load = tuple(q_perp_load)
+        element.q_direction = direction or None
+        element.q_angle = None if np.isnan(angle) else angle
+    system.loads_q = {
+        element_id: [tuple(load[0]), tuple(load[1])]
+        for element_id, load in zip(
+            arrays["loads_q_ids"].tolist(), arrays["loads_q"].tolist()
+        )
+    }
+    system.loads_point = {
+        int(node_id): (Fx, Fy) for node_id, Fx, Fy in arrays["loads_point"].tolist()
+    }
+    system.loads_moment = {
+        int(node_id): Tz for node_id, Tz in arrays["loads_moment"].tolist()
+    }
+    system.plotter.max_q, system.plotter.max_system_point_load = arrays[
+        "plot_load_maxima"
+    ].tolist()
+
+    node_map = system.node_map
+    system.supports_fixed = [node_map[i] for i in arrays["supports_fixed"].tolist()]
+    system.supports_hinged = [node_map[i] for i in arrays["supports_hinged"].tolist()]
+    system.supports_rotational = [
+        node_map[i] for i in arrays["supports_rotational"].tolist()
+    ]
+    for node_id in arrays["internal_hinges"].tolist():
+        system.add_internal_hinge(node_id)
+    for (node_id, direction, rotate), angle in zip(
+        arrays["supports_roll"].tolist(), arrays["supports_roll_angle"].tolist()
+    ):
+        system.supports_roll.append(node_map[node_id])
+        system.supports_roll_direction.append(direction)
+        system.supports_roll_rotate.append(bool(rotate))
+        if not np.isnan(angle):
+            system.inclined_roll[node_id] = angle
+    for node_id, translation, k, roll in arrays["supports_spring"].tolist():
+        system.add_support_spring(int(node_id), int(translation), k, bool(roll))  # type: ignore[arg-type]
+    system._set_dirty(stiffness=True, supports=True, loads=True)
+    return system
+
+
+def result_arrays(system: "SystemElements") -> Dict[str, np.ndarray]:
+    """Arrays of the results of the last solve
+
+    Args:
+        system (SystemElements): Solved structure
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays by name, see RESULTS
+    """
+    assert system.system_displacement_vector is not None
+    elements = list(system.element_map.values())
+    arrays = {
+        "displacements": np.array(system.system_displacement_vector),
+        "nodes": np.array(
+            [
+                (node.Fx, node.Fy, node.Tz, node.ux, node.uy, node.phi_z)
+                for node in system.node_map.values()
+            ],
+            dtype=float,
+        ).reshape(-1, 6),
+        "reaction_ids": np.array(list(system.reaction_forces), dtype=int),
+        "reactions": np.array(
+            [(node.Fx, node.Fy, node.Tz) for node in system.reaction_forces.values()],
+            dtype=float,
+        ).reshape(-1, 3),
+        "element_displacements": _stack(
+            [el.element_displacement_vector for el in elements], 6
+        ),
+        "element_forces": _stack([el.element_force_vector for el in elements], 6),
+        "element_primary_forces": _stack(
+            [el.element_primary_force_vector for el in elements], 6
+        ),
+        "buckling_factor": np.array(
+            np.nan if system.buckling_factor is None else system.buckling_factor
+        ),
+    }
+    for name in DIAGRAMS:
+        values = [getattr(el, name) for el in elements]
+        if any(value is None for value in values):
+            arrays[name] = np.zeros((0, 0))
+        else:
+            arrays[name] = _stack(values, len(values[0]) if values else 0)
+    for name in SCALARS:
+        arrays[name] = np.array(
+            [
+                np.nan if getattr(el, name) is None else getattr(el, name)
+                for el in elements
+            ],
+            dtype=float,
+        )
+    return arrays
+
+
+def restore_results(system: "SystemElements", arrays: Mapping[str, np.ndarray]) -> None:
+    """Set the results of a structure from the arrays of result_arrays
+
+    Args:
+        system (SystemElements): Structure, in the state in which the results were saved
+        arrays (Mapping[str, np.ndarray]): Arrays by name, see RESULTS
+    """
+    system.system_displacement_vector = np.array(arrays["displacements"])
+    for node, values in zip(system.node_map.values(), arrays["nodes"].tolist()):
+        node.Fx, node.Fy, node.Tz, node.ux, node.uy, node.phi_z = values
+    system.reaction_forces = {
+        node_id: Node(node_id, Fx=Fx, Fy=Fy, Tz=Tz)
+        for node_id, (Fx, Fy, Tz) in zip(
+            arrays["reaction_ids"].tolist(), arrays["reactions"].tolist()
+        )
+    }
+    buckling_factor = float(arrays["buckling_factor"])
+    system.buckling_factor = None if np.isnan(buckling_factor) else buckling_factor
+
+    elements = list(system.element_map.values())
+    for el, displacements, forces, primary_forces in zip(
+        elements,
+        arrays["element_displacements"],
+        arrays["element_forces"],
+        arrays["element_primary_forces"],
+    ):
+        el.element_displacement_vector = displacements
+        el.element_force_vector = forces
+        el.element_primary_force_vector = primary_forces
+    for name in DIAGRAMS:
+        if arrays[name].size:
+            for el, values in zip(elements, arrays[name]):
+                setattr(el, name, values)
+    for name in SCALARS:
+        for el, value in zip(elements, arrays[name].tolist()):
+            setattr(el, name, None if np.isnan(value) else value)
+    # the element end results follow from the element vectors
+    system.post_processor.node_results_elements()
+
+
+def _check_version(arrays: Mapping[str, np.ndarray]) -> None:
+    if "format_version" not in arrays:
+        raise FEMException("Storage error", "The file is not an anaStruct structure.")
+    version = int(arrays["format_version"])
+    if version > FORMAT_VERSION:
+        raise FEMException(
+            "Storage error",
+            f"The file has format version {version}, this version of anaStruct reads up to "
+            f"version {FORMAT_VERSION}.",
+        )
+
+
+def _ids(nodes: List[Node]) -> np.ndarray:
+    return np.array([node.id for node in nodes], dtype=int)
+
+
+def _end_array(values: List[Dict[Literal[1, 2], float]]) -> np.ndarray:
+    """(n, 2) array of the values at the first and second node, NaN if absent"""
+    return np.array(
+        [(value.get(1, np.nan), value.get(2, np.nan)) for value in values], dtype=float
+    ).reshape(len(values), 2)
+
+
+def _stack(values: List[np.ndarray], width: int) -> np.ndarray:
+    return np.array(values, dtype=float).reshape(len(values), width)
@@ -0,0 +1,220 @@
+"""Static (Guyan) condensation of a structure onto its boundary nodes.
+
+With the degrees of freedom split in boundary (b) and interior (i) ones, the interior displacements
+follow from the boundary displacements as
+
+    u_i = K_ii^-1 (f_i - K_ib u_b)
+
+so the structure acts on its boundary as one superelement with
+
+    K = K_bb - K_bi K_ii^-1 K_ib        f = f_b - K_bi K_ii^-1 f_i
+
+The condensation is exact for linear analyses. A superelement can be added many times to other
+structures, and the interior results of every placement are recovered on demand.
+"""
+
+import copy
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.backends import Factorization, to_dense
+from anastruct.fem.system_components.assembly import (
+    assemble_sparse_matrix,
+    prep_matrix_forces,
+)
+from anastruct.fem.system_components.util import rotation_free_nodes
+from anastruct.vertex import Vertex
+
+if TYPE_CHECKING:
+    from anastruct.fem.system import SystemElements
+    from anastruct.types import SystemMatrix
+
+
+class Superelement(NamedTuple):
+    """A structure condensed onto its boundary nodes, see SystemElements.condense.
+    The supports of the structure are ignored, its loads are condensed with it.
+
+    Attributes:
+        boundary: Node ids of the boundary nodes in the condensed structure
+        vertices: Locations of the boundary nodes
+        stiffness_matrix: (3 m, 3 m) condensed stiffness matrix of the m boundary nodes
+        load_vector: (3 m) condensed loads on the boundary nodes
+        free_rotations: (m) whether the superelement has no rotational stiffness at a boundary node
+        structure: Copy of the condensed structure with its loads applied, used to recover results
+        boundary_indexes: Degrees of freedom of the boundary nodes in the structure
+        interior_indexes: Degrees of freedom of the interior of the structure
+        coupling: Rows of the interior and columns of the boundary of the system matrix (K_ib)
+        factorization: Factorization of the interior of the system matrix (K_ii), None without interior
+    """
+
+    boundary: Tuple[int, ...]
+    vertices: Tuple[Vertex, ...]
+    stiffness_matrix: np.ndarray
+    load_vector: np.ndarray
+    free_rotations: np.ndarray
+    structure: "SystemElements"
+    boundary_indexes: np.ndarray
+    interior_indexes: np.ndarray
+    coupling: "SystemMatrix"
+    factorization: Optional[Factorization]
+
+    def end_forces(self, boundary_displacements: np.ndarray) -> np.ndarray:
+        """Forces of the superelement on its boundary nodes, like the end forces of an element
+
+        Args:
+            boundary_displacements (np.ndarray): (3 m) displacements of the boundary nodes
+
+        Returns:
+            np.ndarray: (3 m) forces K u_b - f
+        """
+        forces: np.ndarray = (
+            self.stiffness_matrix @ boundary_displacements - self.load_vector
+        )
+        return forces
+
+    def displacements(self, boundary_displacements: np.ndarray) -> np.ndarray:
+        """Displacements of the whole structure for the given displacements of the boundary nodes
+
+        Args:
+            boundary_displacements (np.ndarray): (3 m) displacements of the boundary nodes
+
+        Returns:
+            np.ndarray: System displacement vector of the structure
+        """
+        structure = self.structure
+        assert structure.system_force_vector is not None
+        displacements = np.zeros(structure.system_force_vector.size)
+        displacements[self.boundary_indexes] = boundary_displacements
+        if self.factorization is not None:
+            displacements[self.interior_indexes] = self.factorization.solve(
+                structure.system_force_vector[self.interior_indexes]
+                - self.coupling @ boundary_displacements
+            )
+        return displacements
+
+    def recover(self, boundary_displacements: np.ndarray) -> "SystemElements":
+        """Results of the whole structure for the given displacements of the boundary nodes
+
+        Args:
+            boundary_displacements (np.ndarray): (3 m) displacements of the boundary nodes
+
+        Returns:
+            SystemElements: Solved copy of the structure. Its node results at the boundary are
+                the forces of the boundary nodes on the structure, it has no reaction forces.
+        """
+        structure = copy.deepcopy(self.structure)
+        structure.system_displacement_vector = self.displacements(
+            boundary_displacements
+        )
+        structure._element_forces()
+        structure.post_processor.node_results_elements()
+        structure.post_processor.node_results_system()
+        structure.post_processor.element_results()
+        return structure
+
+
+class PlacedSuperelement(NamedTuple):
+    """A superelement in a structure, see SystemElements.add_superelement
+
+    Attributes:
+        superelement: The condensed structure
+        node_ids: Node ids of the boundary nodes in the structure, in the order of superelement.boundary
+    """
+
+    superelement: Superelement
+    node_ids: Tuple[int, ...]
+
+    @property
+    def dofs(self) -> np.ndarray:
+        """Degrees of freedom of the boundary nodes in the system matrix
+
+        Returns:
+            np.ndarray: (3 m) indexes in the system vectors
+        """
+        return np.array(
+            [(node_id - 1) * 3 + i for node_id in self.node_ids for i in range(3)],
+            dtype=int,
+        )
+
+
+def condense(system: "SystemElements", boundary: Sequence[int]) -> Superelement:
+    """Condense a structure onto its boundary nodes, see SystemElements.condense
+
+    Args:
+        system (SystemElements): Structure to condense. It is not modified.
+        boundary (Sequence[int]): Node ids of the boundary nodes
+
+    Raises:
+        FEMException: The boundary nodes are invalid, or the interior is unstable
+
+    Returns:
+        Superelement: Condensed structure
+    """
+    boundary = tuple(boundary)
+    if not boundary or len(set(boundary)) != len(boundary):
+        raise FEMException(
+            "Wrong parameters", "The boundary should be one or more unique node ids."
+        )
+    missing = [node_id for node_id in boundary if node_id not in system.node_map]
+    if missing:
+        raise FEMException("Wrong parameters", f"Nodes {missing} do not exist.")
+
+    structure = copy.deepcopy(system)
+    n_dofs = len(structure.node_map) * 3
+    structure.shape_system_matrix = n_dofs
+    matrix = assemble_sparse_matrix(
+        structure, list(structure.element_map.values()), springs=False
+    )
+    prep_matrix_forces(structure)
+    forces = structure.system_force_vector
+    assert forces is not None
+
+    boundary_indexes = np.array(
+        [(node_id - 1) * 3 + i for node_id in boundary for i in range(3)], dtype=int
+    )
+    # rotations without stiffness are eliminated from the interior, as in process_supports
+    interior = np.ones(n_dofs, dtype=bool)
+    interior[[(node.id - 1) * 3 + 2 for node in rotation_free_nodes(structure)]] = False
+    interior[boundary_indexes] = False
+    interior_indexes = np.flatnonzero(interior)
+
+    coupling = matrix[interior_indexes][:, boundary_indexes]
+    stiffness = to_dense(matrix[boundary_indexes][:, boundary_indexes])
+    loads = forces[boundary_indexes]
+    factorization = None
+    if interior_indexes.size:
+        backend = structure._solver_backend
+        interior_matrix = matrix[interior_indexes][:, interior_indexes]
+        if backend.matrix_format != "sparse":
+            interior_matrix = to_dense(interior_matrix)
+        factorization = backend.factorize(interior_matrix, interior_indexes)
+        if not factorization.is_stable():
+            raise FEMException(
+                "StabilityError",
+                "The interior of the superelement is unstable. Add the nodes that need "
+                "support to the boundary.",
+            )
+        transfer = to_dense(matrix[boundary_indexes][:, interior_indexes])
+        stiffness = stiffness - transfer @ factorization.solve(to_dense(coupling))
+        loads = loads - transfer @ factorization.solve(forces[interior_indexes])
+
+    diagonal = np.abs(np.diag(stiffness))
+    free_rotations = diagonal[2::3] <= 1e-12 * diagonal.max()
+
+    superelement = Superelement(
+        boundary=boundary,
+        vertices=tuple(structure.node_map[node_id].vertex for node_id in boundary),
+        stiffness_matrix=stiffness,
+        load_vector=loads,
+        free_rotations=free_rotations,
+        structure=structure,
+        boundary_indexes=boundary_indexes,
+        interior_indexes=interior_indexes,
+        coupling=coupling,
+        factorization=factorization,
+    )
+    for array in (stiffness, loads, free_rotations, boundary_indexes, interior_indexes):
+        array.setflags(write=False)
+    return superelement
@@ -1,14 +1,19 @@
 import collections.abc
+import contextlib
 import copy
 import math
 import re
+import warnings
 from typing import (
     TYPE_CHECKING,
     Any,
     Collection,
+    ContextManager,
     Dict,
+    Iterator,
     List,
     Literal,
+    Mapping,
     Optional,
     Sequence,
     Set,
@@ -19,18 +24,43 @@ from typing import (
 
 import numpy as np
 
-from anastruct.basic import FEMException, arg_to_list
+from anastruct.basic import FEMException, LazyModule, arg_to_list
 from anastruct.fem import plotter, system_components
+from anastruct.fem.backends import (
+    AutoBackend,
+    Factorization,
+    SolverBackend,
+    get_backend,
+    to_dense,
+)
+from anastruct.fem.compiled import CompiledSystem, compile_system
+from anastruct.fem.complexity import ModelComplexity, model_complexity
+from anastruct.fem.components import (
+    Component,
+    connected_components,
+    factorize_components,
+)
 from anastruct.fem.elements import Element
+from anastruct.fem.export import export_results
+from anastruct.fem.fork import fork_system
 from anastruct.fem.postprocess import SystemLevel as post_sl
+from anastruct.fem.postprocess import iter_element_results
+from anastruct.fem.schema import system_from_dict, system_to_dict
+from anastruct.fem.stats import SolveStats
+from anastruct.fem.storage import load_system, save_system
+from anastruct.fem.substructure import PlacedSuperelement, Superelement, condense
 from anastruct.fem.util.load import LoadCase
-from anastruct.sectionbase import properties
 from anastruct.vertex import Vertex, vertex_range
 
 if TYPE_CHECKING:
     from matplotlib.figure import Figure
 
+    from anastruct.fem.export import ExportFormat, ExportTarget, ResultTable
     from anastruct.fem.node import Node
+    from anastruct.fem.stats import PhaseCallback
+    from anastruct.fem.storage import FileLike
+    from anastruct.fem.util.load import LoadCombination
+    from anastruct.sectionbase import properties
     from anastruct.types import (
         AxisNumber,
         Dimension,
@@ -38,8 +68,12 @@ if TYPE_CHECKING:
         MpType,
         Spring,
         SupportDirection,
+        SystemMatrix,
         VertexLike,
     )
+else:
+    # the section databases are read on the first element with a section
+    properties = LazyModule("anastruct.sectionbase.properties")
 
 
 class SystemElements:
@@ -57,6 +91,9 @@ class SystemElements:
         loads_q: (dict) Maps element ids to q-loads.
         loads_moment: (dict) Maps node ids to moment loads.
         loads_dead_load: (set) Element ids that have a dead load applied.
+        superelement_map: (dict) Keys are the superelement ids, values are the placed superelements.
+        max_low_rank_elements: (int) Maximum number of elements with a changed stiffness that are solved with a
+            low-rank correction of the existing factorization, before the system matrix is factorized again.
 
     Methods:
         add_element: Add a new element to the structure.
@@ -70,7 +107,22 @@ class SystemElements:
         add_support_rotational: Add a rotational support to a node.
         add_support_spring: Add a spring support to a node.
         insert_node: Insert a node into an existing structure.
+        condense: Condense the structure onto boundary nodes into a reusable superelement.
+        add_superelement: Add a condensed structure to the structure.
+        fork: Copy the structure cheaply for a what-if analysis.
+        save: Save the structure and its results to a compact binary file.
+        load: Load a structure saved with save.
+        to_dict: Export the structure to a JSON-compatible dictionary.
+        from_dict: Create a structure from a JSON-compatible dictionary.
+        export_results: Stream the node, reaction or element results to a csv or columnar file.
+        set_element_stiffness: Change the axial and/or bending stiffness of an existing element.
         solve: Compute the results of current model.
+        reanalyze: Change the stiffness of some elements and compute the updated results.
+        complexity: Report the size and estimated solve cost of the structure.
+        connected_components: Find the independent parts of the structure.
+        compile: Freeze the structure into an immutable model for repeated solves.
+        set_solver_backend: Choose the linear solver used by all analyses.
+        enable_solve_stats: Record the time and allocations of every phase of a solve.
         validate: Validate the current model.
     """
 
@@ -116,6 +168,8 @@ class SystemElements:
         self.node_element_map: Dict[int, List[Element]] = (
             {}
         )  # maps node ids to Element objects
+        # maps superelement ids to the condensed structures and their boundary nodes
+        self.superelement_map: Dict[int, PlacedSuperelement] = {}
         # keys matrix index (for both row and columns), values K, are processed
         # assemble_system_matrix
         self.system_spring_map: Dict[int, float] = {}
@@ -167,16 +221,37 @@ class SystemElements:
 
         # Objects state
         self.count = 0
-        self.system_matrix: Optional[np.ndarray] = None
+        self.system_matrix: Optional["SystemMatrix"] = None
         self.system_force_vector: Optional[np.ndarray] = None
         self.system_displacement_vector: Optional[np.ndarray] = None
         self.shape_system_matrix: Optional[int] = (
             None  # actually is the size of the square system matrix
         )
         self.reduced_force_vector: Optional[np.ndarray] = None
-        self.reduced_system_matrix: Optional[np.ndarray] = None
+        self.reduced_system_matrix: Optional["SystemMatrix"] = None
         self._vertices: Dict[Vertex, int] = {}  # maps vertices to node ids
 
+        # Dirty state. Only the parts of the model that have changed are recomputed on solve.
+        self._stiffness_changed = True  # the system matrix has to be reassembled
+        self._supports_changed = True  # the supports have to be processed
+        self._loads_changed = True  # the force vectors have to be recomputed
+        self._changed_elements: Dict[int, np.ndarray] = (
+            {}
+        )  # maps element ids to their stiffness matrix at the last assembly
+        self._support_displacement_vector: Optional[np.ndarray] = (
+            None  # displacement vector with the support conditions (0) and the unknowns (nan)
+        )
+        self._solver_backend: SolverBackend = AutoBackend()
+        self._factorization: Optional[Factorization] = (
+            None  # factorization of the reduced system matrix
+        )
+        self._factorized_matrices: Dict[int, np.ndarray] = (
+            {}
+        )  # maps ids of changed elements to their stiffness matrix at the last factorization
+        self._low_rank_update: Optional[system_components.solver.LowRankUpdate] = None
+        self.max_low_rank_elements = 10
+        self.solve_stats: Optional[SolveStats] = None  # see enable_solve_stats
+
     @property
     def id_last_element(self) -> int:
         """ID of the last element added to the structure
@@ -408,7 +483,7 @@ class SystemElements:
             section_name, EA, EI, g = properties.circle_properties(**kwargs)
 
         if element_type == "truss":
-            EI = 1e-14
+            EI = 0.0
 
         # add the element number
         self.count += 1
@@ -471,6 +546,7 @@ class SystemElements:
             self.non_linear_elements[element.id] = mp
             self.non_linear = True
         system_components.assembly.dead_load(self, g, element.id)
+        self._set_dirty(stiffness=True, supports=True, loads=True)
 
         return self.count
 
@@ -491,7 +567,9 @@ class SystemElements:
                 self.node_element_map.pop(node_id)
             self.node_map[node_id].elements.pop(element_id)
             # Check if node is now orphaned, and remove it and its loads if so
-            if len(self.node_map[node_id].elements) == 0:
+            if len(self.node_map[node_id].elements) == 0 and not any(
+                node_id in placed.node_ids for placed in self.superelement_map.values()
+            ):
                 system_components.util.remove_node_id(self, node_id)
 
         # Remove element_id
@@ -502,6 +580,88 @@ class SystemElements:
             self.loads_dead_load.remove(element_id)
         if element_id in self.non_linear_elements:
             self.non_linear_elements.pop(element_id)
+        self._set_dirty(stiffness=True, supports=True, loads=True)
+
+    def set_element_stiffness(
+        self, element_id: int, EA: Optional[float] = None, EI: Optional[float] = None
+    ) -> None:
+        """Change the axial and/or bending stiffness of an existing element.
+        Only the contribution of this element to the system matrix is updated on the next solve.
+
+        Args:
+            element_id (int): ID of the element
+            EA (Optional[float], optional): New axial stiffness. Defaults to None (unchanged).
+            EI (Optional[float], optional): New bending stiffness. Defaults to None (unchanged).
+
+        Raises:
+            FEMException: The bending stiffness of a truss element cannot be set
+        """
+        element_id = _negative_index_to_id(element_id, self.element_map)
+        element = self.element_map[element_id]
+        if EI is not None and element.type == "truss":
+            raise FEMException(
+                "Wrong parameters", "A truss element has no bending stiffness."
+            )
+
+        if element_id not in self._changed_elements:
+            self._changed_elements[element_id] = element.stiffness_matrix
+        if self._factorization is not None:
+            # the existing factorization is corrected for this element on the next solve
+            self._factorized_matrices.setdefault(element_id, element.stiffness_matrix)
+            self._low_rank_update = None
+        if EA is not None:
+            element.EA = EA
+        if EI is not None:
+            element.EI = EI
+        element.compile_constitutive_matrix()
+        element.compile_stiffness_matrix()
+        # the primary forces of q-loads depend on the stiffness as well
+        self._loads_changed = True
+
+    def reanalyze(
+        self, stiffness: Dict[int, Dict[str, float]], naked: bool = False
+    ) -> np.ndarray:
+        """Change the stiffness of some elements and compute the updated results.
+
+        If the model was solved before, the factorization of the system matrix is reused and corrected
+        with a low-rank (Sherman-Morrison-Woodbury) update for the changed elements. Once more than
+        `max_low_rank_elements` elements have changed since the last factorization, the system matrix
+        is factorized again.
+
+        Args:
+            stiffness (Dict[int, Dict[str, float]]): Maps element ids to their new stiffness,
+                e.g. {2: {"EI": 8000}, 5: {"EA": 1e5, "EI": 2e4}}
+            naked (bool, optional): Whether or not to skip the post processing. Defaults to False.
+
+        Returns:
+            np.ndarray: Displacements vector.
+        """
+        for element_id, values in stiffness.items():
+            self.set_element_stiffness(element_id, **values)
+        return self.solve(naked=naked)
+
+    def _set_dirty(
+        self, stiffness: bool = False, supports: bool = False, loads: bool = False
+    ) -> None:
+        """Mark parts of the model as changed, so they are recomputed on the next solve.
+
+        Args:
+            stiffness (bool, optional): The stiffness of the elements or springs changed. Defaults to False.
+            supports (bool, optional): The supports changed. Defaults to False.
+            loads (bool, optional): The loads changed. Defaults to False.
+        """
+        if stiffness:
+            self._stiffness_changed = True
+            # the primary forces of q-loads depend on the element stiffness
+            self._loads_changed = True
+        if supports:
+            self._supports_changed = True
+        if loads:
+            self._loads_changed = True
+        if stiffness or supports:
+            self._factorization = None
+            self._factorized_matrices = {}
+            self._low_rank_update = None
 
     def add_multiple_elements(
         self,
@@ -716,6 +876,7 @@ class SystemElements:
             g=element_to_split.dead_load,
             mp=mp1,
             spring=spring1,
+            element_type=element_to_split.type,
         )
         element_id2 = self.add_element(
             [location_vertex, vertex_end],
@@ -724,6 +885,7 @@ class SystemElements:
             g=element_to_split.dead_load,
             mp=mp2,
             spring=spring2,
+            element_type=element_to_split.type,
         )
 
         # Copy the q-loads from the old element to the new elements
@@ -829,6 +991,7 @@ class SystemElements:
                     g=g,
                     mp=mp1,
                     spring=spring1,
+                    element_type=element.type,
                 )
                 ss.add_element(
                     [location_vertex, element.vertex_2],
@@ -837,6 +1000,7 @@ class SystemElements:
                     g=g,
                     mp=mp2,
                     spring=spring2,
+                    element_type=element.type,
                 )
 
             else:
@@ -847,6 +1011,7 @@ class SystemElements:
                     g=g,
                     mp=mp,
                     spring=element.springs,
+                    element_type=element.type,
                 )
         self.__dict__ = ss.__dict__.copy()
 
@@ -881,42 +1046,84 @@ class SystemElements:
         Returns:
             np.ndarray: Displacements vector.
         """
+        if self.solve_stats is None:
+            return self._solve(
+                force_linear, verbosity, max_iter, geometrical_non_linear, **kwargs
+            )
+        with self.solve_stats.solve():
+            return self._solve(
+                force_linear, verbosity, max_iter, geometrical_non_linear, **kwargs
+            )
 
-        for node_id in self.node_map:
-            system_components.util.check_internal_hinges(self, node_id)
-
-        if self.system_displacement_vector is None:
-            system_components.assembly.process_supports(self)
+    def _solve(
+        self,
+        force_linear: bool,
+        verbosity: int,
+        max_iter: int,
+        geometrical_non_linear: int,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """Compute the results of current model, see solve()"""
+        if len(self._factorized_matrices) > self.max_low_rank_elements:
+            # a correction of this rank is more expensive than a new factorization
+            self._factorization = None
+
+        if self._supports_changed or self._support_displacement_vector is None:
+            self.system_displacement_vector = None
+            with self._phase("process_supports"):
+                system_components.assembly.process_supports(self)
             assert self.system_displacement_vector is not None
+            self._support_displacement_vector = self.system_displacement_vector
+            self._supports_changed = False
+        elif self._factorization is None:
+            self.system_displacement_vector = self._support_displacement_vector
 
         naked = kwargs.get("naked", False)
 
-        if not naked:
-            if not self.validate():
-                if all(
-                    "general" in element.type for element in self.element_map.values()
-                ):
-                    raise FEMException(
-                        "StabilityError",
-                        "The eigenvalues of the stiffness matrix are non zero, "
-                        "which indicates a instable structure. "
-                        "Check your support conditions",
-                    )
+        check_stability = not naked and self._factorization is None
+        if check_stability:
+            with self._phase("validate"):
+                self._check_floating()
+        if check_stability and (
+            (self.non_linear and not force_linear) or geometrical_non_linear
+        ):
+            # these solvers only solve naked, so the structure is validated up front
+            with self._phase("validate"):
+                self._check_stability(self.validate())
+            check_stability = False
 
         # (Re)set force vectors
-        for el in self.element_map.values():
-            el.reset()
-        system_components.assembly.prep_matrix_forces(self)
+        if self._loads_changed:
+            with self._phase("prep_matrix_forces"):
+                for el in self.element_map.values():
+                    el.reset()
+                system_components.assembly.prep_matrix_forces(self)
+            self._loads_changed = False
         assert (
             self.system_force_vector is not None
         ), "There are no forces on the structure"
+        if not naked:
+            assert (
+                np.abs(self.system_force_vector).sum() != 0
+            ), "There are no forces on the structure"
 
         if self.non_linear and not force_linear:
             return system_components.solver.stiffness_adaptation(
                 self, verbosity, max_iter
             )
 
-        system_components.assembly.assemble_system_matrix(self)
+        if self._stiffness_changed:
+            with self._phase("assemble_system_matrix"):
+                system_components.assembly.assemble_system_matrix(self)
+            self._stiffness_changed = False
+            self._changed_elements = {}
+        elif self._changed_elements:
+            with self._phase("update_system_matrix"):
+                system_components.assembly.update_system_matrix(
+                    self, self._changed_elements
+                )
+            self._changed_elements = {}
+
         if geometrical_non_linear:
             discretize_kwargs = kwargs.get("discretize_kwargs", None)
             self.buckling_factor = system_components.solver.geometrically_non_linear(
@@ -927,14 +1134,44 @@ class SystemElements:
             )
             return self.system_displacement_vector
 
-        system_components.assembly.process_conditions(self)
+        if self._factorization is None:
+            with self._phase("process_conditions"):
+                system_components.assembly.process_conditions(self)
+            assert self.reduced_system_matrix is not None
+            with self._phase("factorization"):
+                self._factorization = factorize_components(
+                    self,
+                    self._solver_backend,
+                    self.reduced_system_matrix,
+                    np.array(self._remainder_indexes),
+                )
+            self._factorized_matrices = {}
+            self._low_rank_update = None
+            if check_stability:
+                with self._phase("validate"):
+                    self._check_stability(self._factorization.is_stable())
+        else:
+            self.reduced_force_vector = np.take(
+                self.system_force_vector, self._remainder_indexes
+            )
+            if self._factorized_matrices and self._low_rank_update is None:
+                with self._phase("low_rank_update"):
+                    assert self.system_matrix is not None
+                    self.reduced_system_matrix = (
+                        system_components.assembly.reduce_matrix(
+                            self.system_matrix, self._remainder_indexes
+                        )
+                    )
+                    self._low_rank_update = system_components.solver.low_rank_update(
+                        self, self._factorization, self._factorized_matrices
+                    )
 
         # solution of the reduced system (reduced due to support conditions)
-        assert self.reduced_system_matrix is not None
         assert self.reduced_force_vector is not None
-        reduced_displacement_vector = np.linalg.solve(
-            self.reduced_system_matrix, self.reduced_force_vector
-        )
+        with self._phase("linear_solve"):
+            reduced_displacement_vector = system_components.solver.low_rank_solve(
+                self._factorization, self.reduced_force_vector, self._low_rank_update
+            )
 
         # add the solution of the reduced system in the complete system displacement vector
         assert self.shape_system_matrix is not None
@@ -946,6 +1183,33 @@ class SystemElements:
         )
 
         # determine the displacement vector of the elements
+        with self._phase("element_forces"):
+            self._element_forces()
+
+        if not naked:
+            # determining the node results in post processing class
+            with self._phase("node_results_elements"):
+                self.post_processor.node_results_elements()
+            with self._phase("node_results_system"):
+                self.post_processor.node_results_system()
+            with self._phase("reaction_forces"):
+                self.post_processor.reaction_forces()
+            with self._phase("element_results"):
+                self.post_processor.element_results()
+
+            # check the values in the displacement vector for extreme values, indicating a
+            # flawed calculation
+            assert np.any(self.system_displacement_vector < 1e6), (
+                "The displacements of the structure exceed 1e6. "
+                "Check your support conditions,"
+                "or your elements Young's modulus"
+            )
+
+        return self.system_displacement_vector
+
+    def _element_forces(self) -> None:
+        """Determine the displacement and force vectors of the elements from the system displacement vector"""
+        assert self.system_displacement_vector is not None
         for el in self.element_map.values():
             index_node_1 = (el.node_1.id - 1) * 3
             index_node_2 = (el.node_2.id - 1) * 3
@@ -960,35 +1224,352 @@ class SystemElements:
             ]
             el.determine_force_vector()
 
-        if not naked:
-            # determining the node results in post processing class
-            self.post_processor.node_results_elements()
-            self.post_processor.node_results_system()
-            self.post_processor.reaction_forces()
-            self.post_processor.element_results()
+    def set_solver_backend(self, backend: Union[str, SolverBackend]) -> None:
+        """Set the backend that factorizes the reduced system matrix. It is used by every analysis:
+        linear, non-linear and buckling solves, validate, reanalyze and sensitivities.
 
-            # check the values in the displacement vector for extreme values, indicating a
-            # flawed calculation
-            assert np.any(self.system_displacement_vector < 1e6), (
-                "The displacements of the structure exceed 1e6. "
-                "Check your support conditions,"
-                "or your elements Young's modulus"
+        Args:
+            backend (Union[str, SolverBackend]): "auto" (default), "lu", "cholesky", "banded", "sparse",
+                "cg", "minres" or a SolverBackend, e.g. an IterativeBackend with another preconditioner.
+                "auto" chooses from the symmetry, size, bandwidth and density of the matrix. The
+                banded, sparse and iterative backends assemble a sparse system matrix, "auto" does
+                for structures that qualify for the banded or sparse backends.
+
+        Raises:
+            FEMException: Unknown backend name
+        """
+        backend = get_backend(backend)
+        if system_components.assembly.matrix_format(
+            self, backend
+        ) != system_components.assembly.matrix_format(self):
+            # the system matrix has to be assembled in the other format
+            self._set_dirty(stiffness=True)
+        self._solver_backend = backend
+        self._factorization = None
+        self._factorized_matrices = {}
+        self._low_rank_update = None
+
+    def _check_stability(self, stable: bool) -> None:
+        """Raise for an unstable structure of general elements. Other structures (e.g. trusses with
+        free rotations) are solved anyway.
+
+        Args:
+            stable (bool): Result of the stability check
+
+        Raises:
+            FEMException: The structure is unstable
+        """
+        if not stable and all(
+            "general" in element.type for element in self.element_map.values()
+        ):
+            raise FEMException(
+                "StabilityError",
+                "The eigenvalues of the stiffness matrix are non zero, "
+                "which indicates a instable structure. "
+                "Check your support conditions",
             )
 
-        return self.system_displacement_vector
+    def _check_floating(self) -> None:
+        """Raise for parts of the structure without supports, naming their nodes
+
+        Raises:
+            FEMException: A part of the structure is floating
+        """
+        floating = [
+            component.node_ids
+            for component in self.connected_components()
+            if not component.supported
+        ]
+        if floating:
+            parts = "; ".join(
+                f"nodes {', '.join(map(str, node_ids))}" for node_ids in floating
+            )
+            raise FEMException(
+                "StabilityError",
+                f"{len(floating)} part(s) of the structure have no supports: {parts}. "
+                "Check your support conditions",
+            )
+
+    def connected_components(self) -> List[Component]:
+        """Find the independent parts of the structure: groups of nodes that are connected by elements
+        or superelements. The system matrix of the parts is factorized and solved per part, large parts
+        in parallel.
+
+        Returns:
+            List[Component]: Nodes, elements and superelements of every part, and whether it is supported
+        """
+        return connected_components(self)
+
+    def enable_solve_stats(
+        self,
+        callbacks: Optional[Sequence["PhaseCallback"]] = None,
+        track_memory: bool = False,
+    ) -> SolveStats:
+        """Record the wall time and allocations of every phase of the next solves in self.solve_stats.
+        Set self.solve_stats to None to disable the instrumentation again.
+
+        Args:
+            callbacks (Optional[Sequence[PhaseCallback]], optional): Functions called after every phase
+                with (phase name, seconds, allocated blocks). Defaults to None.
+            track_memory (bool, optional): Trace the peak memory of every phase with tracemalloc.
+                This slows down the solve considerably. Defaults to False.
+
+        Returns:
+            SolveStats: The statistics object, filled by every solve
+        """
+        self.solve_stats = SolveStats(callbacks, track_memory)
+        return self.solve_stats
+
+    def _phase(self, name: str) -> ContextManager[None]:
+        """Record a phase of a solve in the solve statistics, if enabled.
+
+        Args:
+            name (str): Name of the phase
+
+        Returns:
+            ContextManager[None]: Context of the phase
+        """
+        if self.solve_stats is None:
+            return contextlib.nullcontext()
+        return self.solve_stats.phase(name)
 
-    def validate(self, min_eigen: float = 1e-9) -> bool:
+    def condense(self, boundary: Sequence[int]) -> Superelement:
+        """Condense the structure onto its boundary nodes (static or Guyan condensation). The result is
+        a superelement that can be added many times to other structures with add_superelement, and
+        reused between analyses. Its interior results are recovered with get_superelement_results.
+        The supports of this structure are ignored and its loads are condensed with it. Later
+        changes to this structure do not affect the superelement.
+
+        Args:
+            boundary (Sequence[int]): Node ids of the nodes that connect to other structures
+
+        Raises:
+            FEMException: The boundary is invalid, or the interior is unstable without supports
+
+        Returns:
+            Superelement: Condensed structure
+        """
+        return condense(self, boundary)
+
+    def add_superelement(
+        self, superelement: Superelement, offset: "VertexLike" = (0, 0)
+    ) -> int:
+        """Add a condensed structure to the structure. Its boundary nodes are connected to the nodes at
+        the same locations, moved by the offset, or to new nodes.
+
+        Args:
+            superelement (Superelement): Condensed structure, see condense
+            offset (VertexLike, optional): Translation of the superelement. Defaults to (0, 0).
+
+        Returns:
+            int: ID of the superelement in this structure
+        """
+        offset = Vertex(offset)
+        node_ids = tuple(
+            system_components.util.add_node(self, vertex + offset)
+            for vertex in superelement.vertices
+        )
+        superelement_id = max(self.superelement_map, default=0) + 1
+        self.superelement_map[superelement_id] = PlacedSuperelement(
+            superelement, node_ids
+        )
+        self._set_dirty(stiffness=True, supports=True, loads=True)
+        return superelement_id
+
+    def get_superelement_results(self, superelement_id: int) -> "SystemElements":
+        """Recover the results of the interior of a superelement from the last solve
+
+        Args:
+            superelement_id (int): ID of the superelement
+
+        Raises:
+            FEMException: The structure has not been solved
+
+        Returns:
+            SystemElements: Solved copy of the condensed structure, with all the usual result methods
+        """
+        if self.system_displacement_vector is None or self._stiffness_changed:
+            raise FEMException(
+                "Superelement error",
+                "The structure has to be solved before recovering superelement results.",
+            )
+        placed = self.superelement_map[superelement_id]
+        return placed.superelement.recover(self.system_displacement_vector[placed.dofs])
+
+    def fork(self, results: bool = True, deep: bool = False) -> "SystemElements":
+        """Copy the structure for a what-if analysis, at a fraction of the cost of copy.deepcopy. The copy
+        shares the stiffness arrays of the elements, the system matrix and its factorization with this
+        structure (copy-on-write: they are replaced, not modified, when either structure changes). The
+        nodes, elements, supports, loads and results are copied. A fork that only changes its loads is
+        solved without a new factorization.
+
+        Args:
+            results (bool, optional): Copy the results of the last solve. Defaults to True.
+            deep (bool, optional): Also copy the stiffness arrays and the system matrix, so that only
+                the factorization and the solver backend are shared, and skip the results.
+                Defaults to False.
+
+        Returns:
+            SystemElements: Independent copy of the structure
+        """
+        return fork_system(self, results, deep)
+
+    def save(
+        self, file: "FileLike", results: bool = True, compress: bool = True
+    ) -> None:
+        """Save the structure to a versioned NumPy .npz file: nodes, elements, supports, springs, loads,
+        plastic moment limits and optionally the results of the last solve. The file contains arrays
+        only and is loaded without unpickling, see SystemElements.load and
+        anastruct.fem.storage.load_results.
+
+        Args:
+            file (FileLike): File name or binary file object
+            results (bool, optional): Also save the results of the last solve. Defaults to True.
+            compress (bool, optional): Compress the arrays. Defaults to True.
+
+        Raises:
+            FEMException: The structure contains superelements, which can not be saved
+        """
+        save_system(self, file, results, compress)
+
+    @staticmethod
+    def load(file: "FileLike", results: bool = True) -> "SystemElements":
+        """Load a structure saved with SystemElements.save
+
+        Args:
+            file (FileLike): File name or binary file object
+            results (bool, optional): Also load the results, if saved. Defaults to True.
+
+        Raises:
+            FEMException: The file is not a structure or has a newer format version
+
+        Returns:
+            SystemElements: Structure, with the results of the saved structure
+        """
+        return load_system(file, results)
+
+    def to_dict(
+        self,
+        load_cases: Sequence[LoadCase] = (),
+        combinations: Sequence["LoadCombination"] = (),
+    ) -> Dict[str, Any]:
+        """Export the structure to a JSON-compatible dictionary of nodes, elements, supports, springs,
+        hinges and loads, optionally with load cases and combinations. The schema is documented in
+        anastruct.fem.schema.
+
+        Args:
+            load_cases (Sequence[LoadCase], optional): Load cases to include. Defaults to ().
+            combinations (Sequence[LoadCombination], optional): Load combinations to include, with
+                their load cases. Defaults to ().
+
+        Raises:
+            FEMException: The structure contains superelements, which can not be exported
+
+        Returns:
+            Dict[str, Any]: Representation of the structure, e.g. for json.dump
+        """
+        return system_to_dict(self, load_cases, combinations)
+
+    @staticmethod
+    def from_dict(data: Mapping[str, Any]) -> "SystemElements":
+        """Create a structure from the dictionary of SystemElements.to_dict, or any dictionary of the
+        schema in anastruct.fem.schema. The nodes and elements are inserted in bulk. The load cases and
+        combinations are read with anastruct.fem.schema.combinations_from_dict.
+
+        Args:
+            data (Mapping[str, Any]): Representation of the structure, e.g. from json.load
+
+        Raises:
+            FEMException: The representation is invalid or of a newer schema version
+
+        Returns:
+            SystemElements: Structure with its supports and loads
+        """
+        return system_from_dict(data)
+
+    def export_results(
+        self,
+        path: "ExportTarget",
+        table: "ResultTable" = "elements",
+        file_format: "ExportFormat" = "csv",
+        chunk_size: int = 1000,
+    ) -> str:
+        """Write a result table to a file, chunk by chunk, without collecting the results of the whole
+        structure in memory. The tables and formats are documented in anastruct.fem.export.
+
+        Args:
+            path (ExportTarget): File, or directory of the npy format. A text
+                file object for csv.
+            table (ResultTable, optional): "nodes", "reactions" or "elements", the diagrams of the
+                elements at every mesh station. Defaults to "elements".
+            file_format (ExportFormat, optional): "csv", "parquet" (requires pyarrow), "npy" (a .npy
+                file per column) or "columnar" (parquet if pyarrow is installed, npy otherwise).
+                Defaults to "csv".
+            chunk_size (int, optional): Number of nodes or elements per chunk. Defaults to 1000.
+
+        Raises:
+            FEMException: The structure is not solved, or parquet is requested without pyarrow
+
+        Returns:
+            str: Format that was written
+        """
+        return export_results(self, path, table, file_format, chunk_size)
+
+    def complexity(self) -> ModelComplexity:
+        """Report the size of the structure and the estimated cost of solving it: degrees of freedom,
+        nonzeros, bandwidth and profile in the current and an optimized (reverse Cuthill-McKee) node
+        ordering, memory estimates of the factorization and the memory currently held by the model.
+        Only the connectivity is used, nothing is assembled.
+
+        Returns:
+            ModelComplexity: Sizes and memory estimates, see ModelComplexity.report()
+        """
+        return model_complexity(self)
+
+    def compile(self) -> CompiledSystem:
+        """Freeze the current topology, supports and stiffness into an immutable model with a factorized
+        system matrix. The compiled model solves many load cases without any per-element Python work,
+        can be pickled cheaply and shared read-only between threads. Later changes to this structure
+        do not affect it. A structure with unsolved changes is solved in a fork, so its own
+        factorization and results are left as they are.
+
+        Raises:
+            FEMException: The structure is unstable
+
+        Returns:
+            CompiledSystem: Immutable model
+        """
+        return compile_system(self)
+
+    def validate(
+        self, min_eigen: Optional[float] = None, *, min_pivot: float = 1e-9
+    ) -> bool:
         """Validate the stability of the stiffness matrix.
 
         Args:
-            min_eigen (float, optional): Minimum value of the eigenvalues of the stiffness matrix. This value
-                should be close to zero. Defaults to 1e-9.
+            min_eigen (Optional[float], optional): Deprecated, use min_pivot. Minimum value of the
+                eigenvalues of the stiffness matrix, which are computed from the dense matrix if it
+                is given. Defaults to None.
+            min_pivot (float, optional): Minimum value of the pivots of the factorized stiffness matrix,
+                which for a symmetric matrix are positive if and only if its eigenvalues are. This
+                value should be close to zero. Defaults to 1e-9.
 
         Returns:
             bool: True if the structure is stable, False if not.
         """
+        if min_eigen is not None:
+            warnings.warn(
+                "The min_eigen argument of validate is deprecated, use min_pivot.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
 
-        ss = copy.copy(self)
+        ss = self.fork(results=False)
+        if self._support_displacement_vector is not None:
+            ss.system_displacement_vector = self._support_displacement_vector
+        else:
+            ss.system_displacement_vector = None
+            system_components.assembly.process_supports(ss)
         system_components.assembly.prep_matrix_forces(ss)
         assert ss.system_force_vector is not None
         assert (
@@ -1000,8 +1581,19 @@ class SystemElements:
         system_components.assembly.process_conditions(ss)
 
         assert ss.reduced_system_matrix is not None
-        w, _ = np.linalg.eig(ss.reduced_system_matrix)
-        return bool(np.all(w > min_eigen))
+        if min_eigen is not None:
+            eigenvalues = np.linalg.eigvals(to_dense(ss.reduced_system_matrix))
+            return bool(np.all(eigenvalues.real > min_eigen))
+        try:
+            factorization = factorize_components(
+                ss,
+                self._solver_backend,
+                ss.reduced_system_matrix,
+                np.array(ss._remainder_indexes),
+            )
+        except FEMException:
+            return False
+        return factorization.is_stable(min_pivot)
 
     def add_support_hinged(self, node_id: Union[int, Sequence[int]]) -> None:
         """Model a hinged support at a given node.
@@ -1017,6 +1609,7 @@ class SystemElements:
 
             # add the support to the support list for the plotter
             self.supports_hinged.append(self.node_map[id_])
+        self._set_dirty(supports=True)
 
     def add_support_rotational(self, node_id: Union[int, Sequence[int]]) -> None:
         """Model a rotational support at a given node.
@@ -1032,6 +1625,7 @@ class SystemElements:
 
             # add the support to the support list for the plotter
             self.supports_rotational.append(self.node_map[id_])
+        self._set_dirty(supports=True)
 
     def add_internal_hinge(self, node_id: Union[int, Sequence[int]]) -> None:
         """Model a internal hinge at a given node.
@@ -1048,7 +1642,10 @@ class SystemElements:
             id_ = _negative_index_to_id(id_, self.node_map.keys())
 
             # add the support to the support list for the plotter
-            self.internal_hinges.append(self.node_map[id_])
+            if all(node.id != id_ for node in self.internal_hinges):
+                self.internal_hinges.append(self.node_map[id_])
+            system_components.util.check_internal_hinges(self, id_)
+        self._set_dirty(stiffness=True, supports=True)
 
     def add_support_roll(
         self,
@@ -1098,11 +1695,14 @@ class SystemElements:
             if angle_ is not None:
                 direction_i = 2
                 self.inclined_roll[id_] = float(np.radians(-angle_))
+                # the kinematic matrices of the connected elements are rotated
+                self._set_dirty(stiffness=True)
 
             # add the support to the support list for the plotter
             self.supports_roll.append(self.node_map[id_])
             self.supports_roll_direction.append(direction_i)
             self.supports_roll_rotate.append(rotate_)
+        self._set_dirty(supports=True)
 
     def add_support_fixed(
         self,
@@ -1124,6 +1724,7 @@ class SystemElements:
 
             # add the support to the support list for the plotter
             self.supports_fixed.append(self.node_map[id_])
+        self._set_dirty(supports=True)
 
     def add_support_spring(
         self,
@@ -1178,6 +1779,7 @@ class SystemElements:
                     "Invalid translation",
                     f"Translation should be 1, 2 or 3, but is {translation_}",
                 )
+        self._set_dirty(stiffness=True, supports=True)
 
     def q_load(
         self,
@@ -1200,81 +1802,29 @@ class SystemElements:
                 to the indicated direction/rotatione. Defaults to None.
 
         Raises:
-            FEMException: _description_
-        """
-        q_arr: Sequence[Sequence[float]]
-        q_perp_arr: Sequence[Sequence[float]]
-        if isinstance(q, Sequence):
-            q_arr = [q]
-        elif isinstance(q, (int, float)):
-            q_arr = [[q, q]]
+            FEMException: The direction is invalid or an element does not exist
+        """
+        q_values = [q[0], q[1]] if isinstance(q, Sequence) else [q, q]
         if q_perp is None:
-            q_perp_arr = [[0, 0]]
+            q_perp_values = [0.0, 0.0]
         elif isinstance(q_perp, Sequence):
-            q_perp_arr = [q_perp]
-        elif isinstance(q_perp, (int, float)):
-            q_perp_arr = [[q_perp, q_perp]]
-
-        direction_flag = rotation is None
+            q_perp_values = [q_perp[0], q_perp[1]]
+        else:
+            q_perp_values = [q_perp, q_perp]
 
         n_elems = len(element_id) if isinstance(element_id, Sequence) else 1
-        element_id = arg_to_list(element_id, n_elems)
-        direction = arg_to_list(direction, n_elems)
-        rotation = arg_to_list(rotation, n_elems)
-        q_arr = arg_to_list(q_arr, n_elems)
-        q_perp_arr = arg_to_list(q_perp_arr, n_elems)
-
-        for i, element_idi in enumerate(element_id):
-            id_ = _negative_index_to_id(element_idi, self.element_map.keys())
-            self.plotter.max_q = max(
-                self.plotter.max_q,
-                (q_arr[i][0] ** 2 + q_perp_arr[i][0] ** 2) ** 0.5,
-                (q_arr[i][1] ** 2 + q_perp_arr[i][1] ** 2) ** 0.5,
-            )
-
-            if direction_flag:
-                if direction[i] == "x":
-                    rotation[i] = 0
-                elif direction[i] == "y":
-                    rotation[i] = np.pi / 2
-                elif direction[i] == "parallel":
-                    rotation[i] = self.element_map[element_id[i]].angle
-                elif direction[i] in ("element", "perpendicular"):
-                    rotation[i] = np.pi / 2 + self.element_map[element_id[i]].angle
-                else:
-                    raise FEMException(
-                        "Invalid direction parameter",
-                        "Direction should be 'x', 'y', 'parallel', 'perpendicular' or 'element'",
-                    )
-            else:
-                rotation[i] = math.radians(rotation[i])
-                direction[i] = "angle"
-
-            cos = math.cos(rotation[i])
-            sin = math.sin(rotation[i])
-            self.loads_q[id_] = [
-                (
-                    (q_perp_arr[i][0] * cos + q_arr[i][0] * sin) * self.load_factor,
-                    (q_arr[i][0] * self.orientation_cs * cos + q_perp_arr[i][0] * sin)
-                    * self.load_factor,
-                ),
-                (
-                    (q_perp_arr[i][1] * cos + q_arr[i][1] * sin) * self.load_factor,
-                    (q_arr[i][1] * self.orientation_cs * cos + q_perp_arr[i][1] * sin)
-                    * self.load_factor,
-                ),
-            ]
-            el = self.element_map[id_]
-            el.q_load = (
-                self.orientation_cs * self.load_factor * q_arr[i][0],
-                self.orientation_cs * self.load_factor * q_arr[i][1],
-            )
-            el.q_perp_load = (
-                q_perp_arr[i][0] * self.load_factor,
-                q_perp_arr[i][1] * self.load_factor,
-            )
-            el.q_direction = direction[i]
-            el.q_angle = rotation[i]
+        element_ids = [
+            _negative_index_to_id(element_idi, self.element_map.keys())
+            for element_idi in arg_to_list(element_id, n_elems)
+        ]
+        system_components.bulk.q_loads(
+            self,
+            element_ids,
+            np.tile(np.asarray(q_values, dtype=float), (n_elems, 1)),
+            np.tile(np.asarray(q_perp_values, dtype=float), (n_elems, 1)),
+            arg_to_list(direction, n_elems),
+            arg_to_list(rotation, n_elems),
+        )
 
     def point_load(
         self,
@@ -1323,6 +1873,7 @@ class SystemElements:
                 (Fx[i] * cos + Fy[i] * sin) * self.load_factor,
                 (Fy[i] * self.orientation_cs * cos + Fx[i] * sin) * self.load_factor,
             )
+        self._set_dirty(loads=True)
 
     def moment_load(
         self,
@@ -1335,6 +1886,9 @@ class SystemElements:
         Args:
             node_id (Union[int, Sequence[int]]): The node ID to which to apply the load
             Tz (Union[float, Sequence[float]]): Moment load (about the global Y direction) to apply
+
+        The node needs rotational stiffness: solving raises an FEMException for a moment load on a
+        node that only truss elements or hinged element ends connect to.
         """
         if isinstance(Tz, (int, float)) and Tz == 0.0 and Ty is not None:
             Tz = Ty  # for backwards compatibility with old y/z axes behaviour
@@ -1345,6 +1899,7 @@ class SystemElements:
         for i, node_idi in enumerate(node_id):
             id_ = _negative_index_to_id(node_idi, self.node_map.keys())
             self.loads_moment[id_] = Tz[i] * self.load_factor
+        self._set_dirty(loads=True)
 
     @overload
     def show_structure(
@@ -2018,6 +2573,30 @@ class SystemElements:
                 )
         return result_list
 
+    def iter_element_results(
+        self, fields: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the element results, computing them element by element instead of building
+        the results of all elements at once like get_element_results.
+
+        Args:
+            fields (Sequence[str], optional): Results to compute, any of the keys of
+                get_element_results, e.g. ["Mmax", "Mmin"]. The diagrams "u", "w", "wtot", "M", "Q" and
+                "N" are arrays of the mesh values. Defaults to all results except the diagrams.
+            chunk_size (int, optional): If given, yield the results of this many elements at a time as
+                a dict of arrays with the element ids in "id". Results that an element does not have,
+                like the bending moment of a truss element, are NaN. Defaults to None, which yields a
+                dict per element.
+
+        Raises:
+            FEMException: An unknown field is requested
+
+        Returns:
+            Iterator[Dict[str, Any]]: Per element {"id": id, field: value, ...}, or per chunk
+                {"id": (n,) array, field: (n,) or (n, mesh) array, ...}. "q" is (n, 2) per chunk.
+        """
+        return iter_element_results(self, fields, chunk_size)
+
     @overload
     def get_element_result_range(
         self,
@@ -2229,6 +2808,7 @@ class SystemElements:
                     g=g,
                     mp=mp,
                     spring=element.springs,
+                    element_type=element.type,
                 )
                 last_v = v
 
@@ -2282,6 +2862,7 @@ class SystemElements:
                 self.element_map[k].dead_load = 0
         if dead_load:
             self.loads_dead_load = set()
+        self._set_dirty(loads=True)
 
     def apply_load_case(self, loadcase: LoadCase) -> None:
         """Apply a load case to the structure.
@@ -1,3 +1,4 @@
 from anastruct.fem.system_components import util
 from anastruct.fem.system_components import assembly
 from anastruct.fem.system_components import solver
+from anastruct.fem.system_components import bulk
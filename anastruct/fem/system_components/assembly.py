@@ -1,14 +1,22 @@
 import math
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from anastruct.basic import FEMException, LazyModule
 from anastruct.fem.elements import det_axial, det_moment, det_shear
+from anastruct.fem.system_components.util import rotation_free_nodes, supported_dofs
 
 if TYPE_CHECKING:
+    from scipy import sparse  # type: ignore
+
+    from anastruct.fem.backends import SolverBackend
     from anastruct.fem.elements import Element
     from anastruct.fem.system import SystemElements
-    from anastruct.types import AxisNumber
+    from anastruct.types import AxisNumber, SystemMatrix
+else:
+    # scipy is imported on the first solve
+    sparse = LazyModule("scipy.sparse")
 
 
 def set_force_vector(
@@ -44,6 +52,18 @@ def prep_matrix_forces(system: "SystemElements") -> None:
     apply_parallel_qn_load(system)
     apply_point_load(system)
     apply_moment_load(system)
+    apply_superelement_load(system)
+
+
+def apply_superelement_load(system: "SystemElements") -> None:
+    """Apply the condensed loads of the superelements to the system
+
+    Args:
+        system (SystemElements): System to which the superelement loads are applied
+    """
+    assert system.system_force_vector is not None
+    for placed in system.superelement_map.values():
+        system.system_force_vector[placed.dofs] += placed.superelement.load_vector
 
 
 def apply_moment_load(system: "SystemElements") -> None:
@@ -51,7 +71,19 @@ def apply_moment_load(system: "SystemElements") -> None:
 
     Args:
         system (SystemElements): System to which the moment load is applied
+
+    Raises:
+        FEMException: A moment load acts on a node without rotational stiffness
     """
+    if any(Tz != 0 for Tz in system.loads_moment.values()):
+        # the rotation of these nodes is eliminated, so the load would be lost
+        for node in rotation_free_nodes(system):
+            if system.loads_moment.get(node.id, 0) != 0:
+                raise FEMException(
+                    "Flawed inputs",
+                    f"Node {node.id} has a moment load, but no element or superelement "
+                    "with rotational stiffness is connected to it.",
+                )
     for node_id, Tz in system.loads_moment.items():
         set_force_vector(system, [(node_id, 3, Tz)])
 
@@ -87,21 +119,25 @@ def apply_perpendicular_q_load(system: "SystemElements") -> None:
         if q_perpendicular == 0 and qi_perpendicular == 0:
             continue
 
-        kl = element.constitutive_matrix[1][1] * 1e6
-        kr = element.constitutive_matrix[2][2] * 1e6
+        if element.type == "truss":
+            # a truss element is simply supported between its nodes
+            kl = kr = 0.0
+            EI = 1.0
+        else:
+            kl = element.constitutive_matrix[1][1] * 1e6
+            kr = element.constitutive_matrix[2][2] * 1e6
+            EI = element.EI
 
         # minus because of systems positive rotation
         left_moment = det_moment(
-            kl, kr, qi_perpendicular, q_perpendicular, 0, element.EI, element.l
+            kl, kr, qi_perpendicular, q_perpendicular, 0, EI, element.l
         )
         right_moment = -det_moment(
-            kl, kr, qi_perpendicular, q_perpendicular, element.l, element.EI, element.l
-        )
-        rleft = det_shear(
-            kl, kr, qi_perpendicular, q_perpendicular, 0, element.EI, element.l
+            kl, kr, qi_perpendicular, q_perpendicular, element.l, EI, element.l
         )
+        rleft = det_shear(kl, kr, qi_perpendicular, q_perpendicular, 0, EI, element.l)
         rright = -det_shear(
-            kl, kr, qi_perpendicular, q_perpendicular, element.l, element.EI, element.l
+            kl, kr, qi_perpendicular, q_perpendicular, element.l, EI, element.l
         )
 
         rleft_x = rleft * math.sin(element.a1)
@@ -110,10 +146,6 @@ def apply_perpendicular_q_load(system: "SystemElements") -> None:
         rleft_y = rleft * math.cos(element.a1)
         rright_y = rright * math.cos(element.a2)
 
-        if element.type == "truss":
-            left_moment = 0
-            right_moment = 0
-
         primary_force = np.array(
             [rleft_x, rleft_y, left_moment, rright_x, rright_y, right_moment]
         )
@@ -185,6 +217,8 @@ def assemble_system_matrix(
 ) -> None:
     """Assemble the system matrix
     Shape of the matrix = n nodes * n d.o.f. = n * 3
+    The matrix is sparse (CSR) if the solver backend of the system assembles this structure sparse,
+    see matrix_format.
 
     Args:
         system (SystemElements): System to be prepared
@@ -192,6 +226,16 @@ def assemble_system_matrix(
         geometric_matrix (bool, optional): Whether or not to include the current geometric matrix. Defaults to False.
     """
     system._remainder_indexes = []
+    if matrix_format(system) == "sparse" and not geometric_matrix:
+        system.shape_system_matrix = len(system.node_map) * 3
+        system.system_matrix = add_superelement_matrices(
+            system,
+            assemble_sparse_matrix(system, list(system.element_map.values())),
+        )
+        if validate:
+            assert abs(system.system_matrix - system.system_matrix.T).max() <= 1e-8
+        return
+
     if not geometric_matrix:
         shape = len(system.node_map) * 3
         system.shape_system_matrix = shape
@@ -201,6 +245,7 @@ def assemble_system_matrix(
     for matrix_index, K in system.system_spring_map.items():
         #  first index is row, second is column
         system.system_matrix[matrix_index][matrix_index] += K
+    system.system_matrix = add_superelement_matrices(system, system.system_matrix)
 
     # Determine the elements location in the stiffness matrix.
     # system matrix [K]
@@ -225,22 +270,187 @@ def assemble_system_matrix(
 
     for i in range(len(system.element_map)):
         element = system.element_map[i + 1]
-        element_matrix = element.stiffness_matrix
-
-        # n1 and n2 are starting indexes of the rows and the columns for node 1 and node 2
-        n1 = (element.node_1.id - 1) * 3
-        n2 = (element.node_2.id - 1) * 3
-        system.system_matrix[n1 : n1 + 3, n1 : n1 + 3] += element_matrix[0:3, :3]
-        system.system_matrix[n1 : n1 + 3, n2 : n2 + 3] += element_matrix[0:3, 3:]
-
-        system.system_matrix[n2 : n2 + 3, n1 : n1 + 3] += element_matrix[3:6, :3]
-        system.system_matrix[n2 : n2 + 3, n2 : n2 + 3] += element_matrix[3:6, 3:]
+        add_element_matrix(system.system_matrix, element, element.stiffness_matrix)
 
     # returns True if symmetrical.
     if validate:
         assert np.allclose((system.system_matrix.transpose()), system.system_matrix)
 
 
+def matrix_format(
+    system: "SystemElements", backend: Optional["SolverBackend"] = None
+) -> str:
+    """Format in which the system matrix of a structure is assembled for a solver backend
+
+    Args:
+        system (SystemElements): Structure
+        backend (Optional[SolverBackend], optional): Solver backend. Defaults to None, which is the
+            solver backend of the structure.
+
+    Returns:
+        str: "dense" or "sparse"
+    """
+    if backend is None:
+        backend = system._solver_backend
+    return backend.assembly_format(
+        len(system.node_map) * 3, connectivity_bandwidth(system)
+    )
+
+
+def connectivity_bandwidth(system: "SystemElements") -> int:
+    """Half bandwidth of the system matrix from the node ids of the elements and superelements,
+    without assembling it. Long chains of sequentially numbered nodes have a small bandwidth.
+
+    Args:
+        system (SystemElements): Structure
+
+    Returns:
+        int: Upper bound of the half bandwidth of the system matrix
+    """
+    spans = [abs(el.node_id2 - el.node_id1) for el in system.element_map.values()]
+    spans.extend(
+        max(placed.node_ids) - min(placed.node_ids)
+        for placed in system.superelement_map.values()
+    )
+    # the three degrees of freedom of a node are coupled
+    return 3 * max(spans, default=0) + 2 if system.node_map else 0
+
+
+def assemble_sparse_matrix(
+    system: "SystemElements",
+    elements: List["Element"],
+    element_matrices: Optional[List[np.ndarray]] = None,
+    springs: bool = True,
+) -> "sparse.csr_matrix":
+    """Assemble element matrices into a sparse system matrix
+
+    Args:
+        system (SystemElements): System that determines the shape
+        elements (List[Element]): Elements to assemble
+        element_matrices (Optional[List[np.ndarray]], optional): 6x6 matrix of every element.
+            Defaults to None, which are the stiffness matrices of the elements.
+        springs (bool, optional): Add the support springs to the diagonal. Defaults to True.
+
+    Returns:
+        sparse.csr_matrix: System matrix
+    """
+    assert system.shape_system_matrix is not None
+    shape = system.shape_system_matrix
+    if element_matrices is None:
+        element_matrices = [element.stiffness_matrix for element in elements]
+    dofs = np.array(
+        [
+            [(el.node_1.id - 1) * 3 + i for i in range(3)]
+            + [(el.node_2.id - 1) * 3 + i for i in range(3)]
+            for el in elements
+        ],
+        dtype=int,
+    ).reshape(-1, 6)
+    rows = np.repeat(dofs, 6, axis=1).ravel()
+    cols = np.tile(dofs, (1, 6)).ravel()
+    values = np.array(element_matrices, dtype=float).ravel()
+    if springs and system.system_spring_map:
+        diagonal = np.array(list(system.system_spring_map), dtype=int)
+        rows = np.concatenate([rows, diagonal])
+        cols = np.concatenate([cols, diagonal])
+        values = np.concatenate([values, list(system.system_spring_map.values())])
+    # duplicate entries are summed
+    return sparse.csr_matrix((values, (rows, cols)), shape=(shape, shape))
+
+
+def add_superelement_matrices(
+    system: "SystemElements", matrix: "SystemMatrix"
+) -> "SystemMatrix":
+    """Add the condensed stiffness matrices of the superelements to a system matrix
+
+    Args:
+        system (SystemElements): System with the superelements
+        matrix (SystemMatrix): Dense system matrix, which is updated in place, or sparse system matrix
+
+    Returns:
+        SystemMatrix: System matrix with the superelements
+    """
+    for placed in system.superelement_map.values():
+        dofs = placed.dofs
+        if sparse.issparse(matrix):
+            matrix = matrix + sparse.csr_matrix(
+                (
+                    placed.superelement.stiffness_matrix.ravel(),
+                    (np.repeat(dofs, dofs.size), np.tile(dofs, dofs.size)),
+                ),
+                shape=matrix.shape,
+            )
+        else:
+            matrix[np.ix_(dofs, dofs)] += placed.superelement.stiffness_matrix
+    return matrix
+
+
+def reduce_matrix(matrix: "SystemMatrix", indexes: List[int]) -> "SystemMatrix":
+    """Rows and columns of a dense or sparse system matrix
+
+    Args:
+        matrix (SystemMatrix): System matrix
+        indexes (List[int]): Indexes of the rows and columns to keep
+
+    Returns:
+        SystemMatrix: Reduced matrix in the same format
+    """
+    if sparse.issparse(matrix):
+        return matrix[indexes][:, indexes]
+    return np.asarray(matrix)[np.ix_(indexes, indexes)]
+
+
+def add_element_matrix(
+    system_matrix: np.ndarray, element: "Element", element_matrix: np.ndarray
+) -> None:
+    """Add an element matrix at the location of the element's nodes in the system matrix
+
+    Args:
+        system_matrix (np.ndarray): System matrix to add to (in place)
+        element (Element): Element that determines the location
+        element_matrix (np.ndarray): 6x6 matrix to add
+    """
+    # n1 and n2 are starting indexes of the rows and the columns for node 1 and node 2
+    n1 = (element.node_1.id - 1) * 3
+    n2 = (element.node_2.id - 1) * 3
+    system_matrix[n1 : n1 + 3, n1 : n1 + 3] += element_matrix[0:3, :3]
+    system_matrix[n1 : n1 + 3, n2 : n2 + 3] += element_matrix[0:3, 3:]
+
+    system_matrix[n2 : n2 + 3, n1 : n1 + 3] += element_matrix[3:6, :3]
+    system_matrix[n2 : n2 + 3, n2 : n2 + 3] += element_matrix[3:6, 3:]
+
+
+def update_system_matrix(
+    system: "SystemElements", previous_matrices: Dict[int, np.ndarray]
+) -> None:
+    """Update an assembled system matrix with the changed stiffness of some of its elements
+
+    Args:
+        system (SystemElements): System of which the system matrix is updated
+        previous_matrices (Dict[int, np.ndarray]): Maps element ids to the element stiffness
+            matrices that are currently assembled in the system matrix
+    """
+    assert system.system_matrix is not None
+    if sparse.issparse(system.system_matrix):
+        elements = [system.element_map[element_id] for element_id in previous_matrices]
+        system.system_matrix = system.system_matrix + assemble_sparse_matrix(
+            system,
+            elements,
+            [
+                element.stiffness_matrix - previous_matrices[element.id]
+                for element in elements
+            ],
+            springs=False,
+        )
+        return
+    # the system matrix may be shared with forks of the system, see SystemElements.fork
+    matrix = np.array(system.system_matrix)
+    for element_id, previous_matrix in previous_matrices.items():
+        element = system.element_map[element_id]
+        add_element_matrix(matrix, element, element.stiffness_matrix - previous_matrix)
+    system.system_matrix = matrix
+
+
 def set_displacement_vector(
     system: "SystemElements", nodes_list: List[Tuple[int, "AxisNumber"]]
 ) -> np.ndarray:
@@ -282,6 +492,7 @@ def process_conditions(system: "SystemElements") -> None:
         system (SystemElements): System to be processed
     """
     indexes = []
+    system._remainder_indexes = []
     # remove the unsolvable values from the matrix and vectors
     assert system.shape_system_matrix is not None
     assert system.system_displacement_vector is not None
@@ -297,8 +508,9 @@ def process_conditions(system: "SystemElements") -> None:
     assert system.system_force_vector is not None
     assert system.system_matrix is not None
     system.reduced_force_vector = np.delete(system.system_force_vector, indexes, 0)
-    system.reduced_system_matrix = np.delete(system.system_matrix, indexes, 0)
-    system.reduced_system_matrix = np.delete(system.reduced_system_matrix, indexes, 1)
+    system.reduced_system_matrix = reduce_matrix(
+        system.system_matrix, system._remainder_indexes
+    )
 
 
 def process_supports(system: "SystemElements") -> None:
@@ -307,47 +519,7 @@ def process_supports(system: "SystemElements") -> None:
     Args:
         system (SystemElements): System to be processed
     """
-    for node in system.supports_hinged:
-        set_displacement_vector(system, [(node.id, 1), (node.id, 2)])
-
-    for i, supports_rolli in enumerate(system.supports_roll):
-        if not system.supports_roll_rotate[i]:
-            set_displacement_vector(
-                system,
-                [
-                    (supports_rolli.id, system.supports_roll_direction[i]),
-                    (supports_rolli.id, 3),
-                ],
-            )
-        else:
-            set_displacement_vector(
-                system,
-                [(supports_rolli.id, system.supports_roll_direction[i])],
-            )
-
-    for node in system.supports_rotational:
-        set_displacement_vector(system, [(node.id, 3)])
-
-    for node in system.internal_hinges:
-        set_displacement_vector(system, [(node.id, 3)])
-        for el in system.node_element_map[node.id]:
-            el.compile_constitutive_matrix()
-            el.compile_stiffness_matrix()
-
-    for node in system.supports_fixed:
-        set_displacement_vector(system, [(node.id, 1), (node.id, 2), (node.id, 3)])
-
-    for node, roll in system.supports_spring_x:
-        if not roll:
-            set_displacement_vector(system, [(node.id, 2)])
-
-    for node, roll in system.supports_spring_y:
-        if not roll:
-            set_displacement_vector(system, [(node.id, 1)])
-
-    for node, roll in system.supports_spring_z:
-        if not roll:
-            set_displacement_vector(system, [(node.id, 1), (node.id, 2)])
+    set_displacement_vector(system, supported_dofs(system))
 
     for node_id, angle in system.inclined_roll.items():
         for el in system.node_element_map[node_id]:
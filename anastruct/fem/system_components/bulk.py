@@ -0,0 +1,316 @@
+"""Insert many nodes and elements at once, from arrays.
+
+Unlike a sequence of add_element calls, the locations are not looked up, the connected nodes are not
+checked for internal hinges after every element and the model is marked as changed only once.
+"""
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Sequence
+
+import numpy as np
+
+from anastruct.basic import FEMException
+from anastruct.fem.elements import Element, ElementMatrixKey, batch_matrices
+from anastruct.fem.node import Node
+from anastruct.fem.system_components.util import check_internal_hinges
+from anastruct.vertex import vertices_from_array
+
+if TYPE_CHECKING:
+    from anastruct.fem.system import SystemElements
+    from anastruct.types import ElementType, LoadDirection
+
+
+def add_nodes(
+    system: "SystemElements", node_ids: Sequence[int], coordinates: np.ndarray
+) -> None:
+    """Add nodes with the given ids at the given locations, without elements
+
+    Args:
+        system (SystemElements): System to add the nodes to
+        node_ids (Sequence[int]): Ids of the nodes
+        coordinates (np.ndarray): (n, 2) locations of the nodes
+
+    Raises:
+        FEMException: A location or node id is repeated or already assigned to another node
+    """
+    ids = [int(node_id) for node_id in node_ids]
+    vertices = vertices_from_array(coordinates)
+    used = set(ids).intersection(system.node_map)
+    if used or len(set(ids)) != len(ids):
+        raise FEMException(
+            "Flawed inputs", f"Node ids {sorted(used) or ids} are not unique."
+        )
+    # a single duplicate check on the coordinates as stored in the vertices, with the two float32
+    # coordinates of a point packed into one 64 bit integer
+    points = np.array(
+        [vertex.coordinates for vertex in system._vertices]
+        + [vertex.coordinates for vertex in vertices],
+        dtype=np.float32,
+    ).reshape(-1, 2)
+    packed = (points + np.float32(0)).view(np.int64).ravel()  # + 0 turns -0.0 into 0.0
+    if len(np.unique(packed)) != len(packed):
+        raise FEMException(
+            "Flawed inputs", "Nodes are placed at a location that is already in use."
+        )
+    for node_id, vertex in zip(ids, vertices):
+        system._vertices[vertex] = node_id
+        system.node_map[node_id] = Node(node_id, vertex=vertex)
+    system._set_dirty(stiffness=True, supports=True, loads=True)
+
+
+def add_elements(
+    system: "SystemElements",
+    node_id1: Sequence[int],
+    node_id2: Sequence[int],
+    EA: Sequence[float],
+    EI: Sequence[float],
+    element_type: Optional[Sequence["ElementType"]] = None,
+    spring: Optional[np.ndarray] = None,
+    mp: Optional[np.ndarray] = None,
+    g: Optional[Sequence[float]] = None,
+    section_name: Optional[Sequence[str]] = None,
+    element_ids: Optional[Sequence[int]] = None,
+) -> List[int]:
+    """Add elements between existing nodes, like add_element for every row of the arrays
+
+    Args:
+        system (SystemElements): System to add the elements to
+        node_id1 (Sequence[int]): Id of the first node of every element
+        node_id2 (Sequence[int]): Id of the second node of every element
+        EA (Sequence[float]): Axial stiffness of every element
+        EI (Sequence[float]): Bending stiffness of every element, ignored for truss elements
+        element_type (Optional[Sequence[ElementType]], optional): "general" or "truss" per element.
+            Defaults to None, which are general elements.
+        spring (Optional[np.ndarray], optional): (n, 2) rotational springs at the first and second
+            node, 0 for a hinge and NaN for none. Defaults to None.
+        mp (Optional[np.ndarray], optional): (n, 2) maximum plastic moments at the first and second
+            node, NaN for none. Defaults to None.
+        g (Optional[Sequence[float]], optional): Self-weight of every element. Defaults to None.
+        section_name (Optional[Sequence[str]], optional): Section name of every element.
+            Defaults to None.
+        element_ids (Optional[Sequence[int]], optional): Ids of the elements. Defaults to None,
+            which numbers them after the last element.
+
+    Raises:
+        FEMException: A node does not exist or an element id is already in use
+
+    Returns:
+        List[int]: Ids of the new elements
+    """
+    node_id1 = [int(node_id) for node_id in node_id1]
+    node_id2 = [int(node_id) for node_id in node_id2]
+    n = len(node_id1)
+    if element_ids is None:
+        element_ids = range(system.count + 1, system.count + n + 1)
+    ids = [int(element_id) for element_id in element_ids]
+    used = set(ids).intersection(system.element_map)
+    if used or len(set(ids)) != n:
+        raise FEMException(
+            "Flawed inputs", f"Element ids {sorted(used) or ids} are not unique."
+        )
+    missing = set(node_id1).union(node_id2).difference(system.node_map)
+    if missing:
+        raise FEMException("Flawed inputs", f"Nodes {sorted(missing)} do not exist.")
+
+    types: List["ElementType"] = (
+        ["general"] * n if element_type is None else list(element_type)
+    )
+    weights = [0.0] * n if g is None else [float(value) for value in g]
+    names = [""] * n if section_name is None else [str(name) for name in section_name]
+
+    # orientation and length of all elements at once, see force_elements_orientation
+    vertices = [system.node_map[node_id].vertex for node_id in node_id1 + node_id2]
+    coordinates = np.array([vertex.coordinates for vertex in vertices]).reshape(
+        (2, n, 2)
+    )
+    swap = coordinates[1, :, 0].astype(float) < coordinates[0, :, 0].astype(float)
+    first = np.where(swap[:, np.newaxis], coordinates[1], coordinates[0])
+    second = np.where(swap[:, np.newaxis], coordinates[0], coordinates[1])
+    deltas = (second.astype(float) - first.astype(float)).tolist()
+    lengths = np.sqrt(np.sum((second - first) ** 2, axis=1)).tolist()
+    ends = (
+        np.where(swap, node_id2, node_id1).tolist(),
+        np.where(swap, node_id1, node_id2).tolist(),
+    )
+    springs = _end_values(_swap_ends(spring, swap), n)
+    mps = _end_values(_swap_ends(mp, swap), n)
+    # as angle_x_axis, for all elements at once
+    delta_x, delta_y = np.array(deltas, dtype=float).reshape(n, 2).T
+    angles = np.arccos(delta_x / np.sqrt(delta_x**2 + delta_y**2))
+    angles = np.where(delta_y < 0, 2 * np.pi - angles, angles).tolist()
+    EI_values = [
+        0.0 if element_type_ == "truss" else ei
+        for element_type_, ei in zip(types, np.asarray(EI, dtype=float).tolist())
+    ]
+    EA_values = np.asarray(EA, dtype=float).tolist()
+    spring_1 = [end.get(1) for end in springs]
+    spring_2 = [end.get(2) for end in springs]
+    # the matrices are shared by the elements with the same content key
+    matrices = batch_matrices(
+        list(
+            map(
+                ElementMatrixKey._make,
+                zip(
+                    EA_values,
+                    EI_values,
+                    lengths,
+                    angles,
+                    angles,
+                    spring_1,
+                    spring_2,
+                    [value == 0 for value in spring_1],
+                    [value == 0 for value in spring_2],
+                ),
+            )
+        )
+    )
+
+    hinged_nodes = set()
+    node_map = system.node_map
+    node_element_map = system.node_element_map
+    for i, (id_, id1, id2) in enumerate(zip(ids, ends[0], ends[1])):
+        node_1 = node_map[id1]
+        node_2 = node_map[id2]
+        element = Element(
+            id_=id_,
+            EA=EA_values[i],
+            EI=EI_values[i],
+            l=lengths[i],
+            angle=angles[i],
+            vertex_1=node_1.vertex,
+            vertex_2=node_2.vertex,
+            type_=types[i],
+            spring=springs[i],
+            section_name=names[i],
+            matrices=matrices[i],
+        )
+        element.node_id1 = id1
+        element.node_id2 = id2
+        element.node_map = {id1: node_1, id2: node_2}
+        element.dead_load = weights[i]
+        system.element_map[id_] = element
+        node_element_map.setdefault(id1, []).append(element)
+        node_element_map.setdefault(id2, []).append(element)
+        node_1.elements[id_] = element
+        node_2.elements[id_] = element
+        if spring_1[i] == 0 or spring_2[i] == 0:
+            hinged_nodes.update(element.hinges)
+        if mps[i]:
+            system.non_linear_elements[id_] = mps[i]
+            system.non_linear = True
+    system.loads_dead_load.update(ids)
+
+    hinged_nodes.update(node.id for node in system.internal_hinges)
+    for node_id in hinged_nodes:
+        check_internal_hinges(system, node_id)
+    system.count = max(system.count, max(ids, default=0))
+    system._set_dirty(stiffness=True, supports=True, loads=True)
+    return ids
+
+
+def _swap_ends(values: Optional[np.ndarray], swap: np.ndarray) -> Optional[np.ndarray]:
+    """Rows of an (n, 2) array with the ends of the swapped elements exchanged"""
+    if values is None:
+        return None
+    rows = np.asarray(values, dtype=float).reshape(len(swap), 2)
+    return np.where(swap[:, np.newaxis], rows[:, ::-1], rows)
+
+
+def _end_values(
+    values: Optional[np.ndarray], n: int
+) -> List[Dict[Literal[1, 2], float]]:
+    """Dictionaries {1: value, 2: value} of the rows of an (n, 2) array, without the NaN values"""
+    end_values: List[Dict[Literal[1, 2], float]] = [{} for _ in range(n)]
+    if values is None:
+        return end_values
+    rows = np.asarray(values, dtype=float).reshape(n, 2)
+    # only the rows with a value need a look
+    for i in np.flatnonzero(~np.isnan(rows).all(axis=1)).tolist():
+        first, second = rows[i].tolist()
+        if not math.isnan(first):
+            end_values[i][1] = first
+        if not math.isnan(second):
+            end_values[i][2] = second
+    return end_values
+
+
+def q_loads(
+    system: "SystemElements",
+    element_ids: Sequence[int],
+    q: np.ndarray,
+    q_perp: Optional[np.ndarray] = None,
+    direction: Optional[Sequence["LoadDirection"]] = None,
+    rotation: Optional[Sequence[Optional[float]]] = None,
+) -> None:
+    """Apply q-loads to many elements, a row of the arrays per element. SystemElements.q_load
+    applies its loads through this function.
+
+    Args:
+        system (SystemElements): System to load
+        element_ids (Sequence[int]): Ids of the elements
+        q (np.ndarray): (n, 2) q-loads at the first and second node of the elements
+        q_perp (Optional[np.ndarray], optional): (n, 2) q-loads perpendicular to q. Defaults to
+            None, which is no perpendicular load.
+        direction (Optional[Sequence[LoadDirection]], optional): "element", "x", "y", "parallel"
+            or "perpendicular" per load. Defaults to None, which is "element".
+        rotation (Optional[Sequence[Optional[float]]], optional): Clockwise rotation of the loads
+            in degrees, None or NaN to use the direction. Defaults to None.
+
+    Raises:
+        FEMException: An element does not exist or a direction is invalid
+    """
+    ids = [int(element_id) for element_id in element_ids]
+    n = len(ids)
+    missing = set(ids).difference(system.element_map)
+    if missing:
+        raise FEMException("Flawed inputs", f"Elements {sorted(missing)} do not exist.")
+    q_values = np.asarray(q, dtype=float).reshape(n, 2)
+    q_perp_values = (
+        np.zeros((n, 2)) if q_perp is None else np.asarray(q_perp, dtype=float)
+    ).reshape(n, 2)
+    directions = ["element"] * n if direction is None else list(direction)
+    rotations = [None] * n if rotation is None else list(rotation)
+    if n:
+        system.plotter.max_q = max(
+            system.plotter.max_q, float(np.hypot(q_values, q_perp_values).max())
+        )
+
+    factor = system.load_factor
+    orientation = system.orientation_cs
+    for id_, (q_1, q_2), (q_perp_1, q_perp_2), direction_, rotation_ in zip(
+        ids, q_values.tolist(), q_perp_values.tolist(), directions, rotations
+    ):
+        el = system.element_map[id_]
+        if rotation_ is not None and not math.isnan(rotation_):
+            angle = math.radians(rotation_)
+            direction_ = "angle"
+        elif direction_ == "x":
+            angle = 0
+        elif direction_ == "y":
+            angle = np.pi / 2
+        elif direction_ == "parallel":
+            angle = el.angle
+        elif direction_ in ("element", "perpendicular"):
+            angle = np.pi / 2 + el.angle
+        else:
+            raise FEMException(
+                "Invalid direction parameter",
+                "Direction should be 'x', 'y', 'parallel', 'perpendicular' or 'element'",
+            )
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        system.loads_q[id_] = [
+            (
+                (q_perp_1 * cos + q_1 * sin) * factor,
+                (q_1 * orientation * cos + q_perp_1 * sin) * factor,
+            ),
+            (
+                (q_perp_2 * cos + q_2 * sin) * factor,
+                (q_2 * orientation * cos + q_perp_2 * sin) * factor,
+            ),
+        ]
+        el.q_load = (orientation * factor * q_1, orientation * factor * q_2)
+        el.q_perp_load = (q_perp_1 * factor, q_perp_2 * factor)
+        el.q_direction = direction_
+        el.q_angle = angle
+    system._set_dirty(loads=True)
@@ -1,14 +1,127 @@
-import copy
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
 
 import numpy as np
-from scipy import linalg  # type: ignore
 
-from anastruct.basic import converge
+from anastruct.basic import LazyModule, converge
+from anastruct.fem.backends import to_dense
 
 if TYPE_CHECKING:
+    from scipy import linalg  # type: ignore
+
+    from anastruct.fem.backends import Factorization
     from anastruct.fem.system import SystemElements
+else:
+    # scipy is imported on the first solve
+    linalg = LazyModule("scipy.linalg")
+
+
+class LowRankUpdate(NamedTuple):
+    """Sherman-Morrison-Woodbury correction of a factorized reduced system matrix K0.
+
+    The changed matrix is K0 + P D P^T, where P selects the reduced degrees of freedom `indexes`.
+    """
+
+    indexes: np.ndarray  # reduced degrees of freedom of the changed elements
+    stiffness_change: np.ndarray  # D
+    solved_columns: np.ndarray  # Z = K0^-1 P
+    capacitance: Tuple[np.ndarray, np.ndarray]  # LU factorization of I + D P^T Z
+
+
+def low_rank_update(
+    system: "SystemElements",
+    factorization: "Factorization",
+    previous_matrices: Dict[int, np.ndarray],
+) -> LowRankUpdate:
+    """Determine the low-rank correction for elements of which the stiffness changed after the
+    reduced system matrix was factorized. The rank is at most 6 times the number of changed elements.
+
+    Args:
+        system (SystemElements): Solved system
+        factorization (Factorization): Factorization of the reduced system matrix
+        previous_matrices (Dict[int, np.ndarray]): Maps element ids to the element stiffness
+            matrices at the moment of the factorization
+
+    Returns:
+        LowRankUpdate: Correction to use in low_rank_solve
+    """
+    assert system.shape_system_matrix is not None
+    # position of the global degrees of freedom in the reduced system (-1 if supported)
+    position = np.full(system.shape_system_matrix, -1)
+    position[system._remainder_indexes] = np.arange(len(system._remainder_indexes))
+
+    changes = []
+    for element_id, previous_matrix in previous_matrices.items():
+        element = system.element_map[element_id]
+        n1 = (element.node_1.id - 1) * 3
+        n2 = (element.node_2.id - 1) * 3
+        dofs = position[np.r_[n1 : n1 + 3, n2 : n2 + 3]]
+        free = dofs >= 0
+        changes.append(
+            (
+                dofs[free],
+                (element.stiffness_matrix - previous_matrix)[np.ix_(free, free)],
+            )
+        )
+
+    indexes = np.unique(np.concatenate([dofs for dofs, _ in changes]))
+    stiffness_change = np.zeros((indexes.size, indexes.size))
+    for dofs, change in changes:
+        local = np.searchsorted(indexes, dofs)
+        stiffness_change[np.ix_(local, local)] += change
+
+    selection = np.zeros((len(system._remainder_indexes), indexes.size))
+    selection[indexes, np.arange(indexes.size)] = 1.0
+    solved_columns = factorization.solve(selection)
+    capacitance = np.eye(indexes.size) + stiffness_change @ solved_columns[indexes]
+    return LowRankUpdate(
+        indexes, stiffness_change, solved_columns, linalg.lu_factor(capacitance)
+    )
+
+
+def low_rank_solve(
+    factorization: "Factorization",
+    force_vector: np.ndarray,
+    update: Optional[LowRankUpdate] = None,
+    transposed: bool = False,
+) -> np.ndarray:
+    """Solve the reduced system with a factorized system matrix and an optional low-rank correction.
+
+    (K0 + P D P^T)^-1 f = y - Z (I + D P^T Z)^-1 D P^T y, with y = K0^-1 f and Z = K0^-1 P.
+    D is not inverted, so changes that are singular on their own (e.g. a single element) are allowed.
+
+    Args:
+        factorization (Factorization): Factorization of the reduced system matrix K0
+        force_vector (np.ndarray): Reduced force vector
+        update (Optional[LowRankUpdate], optional): Correction for changed elements. Defaults to None.
+        transposed (bool, optional): Solve with the transposed system matrix, e.g. for adjoint
+            systems. Defaults to False.
+
+    Returns:
+        np.ndarray: Reduced displacement vector
+    """
+    displacements: np.ndarray = factorization.solve(force_vector, transposed)
+    if update is None:
+        return displacements
+
+    stiffness_change = update.stiffness_change
+    solved_columns = update.solved_columns
+    capacitance = update.capacitance
+    if transposed:
+        # (K0 + P D P^T)^T = K0^T + P D^T P^T
+        stiffness_change = stiffness_change.T
+        selection = np.zeros((force_vector.shape[0], update.indexes.size))
+        selection[update.indexes, np.arange(update.indexes.size)] = 1.0
+        solved_columns = factorization.solve(selection, transposed=True)
+        capacitance = linalg.lu_factor(
+            np.eye(update.indexes.size)
+            + stiffness_change @ solved_columns[update.indexes]
+        )
+    correction: np.ndarray = linalg.lu_solve(
+        capacitance, stiffness_change @ displacements[update.indexes]
+    )
+    displacements = displacements - solved_columns @ correction
+    return displacements
 
 
 def stiffness_adaptation(
@@ -30,40 +143,44 @@ def stiffness_adaptation(
 
     iteration = 0
     while iteration < max_iter:
-        factors = []
-
-        # update the elements stiffnesses
-        for k, v in system.non_linear_elements.items():
-            el = system.element_map[k]
-            assert el.element_force_vector is not None
-
-            for node_no, mp in v.items():
-                if node_no == 1:
-                    # Fast Tz
-                    m_e = (
-                        el.element_force_vector[2] + el.element_primary_force_vector[2]
-                    )
-                else:
-                    # Fast Tz
-                    m_e = (
-                        el.element_force_vector[5] + el.element_primary_force_vector[5]
-                    )
-
-                if abs(m_e) > mp:
-                    el.nodes_plastic[node_no - 1] = True
-                if el.nodes_plastic[node_no - 1]:
-                    factor = converge(m_e, mp)
-                    factors.append(factor)
-                    el.update_stiffness(factor, node_no)
-
-        if not np.allclose(factors, 1, 1e-3):
-            system.solve(force_linear=True, naked=True)
-        else:
-            system.post_processor.node_results_elements()
-            system.post_processor.node_results_system()
-            system.post_processor.reaction_forces()
-            system.post_processor.element_results()
-            break
+        with system._phase("nonlinear_iteration"):
+            factors = []
+
+            # update the elements stiffnesses
+            for k, v in system.non_linear_elements.items():
+                el = system.element_map[k]
+                assert el.element_force_vector is not None
+
+                for node_no, mp in v.items():
+                    if node_no == 1:
+                        # Fast Tz
+                        m_e = (
+                            el.element_force_vector[2]
+                            + el.element_primary_force_vector[2]
+                        )
+                    else:
+                        # Fast Tz
+                        m_e = (
+                            el.element_force_vector[5]
+                            + el.element_primary_force_vector[5]
+                        )
+
+                    if abs(m_e) > mp:
+                        el.nodes_plastic[node_no - 1] = True
+                    if el.nodes_plastic[node_no - 1]:
+                        factor = converge(m_e, mp)
+                        factors.append(factor)
+                        el.update_stiffness(factor, node_no)
+
+            if not np.allclose(factors, 1, 1e-3):
+                system._set_dirty(stiffness=True)
+                system.solve(force_linear=True, naked=True)
+            else:
+                system.post_processor.node_results_elements()
+                system.post_processor.node_results_system()
+                system.post_processor.reaction_forces()
+                system.post_processor.element_results()
+                break
         iteration += 1
 
     if iteration >= max_iter:
@@ -100,20 +217,29 @@ def det_linear_buckling(system: "SystemElements") -> float:
     :return: The factor the loads can be increased until the structure fails due to buckling.
     """
     system.solve()
+    factorization = system._factorization
+    update = system._low_rank_update
+    assert factorization is not None
 
     # buckling
-    k0 = np.array(system.reduced_system_matrix)  # copy
+    assert system.reduced_system_matrix is not None
+    k0 = system.reduced_system_matrix.copy()
 
     for el in system.element_map.values():
         el.compile_geometric_non_linear_stiffness_matrix()
         el.reset()
+    system._set_dirty(stiffness=True)
 
     system.solve()
-    kg = system.reduced_system_matrix - k0
-    # solve (k -λkg)x = 0
+    kg = to_dense(system.reduced_system_matrix - k0)
+    # solve (k -λkg)x = 0, with the factorization of k: k^-1 kg x = 1/λ x
 
-    eigenvalues = np.abs(linalg.eigvals(k0, kg))
-    return float(np.min(eigenvalues))
+    with system._phase("buckling_eigenvalues"):
+        inverse_eigenvalues = np.abs(
+            linalg.eigvals(low_rank_solve(factorization, kg, update))
+        )
+    largest = float(np.max(inverse_eigenvalues, initial=0.0))
+    return 1.0 / largest if largest > 0 else float("inf")
 
 
 def geometrically_non_linear(
@@ -138,7 +264,7 @@ def geometrically_non_linear(
 
     buckling_factor: Optional[float] = None
     if return_buckling_factor:
-        buckling_system = copy.copy(system)
+        buckling_system = system.fork(results=False)
         if discretize_kwargs is not None:
             buckling_system.discretize(**discretize_kwargs)
 
@@ -148,6 +274,7 @@ def geometrically_non_linear(
 
     for el in system.element_map.values():
         el.compile_geometric_non_linear_stiffness_matrix()
+    system._set_dirty(stiffness=True)
 
     system.solve()
 
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, List, Literal, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -8,11 +8,12 @@ from anastruct.vertex import Vertex
 
 if TYPE_CHECKING:
     from anastruct.fem.system import MpType, Spring, SystemElements
-    from anastruct.types import VertexLike
+    from anastruct.types import AxisNumber, VertexLike
 
 
 def check_internal_hinges(system: "SystemElements", node_id: int) -> None:
-    """Identify internal hinges, set their hinge status
+    """Identify internal hinges, set their hinge status and release the connected elements.
+    This is done once when the elements or hinges of a node change, not on every solve.
 
     Args:
         system (SystemElements): System in which the node is located
@@ -32,12 +33,18 @@ def check_internal_hinges(system: "SystemElements", node_id: int) -> None:
         else:
             hinges.append(0)
 
+    # the node objects are replaced by the results of a solve, so compare the ids
+    is_hinge = any(hinge.id == node_id for hinge in system.internal_hinges)
+
     # If at least one element is connected
     # and no more than one element is rigidly connected
-    if (1 < len(hinges) <= 1 + sum(hinges)) or (len(hinges) == 1 and sum(hinges) == 1):
+    if (
+        (1 < len(hinges) <= 1 + sum(hinges)) or (len(hinges) == 1 and sum(hinges) == 1)
+    ) and not is_hinge:
         system.internal_hinges.append(node)
+        is_hinge = True
 
-    if node in system.internal_hinges:
+    if is_hinge:
         node.hinge = True
 
         # If the elements aren't already all hinged, then set them to be
@@ -45,15 +52,101 @@ def check_internal_hinges(system: "SystemElements", node_id: int) -> None:
             for el_id in node.elements:
                 el = system.element_map[el_id]
                 assert el.springs is not None
-                if node_id == el.node_id1 and not (
-                    1 in el.springs and el.springs[1] == 0
-                ):
-                    el.springs.update({1: 0})
-                if node_id == el.node_id2 and not (
-                    2 in el.springs and el.springs[2] == 0
-                ):
-                    el.springs.update({2: 0})
-                system.element_map[el_id].springs = el.springs
+                end: Literal[1, 2] = 1 if node_id == el.node_id1 else 2
+                if el.springs.get(end) != 0:
+                    el.springs = {**el.springs, end: 0}
+                    # condense the released rotation out of the element matrices once
+                    el.compile_constitutive_matrix()
+                    el.compile_stiffness_matrix()
+
+
+def rotation_free_nodes(system: "SystemElements") -> List[Node]:
+    """Identify the nodes without rotational stiffness: every connected element is a truss element
+    or is hinged at the node, and no connected superelement has rotational stiffness at the node.
+    The rotation of these nodes is eliminated from the system.
+
+    Args:
+        system (SystemElements): System in which the nodes are located
+
+    Returns:
+        List[Node]: Nodes of which the rotation is not a degree of freedom
+    """
+    superelement_nodes = set()
+    stiff_nodes = set()
+    for placed in system.superelement_map.values():
+        for node_id, free in zip(placed.node_ids, placed.superelement.free_rotations):
+            superelement_nodes.add(node_id)
+            if not free:
+                stiff_nodes.add(node_id)
+
+    nodes = []
+    for node_id, node in system.node_map.items():
+        elements = system.node_element_map.get(node_id, [])
+        if node_id in stiff_nodes or not (elements or node_id in superelement_nodes):
+            continue
+        if all(
+            el.type == "truss"
+            or (
+                el.springs is not None
+                and el.springs.get(1 if node_id == el.node_id1 else 2) == 0
+            )
+            for el in elements
+        ):
+            nodes.append(node)
+    return nodes
+
+
+def supported_dofs(system: "SystemElements") -> List[Tuple[int, "AxisNumber"]]:
+    """Identify the degrees of freedom that are removed from the system matrix: those restrained by
+    the supports and the rotations of internal hinges and of nodes without rotational stiffness.
+    process_supports sets their displacements to 0.
+
+    Args:
+        system (SystemElements): System with the supports
+
+    Returns:
+        List[Tuple[int, AxisNumber]]: Node id and direction (1 = x, 2 = y, 3 = z) of every removed
+            degree of freedom
+    """
+    dofs: List[Tuple[int, "AxisNumber"]] = []
+    for node in system.supports_hinged:
+        dofs += [(node.id, 1), (node.id, 2)]
+
+    for node, direction, rotate in zip(
+        system.supports_roll,
+        system.supports_roll_direction,
+        system.supports_roll_rotate,
+    ):
+        dofs.append((node.id, direction))
+        if not rotate:
+            dofs.append((node.id, 3))
+
+    for node in system.supports_rotational:
+        dofs.append((node.id, 3))
+
+    # the elements at internal hinges are already released, see check_internal_hinges
+    for node in system.internal_hinges:
+        dofs.append((node.id, 3))
+
+    # truss elements have no bending stiffness, so their nodes only translate
+    for node in rotation_free_nodes(system):
+        dofs.append((node.id, 3))
+
+    for node in system.supports_fixed:
+        dofs += [(node.id, 1), (node.id, 2), (node.id, 3)]
+
+    for node, roll in system.supports_spring_x:
+        if not roll:
+            dofs.append((node.id, 2))
+
+    for node, roll in system.supports_spring_y:
+        if not roll:
+            dofs.append((node.id, 1))
+
+    for node, roll in system.supports_spring_z:
+        if not roll:
+            dofs += [(node.id, 1), (node.id, 2)]
+    return dofs
 
 
 def append_node_id(
@@ -222,8 +315,8 @@ def add_node(
         int: The node id of the added (or existing) node
     """
     if point in system._vertices:
+        existing_node_id = system._vertices[point]
         if node_id is not None:
-            existing_node_id = system._vertices[point]
             if existing_node_id != node_id:
                 raise FEMException(
                     "Flawed inputs",
@@ -242,6 +335,7 @@ def add_node(
 
     system._vertices[point] = node_id
     system.node_map[node_id] = Node(node_id, vertex=point)
+    system._set_dirty(stiffness=True, supports=True, loads=True)
     return node_id
 
 
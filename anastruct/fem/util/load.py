@@ -1,11 +1,13 @@
-import copy
 import pprint
-from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Union
 
-from anastruct.basic import arg_to_list
+import numpy as np
+
+from anastruct.basic import FEMException, arg_to_list
 
 if TYPE_CHECKING:
     from anastruct.fem.system import SystemElements
+    from anastruct.fem.util.result_store import ResultStore
 
 
 class LoadCase:
@@ -94,6 +96,37 @@ class LoadCase:
         self.c += 1
         self.spec[f"dead_load-{self.c}"] = {"element_id": element_id, "g": g}
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-compatible representation of the load case, see :mod:`anastruct.fem.schema`.
+
+        :return: (dict) {"name": name, "loads": [{"type": "point_load", "node_id": 2, ...}, ...]}
+        """
+        return {
+            "name": self.name,
+            "loads": [
+                {"type": key.split("-")[0], **kwargs}
+                for key, kwargs in self.spec.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LoadCase":
+        """
+        Create a load case from the representation of :meth:`to_dict`.
+
+        :param data: (dict) Name and loads of the load case
+        :return: (:class:`anastruct.fem.util.LoadCase`)
+        """
+        lc = cls(data["name"])
+        for load in data["loads"]:
+            kwargs = dict(load)
+            method = kwargs.pop("type")
+            if method not in ("q_load", "point_load", "moment_load", "dead_load"):
+                raise FEMException("Flawed inputs", f"Unknown load type {method}.")
+            getattr(lc, method)(**kwargs)
+        return lc
+
     def __str__(self) -> str:
         return f"Loadcase {self.name}:\n" + pprint.pformat(self.spec)
 
@@ -123,6 +156,36 @@ class LoadCombination:
         for i, lci in enumerate(lc):
             self.spec[lci.name] = [lci, factor[i]]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-compatible representation of the load combination, see :mod:`anastruct.fem.schema`.
+        The load cases are referred to by name.
+
+        :return: (dict) {"name": name, "factors": {load case name: factor, ...}}
+        """
+        return {
+            "name": self.name,
+            "factors": {name: factor for name, (_, factor) in self.spec.items()},
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: Mapping[str, Any], load_cases: Mapping[str, LoadCase]
+    ) -> "LoadCombination":
+        """
+        Create a load combination from the representation of :meth:`to_dict`.
+
+        :param data: (dict) Name and load case factors of the load combination
+        :param load_cases: (dict) Load cases by name
+        :return: (:class:`anastruct.fem.util.LoadCombination`)
+        """
+        combination = cls(data["name"])
+        for name, factor in data["factors"].items():
+            if name not in load_cases:
+                raise FEMException("Flawed inputs", f"Unknown load case {name}.")
+            combination.add_load_case(load_cases[name], factor)
+        return combination
+
     def solve(
         self,
         system: "SystemElements",
@@ -130,6 +193,7 @@ class LoadCombination:
         verbosity: int = 0,
         max_iter: int = 200,
         geometrical_non_linear: bool = False,
+        store: Optional["ResultStore"] = None,
         **kwargs: Any,
     ) -> Dict[str, "SystemElements"]:
         """
@@ -142,6 +206,10 @@ class LoadCombination:
         :param max_iter: (int) Maximum allowed iterations.
         :param geometrical_non_linear: (bool) Calculate second order effects and determine the
                                        buckling factor.
+        :param store: (:class:`anastruct.fem.util.result_store.ResultStore`) Append the results of
+                      the combination to this store under the name of the combination. A combination
+                      that is already in the store is not solved again and an empty dict is returned,
+                      so an interrupted sweep over many combinations can be resumed.
         :return: (ResultObject)
 
         Development **kwargs:
@@ -152,9 +220,11 @@ class LoadCombination:
                                       determining the buckling_factor
         """
 
+        if store is not None and self.name in store:
+            return {}
         results = {}
         for lc, factor in self.spec.values():
-            ss = copy.deepcopy(system)
+            ss = system.fork(results=False)
 
             ss.load_factor = factor
             ss.apply_load_case(lc)
@@ -163,7 +233,7 @@ class LoadCombination:
             )
             results[lc.name] = ss
 
-        ss_combination = copy.deepcopy(system)
+        ss_combination = system.fork()
         ss_combination.post_processor.node_results_system()
         for lc_ss in results.values():
             for k in ss_combination.element_map:
@@ -173,6 +243,11 @@ class LoadCombination:
             for k in ss_combination.node_map:
                 ss_combination.node_map[k].add_results(lc_ss.node_map[k])
         ss_combination.post_processor.reaction_forces()
+        ss_combination.system_displacement_vector = np.sum(
+            [lc_ss.system_displacement_vector for lc_ss in results.values()], axis=0
+        )
 
+        if store is not None:
+            store.append(self.name, ss_combination)
         results["combination"] = ss_combination
         return results
@@ -0,0 +1,298 @@
+import os
+import pathlib
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from anastruct.basic import FEMException
+
+if TYPE_CHECKING:
+    from anastruct.fem.system import SystemElements
+
+# results of a solved structure that are stored by ResultStore.append
+RESULTS = (
+    "displacements",
+    "reactions",
+    "element_forces",
+    "axial_force",
+    "bending_moment",
+    "shear_force",
+    "deflection",
+)
+DIAGRAMS = ("axial_force", "bending_moment", "shear_force", "deflection")
+
+
+class ResultStore:
+    """
+    Results of many load cases or load combinations on disk, for sweeps whose results do not fit in
+    memory.
+
+    Every quantity is a NumPy .npy file in the directory of the store, with the case as the leading
+    axis, and is read as a memory-mapped array. Cases are only appended: the data of a case is written
+    at the end of the files before the case is recorded in cases.txt, so a store of an interrupted run
+    contains every completed case and can be opened again to continue.
+
+    Quantities of ResultStore.append, with the elements in the order of the element_map:
+        displacements: (cases, dofs) system displacement vectors
+        reactions: (cases, dofs) reaction forces Fx, Fy, Tz of the supported nodes, zero elsewhere
+        element_forces: (cases, elements, 6) forces Fx, Fy, Tz at the first and second node
+        axial_force, bending_moment, shear_force, deflection: (cases, elements, mesh) diagrams
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        """Open a result store, or create it if the directory does not exist
+
+        Args:
+            path (Union[str, os.PathLike[str]]): Directory of the store
+        """
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._cases_file = self.path / "cases.txt"
+        self.cases: List[str] = []
+        if self._cases_file.exists():
+            content = self._cases_file.read_bytes()
+            # a case name without a line end was not completely written
+            committed = content[: content.rfind(b"\n") + 1]
+            if len(committed) < len(content):
+                with open(self._cases_file, "r+b") as fp:
+                    fp.truncate(len(committed))
+            self.cases = committed.decode().splitlines()
+        self._index = {name: i for i, name in enumerate(self.cases)}
+
+    @property
+    def quantities(self) -> List[str]:
+        """Names of the stored quantities"""
+        return sorted(file.stem for file in self.path.glob("*.npy"))
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __getitem__(self, quantity: str) -> np.ndarray:
+        """Read-only memory-mapped array of a quantity, with one row per case
+
+        Args:
+            quantity (str): Name of the quantity
+
+        Raises:
+            FEMException: The quantity is not stored
+
+        Returns:
+            np.ndarray: Values of all cases, in the order of ResultStore.cases
+        """
+        file = self.path / f"{quantity}.npy"
+        if not file.exists():
+            raise FEMException(
+                "Result store error", f"The store has no quantity {quantity}."
+            )
+        shape, dtype, offset = _read_header(file)
+        if not self.cases:
+            return np.empty((0, *shape[1:]), dtype=dtype)
+        array: np.ndarray = np.memmap(
+            file, dtype=dtype, mode="r", offset=offset, shape=(len(self), *shape[1:])
+        )
+        return array
+
+    def case(self, name: str) -> Dict[str, np.ndarray]:
+        """Results of one case
+
+        Args:
+            name (str): Name of the case
+
+        Raises:
+            FEMException: The case is not stored
+
+        Returns:
+            Dict[str, np.ndarray]: Values by quantity
+        """
+        if name not in self._index:
+            raise FEMException("Result store error", f"The store has no case {name}.")
+        index = self._index[name]
+        return {quantity: self[quantity][index] for quantity in self.quantities}
+
+    def envelope(self, quantity: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Minimum and maximum of a quantity over all cases
+
+        Args:
+            quantity (str): Name of the quantity
+
+        Raises:
+            FEMException: The quantity or any case is not stored
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Minimum and maximum, with the shape of one case
+        """
+        values = self[quantity]
+        if values.shape[0] == 0:
+            raise FEMException("Result store error", "The store has no cases.")
+        return np.min(values, axis=0), np.max(values, axis=0)
+
+    def append(self, name: str, system: "SystemElements") -> None:
+        """Store the results of a solved structure as a new case
+
+        Args:
+            name (str): Name of the case
+            system (SystemElements): Solved structure, or the combination of LoadCombination.solve
+        """
+        self.extend(
+            [name],
+            {
+                quantity: values[np.newaxis]
+                for quantity, values in results(system).items()
+            },
+        )
+
+    def extend(self, names: Sequence[str], arrays: Mapping[str, np.ndarray]) -> None:
+        """Store new cases from arrays with the case as the leading axis, for instance the
+        results of CompiledSystem.solve
+
+        Args:
+            names (Sequence[str]): Names of the cases
+            arrays (Mapping[str, np.ndarray]): Values of the cases by quantity. A store holds the
+                same quantities, with the same shapes, for every case.
+
+        Raises:
+            FEMException: A name is already stored, or the arrays do not match the store
+        """
+        names = list(names)
+        if any(name in self._index or "\n" in name for name in names) or len(
+            set(names)
+        ) != len(names):
+            raise FEMException(
+                "Result store error",
+                "Case names should be unique, new and without line ends.",
+            )
+        quantities = self.quantities
+        if (quantities or self.cases) and sorted(arrays) != quantities:
+            raise FEMException(
+                "Result store error",
+                f"The store holds the quantities {quantities}, not {sorted(arrays)}.",
+            )
+        values = {quantity: np.asarray(array) for quantity, array in arrays.items()}
+        for quantity, array in values.items():
+            if array.shape[:1] != (len(names),):
+                raise FEMException(
+                    "Result store error",
+                    f"{quantity} should have a leading axis of {len(names)} cases.",
+                )
+
+        for quantity, array in values.items():
+            self._append_rows(self.path / f"{quantity}.npy", array)
+        # the cases are recorded last: data without a recorded case is overwritten on the next append
+        with open(self._cases_file, "a", encoding="utf-8") as fp:
+            fp.write("".join(f"{name}\n" for name in names))
+        for name in names:
+            self._index[name] = len(self.cases)
+            self.cases.append(name)
+
+    def _append_rows(self, file: pathlib.Path, array: np.ndarray) -> None:
+        """Write rows after the rows of the recorded cases"""
+        append_rows(file, array, len(self.cases))
+
+
+def append_rows(file: pathlib.Path, array: np.ndarray, start: int) -> None:
+    """Write rows to a .npy file after its first rows and grow the leading axis of the header in
+    place. The file is created if it does not exist.
+
+    Args:
+        file (pathlib.Path): .npy file
+        array (np.ndarray): Rows to write
+        start (int): Number of rows to keep, the rows after it are overwritten
+
+    Raises:
+        FEMException: The rows do not have the shape of the rows in the file
+    """
+    if not file.exists():
+        with open(file, "wb") as fp:
+            np.lib.format.write_array_header_1_0(
+                fp, _header(array.dtype, (0, *array.shape[1:]))
+            )
+    shape, dtype, offset = _read_header(file)
+    if shape[1:] != array.shape[1:]:
+        raise FEMException(
+            "Result store error",
+            f"{file.stem} should have rows of shape {shape[1:]}, not {array.shape[1:]}.",
+        )
+    rows = np.ascontiguousarray(array, dtype=dtype)
+    with open(file, "r+b") as fp:
+        fp.seek(offset + start * int(np.prod(shape[1:])) * dtype.itemsize)
+        fp.truncate()
+        fp.write(rows.tobytes())
+        fp.flush()
+        # numpy leaves room in the header to grow the leading axis in place
+        fp.seek(0)
+        np.lib.format.write_array_header_1_0(
+            fp, _header(dtype, (start + len(rows), *shape[1:]))
+        )
+        if fp.tell() != offset:
+            raise FEMException(
+                "Result store error", f"The header of {file.name} can not grow."
+            )
+
+
+def results(system: "SystemElements") -> Dict[str, np.ndarray]:
+    """Results of a solved structure, as stored by ResultStore.append
+
+    Args:
+        system (SystemElements): Solved structure
+
+    Raises:
+        FEMException: The structure has no results
+
+    Returns:
+        Dict[str, np.ndarray]: Values by quantity, see ResultStore
+    """
+    if system.system_displacement_vector is None:
+        raise FEMException(
+            "Result store error", "The structure has to be solved before storing it."
+        )
+    displacements = np.array(system.system_displacement_vector, dtype=float)
+    reactions = np.zeros_like(displacements)
+    for node_id, node in system.reaction_forces.items():
+        reactions[(node_id - 1) * 3 : node_id * 3] = (node.Fx, node.Fy, node.Tz)
+    elements = list(system.element_map.values())
+    values = {
+        "displacements": displacements,
+        "reactions": reactions,
+        "element_forces": np.array(
+            [
+                (
+                    el.node_1.Fx,
+                    el.node_1.Fy,
+                    el.node_1.Tz,
+                    el.node_2.Fx,
+                    el.node_2.Fy,
+                    el.node_2.Tz,
+                )
+                for el in elements
+            ],
+            dtype=float,
+        ).reshape(-1, 6),
+    }
+    for quantity in DIAGRAMS:
+        diagrams = [getattr(el, quantity) for el in elements]
+        if any(diagram is None for diagram in diagrams):
+            raise FEMException(
+                "Result store error",
+                "The structure has no element results, solve it without naked=True.",
+            )
+        values[quantity] = np.array(diagrams, dtype=float).reshape(len(elements), -1)
+    return values
+
+
+def _header(dtype: np.dtype, shape: Tuple[int, ...]) -> dict:
+    return {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": shape,
+    }
+
+
+def _read_header(file: pathlib.Path) -> Tuple[Tuple[int, ...], np.dtype, int]:
+    """Shape, dtype and data offset of a .npy file"""
+    with open(file, "rb") as fp:
+        np.lib.format.read_magic(fp)
+        shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+        return shape, dtype, fp.tell()
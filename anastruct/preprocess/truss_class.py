@@ -175,8 +175,9 @@ class Truss(ABC):
 
     def add_nodes(self) -> None:
         """Add all nodes from self.nodes to the SystemElements."""
+        # node ids of the system start at 1, the indexes of self.nodes at 0
         for i, vertex in enumerate(self.nodes):
-            add_node(self.system, point=vertex, node_id=i)
+            add_node(self.system, point=vertex, node_id=i + 1)
 
     def add_elements(self) -> None:
         """Create elements from connectivity definitions and add to SystemElements.
@@ -268,13 +269,13 @@ class Truss(ABC):
 
     def add_supports(self) -> None:
         """Add supports from self.support_definitions to the SystemElements."""
-        for node_id, support_type in self.support_definitions.items():
+        for node_index, support_type in self.support_definitions.items():
             if support_type == "fixed":
-                self.system.add_support_fixed(node_id=node_id)
+                self.system.add_support_fixed(node_id=node_index + 1)
             elif support_type == "pinned":
-                self.system.add_support_hinged(node_id=node_id)
+                self.system.add_support_hinged(node_id=node_index + 1)
             elif support_type == "roller":
-                self.system.add_support_roll(node_id=node_id)
+                self.system.add_support_roll(node_id=node_index + 1)
 
     def _resolve_support_type(
         self, is_primary: bool = True
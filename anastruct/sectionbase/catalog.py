@@ -0,0 +1,182 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import IO, Callable, Dict, List, Optional, Union
+from xml.etree import ElementTree
+
+import numpy as np
+
+# attributes of a section that are not numbers
+TEXT_ATTRIBUTES = ("sectionname", "figure")
+# version of the cache files, increase when the arrays of a cache file change
+CACHE_VERSION = 1
+
+
+def cache_dir() -> Optional[str]:
+    """Get the directory of the compiled section databases: $ANASTRUCT_CACHE_DIR, or an anastruct
+    directory in the user cache directory. An empty ANASTRUCT_CACHE_DIR disables the cache.
+
+    Returns:
+        Optional[str]: Cache directory, None if the cache is disabled
+    """
+    path = os.environ.get("ANASTRUCT_CACHE_DIR")
+    if path is not None:
+        return path or None
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "anastruct")
+
+
+def load_catalog(file: str) -> "SectionCatalog":
+    """Read the sections of an xml database from its compiled .npz cache, which is created on first
+    use. The cache file name contains a hash of the xml file, so a changed database is compiled again.
+
+    Args:
+        file (str): Path of the xml file
+
+    Returns:
+        SectionCatalog: Catalog of the sections
+    """
+    directory = cache_dir()
+    if directory is None:
+        return SectionCatalog.from_xml(file)
+    with open(file, "rb") as fp:
+        digest = hashlib.sha256(fp.read()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(file))[0]
+    cache = os.path.join(directory, f"{stem}-v{CACHE_VERSION}-{digest}.npz")
+    try:
+        return SectionCatalog.load(cache)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        pass
+    catalog = SectionCatalog.from_xml(file)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first, so other processes never read a partial cache
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                catalog.save(fp)
+            os.replace(tmp, cache)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except OSError:
+        # a read-only cache directory only costs the speed up
+        pass
+    return catalog
+
+
+class SectionCatalog:
+    """
+    Sections of a database in memory, a row per section with a column per parameter, indexed by
+    section name.
+    """
+
+    def __init__(
+        self, names: List[str], figures: List[str], columns: Dict[str, np.ndarray]
+    ) -> None:
+        """Create a catalog
+
+        Args:
+            names (List[str]): Section names, in the order of the database
+            figures (List[str]): Figure (shape) of every section
+            columns (Dict[str, np.ndarray]): Numeric parameters, a value per section
+        """
+        self.names = names
+        self.figures = figures
+        self.columns = columns
+        self.index: Dict[str, int] = {}
+        for i, name in enumerate(names):
+            # a name that occurs more than once refers to its first section
+            self.index.setdefault(name, i)
+
+    @classmethod
+    def from_xml(cls, file: str) -> "SectionCatalog":
+        """Read the sections of an xml database
+
+        Args:
+            file (str): Path of the xml file
+
+        Returns:
+            SectionCatalog: Catalog of the sections
+        """
+        items = (
+            ElementTree.parse(file).getroot().findall("./sectionlist/sectionlist_item")
+        )
+        keys = [key for key in items[0].keys() if key not in TEXT_ATTRIBUTES]
+        return cls(
+            [item.attrib["sectionname"] for item in items],
+            [item.attrib["figure"] for item in items],
+            {
+                key: np.array([item.attrib[key] for item in items], dtype=float)
+                for key in keys
+            },
+        )
+
+    @classmethod
+    def load(cls, file: str) -> "SectionCatalog":
+        """Read a catalog saved with SectionCatalog.save
+
+        Args:
+            file (str): Path of the .npz file
+
+        Returns:
+            SectionCatalog: Catalog of the sections
+        """
+        with np.load(file, allow_pickle=False) as data:
+            columns = {
+                key[len("column_") :]: data[key]
+                for key in data.files
+                if key.startswith("column_")
+            }
+            return cls(
+                np.ndarray.tolist(data["names"]),
+                np.ndarray.tolist(data["figures"]),
+                columns,
+            )
+
+    def save(self, file: Union[str, IO[bytes]]) -> None:
+        """Save the catalog to a .npz file
+
+        Args:
+            file (Union[str, IO[bytes]]): Path or binary file object
+        """
+        savez: Callable[..., None] = np.savez
+        savez(
+            file,
+            names=np.array(self.names),
+            figures=np.array(self.figures),
+            **{f"column_{key}": column for key, column in self.columns.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def row(self, name: str) -> Dict[str, Union[str, float]]:
+        """Parameters of a section, in the units of the database
+
+        Args:
+            name (str): Section name
+
+        Raises:
+            ValueError: The section is not in the catalog
+
+        Returns:
+            Dict[str, Union[str, float]]: Parameters by name
+        """
+        i = self.index.get(name)
+        if i is None:
+            raise ValueError(f"Section {name} is not in the database.")
+        row: Dict[str, Union[str, float]] = {
+            "sectionname": self.names[i],
+            "figure": self.figures[i],
+        }
+        for key, column in self.columns.items():
+            row[key] = float(column[i])
+        return row
@@ -1,8 +1,11 @@
 import os
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Union
 from xml.etree import ElementTree
 
+import numpy as np
+
 from anastruct.sectionbase import units
+from anastruct.sectionbase.catalog import SectionCatalog, load_catalog
 
 
 class SectionBase:
@@ -22,6 +25,12 @@ class SectionBase:
         self.xml_weight_unit: Optional[float] = None
         self.xml_self_weight_dead_load: Optional[float] = None
         self._root: Optional[ElementTree.Element] = None  # xml root
+        # catalogs by database file, read once
+        self._catalogs: Dict[str, SectionCatalog] = {}
+        # section parameters in the current units, by section name
+        self._parameters: Dict[str, Dict[str, Any]] = {}
+        # columns of the current database in the current units
+        self._table: Optional[Dict[str, np.ndarray]] = None
 
         self.set_unit_system()
 
@@ -33,11 +42,28 @@ class SectionBase:
             ElementTree.Element: Root of xml tree
         """
         if self._root is None:
-            self.set_database_name("EU")
+            if self.current_database is None:
+                self.set_database_name("EU")
             self.load_data_from_xml()
         assert self._root is not None
         return self._root
 
+    @property
+    def catalog(self) -> SectionCatalog:
+        """Get the sections of the current database, read once from its compiled cache or xml file
+
+        Returns:
+            SectionCatalog: Sections of the current database
+        """
+        if self.current_database is None:
+            self.set_database_name("EU")
+        assert self.current_database is not None
+        catalog = self._catalogs.get(self.current_database)
+        if catalog is None:
+            catalog = load_catalog(self._database_path())
+            self._catalogs[self.current_database] = catalog
+        return catalog
+
     @property
     def available_sections(self) -> list:
         """Get available sections
@@ -45,12 +71,7 @@ class SectionBase:
         Returns:
             list: List of available sections
         """
-        return list(
-            map(
-                lambda el: el.attrib["sectionname"],
-                self.root.findall("./sectionlist/sectionlist_item"),
-            )
-        )
+        return list(self.catalog.names)
 
     @property
     def available_units(self) -> Dict[str, List[str]]:
@@ -78,6 +99,8 @@ class SectionBase:
         self.current_length_unit = units.l_dict[length]
         self.current_mass_unit = units.m_dict[mass_unit]
         self.current_force_unit = units.f_dict[force_unit]
+        self._parameters = {}
+        self._table = None
 
     def set_database_name(self, basename: Literal["EU", "UK", "US"]) -> None:
         """Set database name
@@ -101,14 +124,17 @@ class SectionBase:
             self.xml_weight_unit = units.lb
             self.xml_self_weight_dead_load = units.lbf
 
-        self.load_data_from_xml()
+        self._root = None
+        self._parameters = {}
+        self._table = None
 
     def load_data_from_xml(self) -> None:
         """Load data from xml file"""
+        self._root = ElementTree.parse(self._database_path()).getroot()
+
+    def _database_path(self) -> str:
         assert self.current_database is not None
-        self._root = ElementTree.parse(
-            os.path.join(os.path.dirname(__file__), "data", self.current_database)
-        ).getroot()
+        return os.path.join(os.path.dirname(__file__), "data", self.current_database)
 
     def get_section_parameters(self, section_name: str) -> dict:
         """Get section parameters
@@ -116,31 +142,169 @@ class SectionBase:
         Args:
             section_name (str): Section name
 
+        Raises:
+            ValueError: The section is not in the database
+
         Returns:
             dict: Section parameters
         """
-        if self.root is None:
-            self.set_database_name("EU")
-            self.load_data_from_xml()
+        element = self._parameters.get(section_name)
+        if element is None:
+            element = self.catalog.row(section_name)
+            element["swdl"] = element["mass"]
+            element = self.convert_units(element)
+            self._parameters[section_name] = element
+        return dict(element)
+
+    @property
+    def section_table(self) -> Dict[str, np.ndarray]:
+        """Get the parameters of all sections of the current database as arrays, in the current units,
+        with the section names in "sectionname" and the shapes in "figure"
+
+        Returns:
+            Dict[str, np.ndarray]: A value per section for every parameter
+        """
+        if self._table is None:
+            catalog = self.catalog
+            table: Dict[str, np.ndarray] = {
+                "sectionname": np.array(catalog.names),
+                "figure": np.array(catalog.figures),
+                **catalog.columns,
+                "swdl": catalog.columns["mass"],
+            }
+            for key, factor in self._unit_factors().items():
+                table[key] = table[key] * factor
+            for column in table.values():
+                column.flags.writeable = False
+            self._table = table
+        return self._table
+
+    def select_sections(
+        self,
+        minimum: Optional[Mapping[str, float]] = None,
+        maximum: Optional[Mapping[str, float]] = None,
+        figure: Optional[Union[str, Sequence[str]]] = None,
+        sort_by: Optional[str] = "mass",
+    ) -> Dict[str, np.ndarray]:
+        """Select the sections with parameters in a range, e.g. the IPE sections with Iy >= 8e-5
+        ordered by mass: select_sections({"Iy": 8e-5}, figure="IPE")
+
+        Args:
+            minimum (Optional[Mapping[str, float]], optional): Lower bounds of parameters. Defaults to None.
+            maximum (Optional[Mapping[str, float]], optional): Upper bounds of parameters. Defaults to None.
+            figure (Optional[Union[str, Sequence[str]]], optional): Only sections of these shapes, like
+                "IPE" or ["HEA", "HEB"]. Defaults to None.
+            sort_by (Optional[str], optional): Sort the sections by this parameter, ascending. None keeps
+                the order of the database. Defaults to "mass".
+
+        Returns:
+            Dict[str, np.ndarray]: The columns of section_table of the selected sections
+        """
+        table = self.section_table
+        rows = np.flatnonzero(self._mask(minimum, maximum, figure))
+        if sort_by is not None:
+            rows = rows[np.argsort(table[sort_by][rows], kind="stable")]
+        return {key: column[rows] for key, column in table.items()}
+
+    def lightest_sections(
+        self,
+        minimum: Mapping[str, Union[float, Sequence[float], np.ndarray]],
+        figure: Optional[Union[str, Sequence[str]]] = None,
+        sort_by: str = "mass",
+    ) -> np.ndarray:
+        """Find the lightest section for every set of requirements at once, e.g. for a member sizing
+        loop: lightest_sections({"Iy": [1e-5, 8e-5], "Ax": [2e-3, 2e-3]}, figure="HEA")
 
-        element = dict(
-            self.root.findall(
-                f"./sectionlist/sectionlist_item[@sectionname='{section_name}']"
-            )[0].items()
+        Args:
+            minimum (Mapping[str, Union[float, Sequence[float], np.ndarray]]): Lower bounds of parameters,
+                a value or an array with a value per requirement
+            figure (Optional[Union[str, Sequence[str]]], optional): Only sections of these shapes.
+                Defaults to None.
+            sort_by (str, optional): Parameter to minimize. Defaults to "mass".
+
+        Raises:
+            ValueError: No lower bound is given
+
+        Returns:
+            np.ndarray: Section name per requirement, "" if no section meets it
+        """
+        if not minimum:
+            raise ValueError("At least one lower bound is needed to select sections.")
+        table = self.section_table
+        rows = np.flatnonzero(self._mask(figure=figure))
+        rows = rows[np.argsort(table[sort_by][rows], kind="stable")]
+        bounds = np.broadcast_arrays(
+            *[
+                np.atleast_1d(np.asarray(value, dtype=float))
+                for value in minimum.values()
+            ]
         )
-        element["swdl"] = element["mass"]
-        element = self.convert_units(element)
-        return element
+        if len(rows) == 0:
+            return np.full(len(bounds[0]), "")
+        fits = np.ones((len(bounds[0]), len(rows)), dtype=bool)
+        for key, bound in zip(minimum, bounds):
+            fits &= table[key][rows] >= bound[:, None]
+        names = table["sectionname"][rows][np.argmax(fits, axis=1)]
+        return np.where(fits.any(axis=1), names, "")
 
-    def convert_units(self, element: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert units
+    def nearest_sections(
+        self,
+        parameter: str,
+        values: Union[float, Sequence[float], np.ndarray],
+        figure: Optional[Union[str, Sequence[str]]] = None,
+    ) -> np.ndarray:
+        """Find the section with the parameter value closest to each of the values
 
         Args:
-            element (Dict[str, Any]): Element
+            parameter (str): Parameter, e.g. "Iy"
+            values (Union[float, Sequence[float], np.ndarray]): Target values
+            figure (Optional[Union[str, Sequence[str]]], optional): Only sections of these shapes.
+                Defaults to None.
+
+        Raises:
+            ValueError: No section has one of the shapes
 
         Returns:
-            Dict[str, Any]: Converted element
+            np.ndarray: Section name per value
         """
+        table = self.section_table
+        rows = np.flatnonzero(self._mask(figure=figure))
+        if len(rows) == 0:
+            raise ValueError(f"There are no sections of figure {figure}.")
+        rows = rows[np.argsort(table[parameter][rows], kind="stable")]
+        column = table[parameter][rows]
+        targets = np.atleast_1d(np.asarray(values, dtype=float))
+        # compare the values with the sections just below and above them
+        above = np.clip(np.searchsorted(column, targets), 0, len(column) - 1)
+        below = np.maximum(above - 1, 0)
+        nearest = np.where(
+            np.abs(column[below] - targets) <= np.abs(column[above] - targets),
+            below,
+            above,
+        )
+        return table["sectionname"][rows][nearest]
+
+    def _mask(
+        self,
+        minimum: Optional[Mapping[str, float]] = None,
+        maximum: Optional[Mapping[str, float]] = None,
+        figure: Optional[Union[str, Sequence[str]]] = None,
+    ) -> np.ndarray:
+        """Sections with parameters in a range and of one of the shapes"""
+        table = self.section_table
+        mask = np.ones(len(table["sectionname"]), dtype=bool)
+        for key, bound in (minimum or {}).items():
+            mask &= table[key] >= bound
+        for key, bound in (maximum or {}).items():
+            mask &= table[key] <= bound
+        if figure is not None:
+            mask &= np.isin(
+                table["figure"], [figure] if isinstance(figure, str) else figure
+            )
+        return mask
+
+    def _unit_factors(self) -> Dict[str, float]:
+        """Factors from the units of the database to the current units"""
         assert self.current_length_unit is not None
         assert self.current_mass_unit is not None
         assert self.current_force_unit is not None
@@ -156,11 +320,25 @@ class SectionBase:
             self.xml_self_weight_dead_load / self.current_force_unit
         )  # self weight dead load unit
 
-        element["mass"] = float(element["mass"]) * wu / lu
-        element["Ax"] = float(element["Ax"]) * sdu**2
-        element["Iy"] = float(element["Iy"]) * sdu**4
-        element["Iz"] = float(element["Iz"]) * sdu**4
-        element["swdl"] = float(element["swdl"]) * self_weight_dead_load / lu
+        return {
+            "mass": wu / lu,
+            "Ax": sdu**2,
+            "Iy": sdu**4,
+            "Iz": sdu**4,
+            "swdl": self_weight_dead_load / lu,
+        }
+
+    def convert_units(self, element: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert units
+
+        Args:
+            element (Dict[str, Any]): Element
+
+        Returns:
+            Dict[str, Any]: Converted element
+        """
+        for key, factor in self._unit_factors().items():
+            element[key] = float(element[key]) * factor
         return element
 
 
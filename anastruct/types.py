@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING, Dict, Literal, Sequence, TypedDict, Union
 import numpy as np
 
 if TYPE_CHECKING:
+    from scipy.sparse import spmatrix  # type: ignore
+
     from anastruct.vertex import Vertex
 
 AxisNumber = Literal[1, 2, 3]
@@ -14,6 +16,9 @@ NumberLike = Union[float, int, np.number]
 OrientAxis = Literal["y", "z"]
 Spring = Dict[Literal[1, 2], float]
 SupportDirection = Literal["x", "y", "1", "2", 1, 2]
+SystemMatrix = Union[
+    np.ndarray, "spmatrix"
+]  # dense or sparse (CSR), see SolverBackend.matrix_format
 VertexLike = Union[Sequence[Union[float, int]], np.ndarray, "Vertex"]
 
 SectionProps = TypedDict(
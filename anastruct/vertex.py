@@ -240,6 +240,23 @@ def vertex_range(v1: Vertex, v2: Vertex, n: int) -> list:
     return [v1 + dv * i / n for i in range(n + 1)]
 
 
+def vertices_from_array(coordinates: np.ndarray) -> list:
+    """Create a Vertex object for every row of an (n, 2) array, without validating every point
+
+    Args:
+        coordinates (np.ndarray): (n, 2) coordinates
+
+    Returns:
+        list: List of n Vertex objects
+    """
+    vertices = []
+    for row in np.array(coordinates, dtype=np.float32).reshape(-1, 2):
+        vertex = Vertex.__new__(Vertex)
+        vertex.coordinates = row
+        vertices.append(vertex)
+    return vertices
+
+
 def det_coordinates(point: Union["VertexLike", "NumberLike"]) -> np.ndarray:
     """Convert a point to coordinates
 
@@ -0,0 +1,5 @@
+import sys
+
+from tests.benchmark.suite import main
+
+sys.exit(main())
@@ -0,0 +1,566 @@
+"""Benchmark suite for the stages of an analysis, on parametric models of increasing size.
+
+Every stage is timed separately (best of a number of repeats) and its peak memory is measured with
+tracemalloc in an extra run. The scaling exponent of every model and stage is the slope of
+log(time) versus log(number of elements). The time of `import anastruct` is measured in a fresh
+interpreter, together with the heavy dependencies that the import loads although they are only
+needed on first use. Results are written as JSON and can be compared with a stored baseline to spot
+regressions between releases:
+
+    python -m tests.benchmark --sizes 10 100 1000 --output baseline.json
+    python -m tests.benchmark --sizes 10 100 1000 --compare baseline.json
+
+Stages of a (model, size) that would exceed the time budget are skipped for the larger sizes.
+"""
+
+import argparse
+import importlib.metadata
+import json
+import math
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import scipy  # type: ignore
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem import system_components
+from anastruct.preprocess.truss import create_truss
+
+# modules that `import anastruct` should not load, they are imported on first use
+LAZY_MODULES = [
+    "matplotlib",
+    "scipy",
+    "anastruct.sectionbase",
+    "anastruct.preprocess.truss",
+]
+
+FLAT_TRUSSES = ["howe", "pratt", "warren"]
+ROOF_TRUSSES = [
+    "king_post",
+    "queen_post",
+    "fink",
+    "howe_roof",
+    "pratt_roof",
+    "fan",
+    "modified_queen_post",
+    "double_fink",
+    "double_howe",
+    "modified_fan",
+    "attic",
+]
+
+
+# Models. Each returns a loaded system with roughly n elements.
+
+
+def chain(n: int, mp: Optional[float] = None) -> SystemElements:
+    """Continuous beam of n elements with a support every 5 elements"""
+    system = SystemElements(EA=5e6, EI=8e3)
+    x = np.linspace(0, n, n + 1)
+    system.add_element_grid(
+        x, np.zeros(n + 1), mp=None if mp is None else {1: mp, 2: mp}
+    )
+    system.add_support_hinged(1)
+    for node_id in range(6, n + 2, 5) if n >= 5 else [n + 1]:
+        system.add_support_roll(node_id)
+    system.q_load(q=-10, element_id=list(system.element_map))
+    return system
+
+
+def nonlinear_chain(n: int) -> SystemElements:
+    """Continuous beam with plastic moment capacities, so it yields under its load"""
+    return chain(n, mp=24.0)
+
+
+def grid(n: int) -> SystemElements:
+    """Multi-storey frame of about n elements, with its columns and beams added by add_element_grid"""
+    bays = max(1, round(math.sqrt(n / 2)))
+    storeys = max(1, round(n / (2 * bays + 1)))
+    system = SystemElements(EA=5e6, EI=8e3)
+    for bay in range(bays + 1):
+        system.add_element_grid(
+            np.full(storeys + 1, 6.0 * bay), np.arange(storeys + 1) * 3.0
+        )
+    for storey in range(1, storeys + 1):
+        system.add_element_grid(
+            np.arange(bays + 1) * 6.0, np.full(bays + 1, 3.0 * storey)
+        )
+    for bay in range(bays + 1):
+        system.add_support_fixed(system.find_node_id([6.0 * bay, 0.0]))
+    beams = [
+        element.id
+        for element in system.element_map.values()
+        if element.vertex_1.y == element.vertex_2.y
+    ]
+    system.q_load(q=-10, element_id=beams)
+    system.point_load(system.find_node_id([0.0, 3.0 * storeys]), Fx=10)
+    return system
+
+
+def flat_truss(truss_type: str) -> Callable[[int], SystemElements]:
+    """Flat truss of about n elements, loaded on its top chord"""
+
+    def build(n: int) -> SystemElements:
+        # every unit adds about four elements
+        units = max(2, 2 * round(n / 8))
+        truss = create_truss(
+            truss_type, width=2.0 * (units + 1), height=2.0, unit_width=2.0
+        )
+        truss.apply_q_load_to_top_chord(q=-5, direction="y")
+        return truss.system
+
+    return build
+
+
+def roof_truss(truss_type: str) -> Callable[[int], SystemElements]:
+    """Roof truss, loaded on its top chord"""
+
+    def build(_: int) -> SystemElements:
+        # roof trusses have a fixed topology, their size does not scale
+        kwargs = {"attic_width": 4.0} if truss_type == "attic" else {}
+        truss = create_truss(truss_type, width=12.0, roof_pitch_deg=30, **kwargs)
+        truss.apply_q_load_to_top_chord(q=-5, direction="y")
+        return truss.system
+
+    return build
+
+
+MODELS: Dict[str, Callable[[int], SystemElements]] = {
+    "chain": chain,
+    "nonlinear_chain": nonlinear_chain,
+    "grid": grid,
+    **{f"truss_{name}": flat_truss(name) for name in FLAT_TRUSSES},
+    **{f"truss_{name}": roof_truss(name) for name in ROOF_TRUSSES},
+}
+FIXED_SIZE_MODELS = {f"truss_{name}" for name in ROOF_TRUSSES}
+
+
+# Stages. The setup prepares a freshly built system and is not timed, run is timed.
+
+
+class Stage(NamedTuple):
+    setup: Callable[[SystemElements], Any]
+    run: Callable[[SystemElements, Any], Any]
+    models: Optional[Sequence[str]] = None  # None is all models except nonlinear_chain
+
+
+def _supports(system: SystemElements) -> None:
+    system_components.assembly.process_supports(system)
+
+
+def _assembled(system: SystemElements) -> None:
+    _supports(system)
+    system_components.assembly.prep_matrix_forces(system)
+    system_components.assembly.assemble_system_matrix(system)
+
+
+def _conditioned(system: SystemElements) -> None:
+    _assembled(system)
+    system_components.assembly.process_conditions(system)
+
+
+def _factorized(system: SystemElements) -> Any:
+    _conditioned(system)
+    return system._solver_backend.factorize(system.reduced_system_matrix)
+
+
+def _solved(system: SystemElements) -> None:
+    system.solve()
+
+
+def _plot(system: SystemElements, _: Any) -> None:
+    # pylint: disable=import-outside-toplevel
+    import matplotlib.pyplot as plt
+
+    system.show_structure(show=False)
+    system.show_bending_moment(show=False)
+    plt.close("all")
+
+
+def _query(system: SystemElements, _: Any) -> None:
+    system.get_element_results(element_id=0, verbose=False)
+    system.get_node_results_system(node_id=0)
+    system.get_node_displacements(node_id=0)
+    system.get_element_result_range("moment", "abs")
+
+
+def _postprocess(system: SystemElements, _: Any) -> None:
+    system.post_processor.node_results_elements()
+    system.post_processor.node_results_system()
+    system.post_processor.reaction_forces()
+    system.post_processor.element_results()
+
+
+STAGES: Dict[str, Stage] = {
+    "build": Stage(lambda system: None, lambda system, _: None),
+    "assembly": Stage(
+        _supports,
+        lambda system, _: (
+            system_components.assembly.prep_matrix_forces(system),
+            system_components.assembly.assemble_system_matrix(system),
+        ),
+    ),
+    "conditions": Stage(
+        _assembled,
+        lambda system, _: system_components.assembly.process_conditions(system),
+    ),
+    "factorization": Stage(
+        _conditioned,
+        lambda system, _: system._solver_backend.factorize(
+            system.reduced_system_matrix
+        ),
+    ),
+    "linear_solve": Stage(
+        _factorized,
+        lambda system, factorization: factorization.solve(system.reduced_force_vector),
+    ),
+    "solve": Stage(lambda system: None, lambda system, _: system.solve()),
+    "nonlinear_solve": Stage(
+        lambda system: None,
+        lambda system, _: system.solve(verbosity=1),
+        models=["nonlinear_chain"],
+    ),
+    "buckling": Stage(
+        lambda system: None,
+        lambda system, _: system.solve(
+            geometrical_non_linear=True, discretize_kwargs={"n": 2}
+        ),
+        models=["chain", "grid"],
+    ),
+    "postprocess": Stage(lambda system: system.solve(naked=True), _postprocess),
+    "queries": Stage(_solved, _query),
+    "plotting": Stage(_solved, _plot),
+}
+
+
+class Measurement(NamedTuple):
+    model: str
+    size: int
+    elements: int
+    dofs: int
+    stage: str
+    seconds: float
+    peak_bytes: int
+
+
+def measure(
+    model: str, size: int, stage_name: str, repeats: int
+) -> Optional[Measurement]:
+    """Time a stage on a model (best of repeats) and determine its peak memory.
+
+    Returns:
+        Optional[Measurement]: None if the stage is not applicable
+    """
+    stage = STAGES[stage_name]
+    if stage.models is not None and model not in stage.models:
+        return None
+    if stage.models is None and model == "nonlinear_chain":
+        return None
+
+    def prepared() -> Any:
+        start = time.perf_counter()
+        system = MODELS[model](size)
+        build_time = time.perf_counter() - start
+        return system, stage.setup(system), build_time
+
+    best = math.inf
+    for _ in range(repeats):
+        system, state, build_time = prepared()
+        start = time.perf_counter()
+        stage.run(system, state)
+        seconds = time.perf_counter() - start
+        best = min(best, build_time if stage_name == "build" else seconds)
+
+    if stage_name == "build":
+        tracemalloc.start()
+        system = MODELS[model](size)
+    else:
+        system, state, _ = prepared()
+        tracemalloc.start()
+        stage.run(system, state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return Measurement(
+        model,
+        size,
+        len(system.element_map),
+        len(system.node_map) * 3,
+        stage_name,
+        best,
+        peak,
+    )
+
+
+def scaling_exponents(
+    measurements: List[Measurement],
+) -> Dict[str, Dict[str, float]]:
+    """Slope of log(seconds) versus log(elements) for every model and stage with more than one size"""
+    exponents: Dict[str, Dict[str, float]] = {}
+    keys = sorted({(m.model, m.stage) for m in measurements})
+    for model, stage in keys:
+        points = [
+            (m.elements, m.seconds)
+            for m in measurements
+            if (m.model, m.stage) == (model, stage) and m.seconds > 0
+        ]
+        if len({elements for elements, _ in points}) < 2:
+            continue
+        x, y = np.log(np.array(points)).T
+        exponents.setdefault(model, {})[stage] = float(np.polyfit(x, y, 1)[0])
+    return exponents
+
+
+def import_time(repeats: int = 3) -> Dict[str, Any]:
+    """Time `import anastruct` in fresh interpreters
+
+    Args:
+        repeats (int, optional): Number of timed imports, of which the best is kept. Defaults to 3.
+
+    Returns:
+        Dict[str, Any]: "seconds" of the import and the LAZY_MODULES that it loaded in "modules"
+    """
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import anastruct\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    seconds = math.inf
+    loaded: List[str] = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=pathlib.Path(__file__).parents[2],
+        ).stdout.splitlines()
+        seconds = min(seconds, float(output[0]))
+        loaded = output[1].split()
+    return {
+        "seconds": seconds,
+        "modules": [module for module in LAZY_MODULES if module in loaded],
+    }
+
+
+def metadata() -> Dict[str, str]:
+    """Versions and environment of the run"""
+    try:
+        revision = subprocess.run(
+            ["git", "describe", "--tags", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = ""
+    try:
+        version = importlib.metadata.version("anastruct")
+    except importlib.metadata.PackageNotFoundError:
+        version = ""
+    return {
+        "anastruct": version,
+        "revision": revision,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run(
+    models: Sequence[str],
+    stages: Sequence[str],
+    sizes: Sequence[int],
+    repeats: int = 3,
+    budget: float = 10.0,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Run the benchmarks.
+
+    Args:
+        models (Sequence[str]): Names of the models in MODELS
+        stages (Sequence[str]): Names of the stages in STAGES
+        sizes (Sequence[int]): Approximate numbers of elements
+        repeats (int, optional): Number of timed runs, of which the best is kept. Defaults to 3.
+        budget (float, optional): Stop increasing the size of a stage once a run takes longer
+            than this number of seconds. Defaults to 10.0.
+        log (Callable[[str], None], optional): Progress output. Defaults to print.
+
+    Returns:
+        Dict[str, Any]: Machine-readable results: "meta", "import", "measurements", "scaling" and
+            "failures"
+    """
+    measurements: List[Measurement] = []
+    failures: List[Dict[str, Any]] = []
+    for model in models:
+        model_sizes = sizes[:1] if model in FIXED_SIZE_MODELS else sizes
+        for stage in stages:
+            if stage == "plotting" and not _has_matplotlib():
+                continue
+            for size in sorted(model_sizes):
+                try:
+                    result = measure(model, size, stage, repeats)
+                except (FEMException, AssertionError, ValueError) as e:
+                    failures.append(
+                        {"model": model, "size": size, "stage": stage, "error": str(e)}
+                    )
+                    log(f"{model:>26} {stage:>15} {size:>8} elements failed: {e}")
+                    break
+                if result is None:
+                    break
+                measurements.append(result)
+                log(
+                    f"{model:>26} {stage:>15} {result.elements:>8} elements "
+                    f"{result.seconds:10.5f} s {result.peak_bytes / 1e6:10.2f} MB"
+                )
+                if result.seconds > budget:
+                    break
+    imported = import_time(repeats)
+    log(
+        f"{'import anastruct':>42} {imported['seconds']:10.5f} s "
+        f"loads {', '.join(imported['modules']) or 'no lazy modules'}"
+    )
+    return {
+        "meta": metadata(),
+        "import": imported,
+        "measurements": [m._asdict() for m in measurements],
+        "scaling": scaling_exponents(measurements),
+        "failures": failures,
+    }
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    noise_floor: float = 1e-3,
+) -> List[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results (Dict[str, Any]): Output of run
+        baseline (Dict[str, Any]): Stored output of run
+        tolerance (float, optional): Allowed relative increase of time or peak memory. Defaults to 0.25.
+        noise_floor (float, optional): Timings below this number of seconds are not compared.
+            Defaults to 1e-3.
+
+    Returns:
+        List[str]: Descriptions of the regressions
+    """
+
+    def key(m: Dict[str, Any]) -> tuple:
+        return m["model"], m["size"], m["stage"]
+
+    reference = {key(m): m for m in baseline["measurements"]}
+    regressions = []
+    for m in results["measurements"]:
+        old = reference.get(key(m))
+        if old is None:
+            continue
+        label = f"{m['model']} {m['stage']} ({m['elements']} elements)"
+        if max(m["seconds"], old["seconds"]) > noise_floor and m["seconds"] > old[
+            "seconds"
+        ] * (1 + tolerance):
+            regressions.append(
+                f"{label}: {old['seconds']:.5f} s -> {m['seconds']:.5f} s "
+                f"({m['seconds'] / old['seconds']:.2f}x)"
+            )
+        if old["peak_bytes"] > 0 and m["peak_bytes"] > old["peak_bytes"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                f"{label}: {old['peak_bytes'] / 1e6:.2f} MB -> {m['peak_bytes'] / 1e6:.2f} MB"
+            )
+    old_import = baseline.get("import")
+    if old_import is not None:
+        seconds = results["import"]["seconds"]
+        if seconds > old_import["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"import anastruct: {old_import['seconds']:.5f} s -> {seconds:.5f} s"
+            )
+        for module in results["import"]["modules"]:
+            if module not in old_import["modules"]:
+                regressions.append(f"import anastruct: loads {module}")
+    for model, stages in results["scaling"].items():
+        for stage, exponent in stages.items():
+            old_exponent = baseline["scaling"].get(model, {}).get(stage)
+            if old_exponent is not None and exponent > old_exponent + tolerance:
+                regressions.append(
+                    f"{model} {stage}: scaling exponent {old_exponent:.2f} -> {exponent:.2f}"
+                )
+    return regressions
+
+
+def _has_matplotlib() -> bool:
+    try:
+        # pylint: disable=import-outside-toplevel,unused-import
+        import matplotlib
+
+        matplotlib.use("Agg")
+    except ImportError:
+        return False
+    return True
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line interface, returns 1 if there are regressions compared to the baseline"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--models", nargs="+", default=list(MODELS), choices=list(MODELS)
+    )
+    parser.add_argument(
+        "--stages", nargs="+", default=list(STAGES), choices=list(STAGES)
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10, 30, 100, 300, 1000],
+        help="approximate numbers of elements, up to 100000",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--budget", type=float, default=10.0, help="seconds per run of a stage"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file with baseline results")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.models, args.stages, args.sizes, args.repeats, args.budget)
+    print("\nscaling exponents (time ~ elements^k)")
+    for model, stages in results["scaling"].items():
+        print(
+            f"{model:>26} "
+            + " ".join(f"{stage}={k:.2f}" for stage, k in stages.items())
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="UTF-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{len(regressions)} regressions compared to {args.compare}")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
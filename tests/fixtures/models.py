@@ -0,0 +1,47 @@
+from anastruct import SystemElements
+
+
+def portal_frame(q=-10.0, Fx=0.0, spring=None, mp=None):
+    """Fixed and hinged 5 x 5 portal frame with a q-load on the beam."""
+    system = SystemElements(EA=15000, EI=5000)
+    system.add_element([[0, 0], [0, 5]])
+    system.add_element([[0, 5], [5, 5]], spring=spring, mp=mp)
+    system.add_element([[5, 5], [5, 0]])
+    system.add_support_fixed(1)
+    system.add_support_hinged(4)
+    system.q_load(q=q, element_id=2)
+    system.point_load(2, Fx=Fx)
+    return system
+
+
+def wide_portal_frame(truss=False):
+    """Unloaded fixed and hinged 6 x 4 portal frame, optionally with a truss column."""
+    system = SystemElements(EA=15000, EI=5000, mesh=10)
+    system.add_element([[0, 0], [0, 4]])
+    system.add_element([[0, 4], [6, 4]])
+    if truss:
+        system.add_truss_element([[6, 4], [6, 0]])
+    else:
+        system.add_element([[6, 4], [6, 0]])
+    system.add_support_fixed(1)
+    system.add_support_hinged(4)
+    return system
+
+
+def mixed_model(mesh=50):
+    """Model using springs, plastic hinges, a truss and every kind of support and load."""
+    system = SystemElements(EA=15000, EI=5000, load_factor=1.5, mesh=mesh)
+    system.add_element([[0, 0], [0, 5]], spring={2: 800})
+    system.add_element([[5, 5], [0, 5]], mp={1: 80}, g=2)
+    system.add_truss_element([[5, 5], [10, 0]], EA=3000)
+    system.add_element([[5, 5], [5, 0]], EI=3000, spring={1: 0})
+    system.add_support_fixed(1)
+    system.add_support_hinged(5)
+    system.add_support_roll(4, direction="x", angle=30)
+    system.add_support_spring(2, translation=1, k=5000)
+    system.q_load(q=(-10, -5), element_id=2)
+    system.q_load(q=3, element_id=1, direction="x")
+    system.q_load(q=2, element_id=4, rotation=30)
+    system.point_load(2, Fx=10, rotation=20)
+    system.moment_load(3, Tz=-5)
+    return system
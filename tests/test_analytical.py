@@ -306,3 +306,56 @@ def describe_analytical_validation_tests():
         def it_results_in_correct_reactions():
             assert system.get_node_results_system(1)["Fy"] == approx(-5)
             assert system.get_node_results_system(2)["Fy"] == approx(-5)
+
+
+def describe_end_releases():
+    def _propped_cantilever(EI=5000, P=10):
+        # fixed at x = 0, pinned at x = 10 through a released element end
+        system = SystemElements(EI=EI, EA=1e9)
+        system.add_element([[0, 0], [5, 0]])
+        system.add_element([[5, 0], [10, 0]], spring={2: 0})
+        system.add_support_fixed(1)
+        system.add_support_roll(3, direction="x")
+        system.point_load(2, Fy=-P)
+        return system
+
+    def it_condenses_a_released_end():
+        EI, P, L = 5000, 10, 10
+        system = _propped_cantilever(EI, P)
+        system.solve()
+        assert system.element_map[2].constitutive_matrix[1:, 1:] == approx(
+            np.array([[3 * EI / 5, 0], [0, 0]])
+        )
+        assert system.get_node_displacements(2)["uy"] == approx(
+            -7 * P * L**3 / (768 * EI)
+        )
+        assert system.get_node_results_system(1)["Tz"] == approx(-3 * P * L / 16)
+
+    def it_releases_the_elements_of_an_internal_hinge_once():
+        system = SystemElements(EI=5000, EA=1e9)
+        system.add_element([[0, 0], [5, 0]])
+        system.add_element([[5, 0], [10, 0]])
+        system.add_support_fixed([1, 3])
+        system.add_internal_hinge(2)
+        matrices = [el.stiffness_matrix for el in system.element_map.values()]
+        assert [el.springs for el in system.element_map.values()] == [{2: 0}, {1: 0}]
+
+        system.point_load(2, Fy=-10)
+        system.solve()
+        # two cantilevers that share the load
+        assert system.get_node_results_system(1)["Tz"] == approx(-25)
+        assert all(
+            el.stiffness_matrix is matrix
+            for el, matrix in zip(system.element_map.values(), matrices)
+        )
+
+    def it_keeps_the_hinges_after_solving():
+        system = _propped_cantilever()
+        system.solve()
+        expected = system.get_node_displacements(2)["uy"]
+        system.set_element_stiffness(1, EI=5000)
+        system.solve()
+        system.solve(force_linear=True)
+        assert len(system.internal_hinges) == 1
+        assert system.node_map[3].hinge
+        assert system.get_node_displacements(2)["uy"] == approx(expected)
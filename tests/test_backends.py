@@ -0,0 +1,192 @@
+import numpy as np
+from pytest import approx, raises, warns
+from scipy import sparse  # type: ignore
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem.backends import AutoBackend, IterativeBackend, band_storage
+from anastruct.fem.sensitivity import displacement_sensitivity
+
+from .fixtures.models import portal_frame
+
+
+def chain(n=100):
+    system = SystemElements(EA=15000, EI=5000)
+    system.add_multiple_elements([[0, 0], [n, 0]], n=n)
+    system.add_support_hinged(1)
+    system.add_support_roll(n + 1)
+    system.q_load(q=-10, element_id=list(range(1, n + 1)))
+    return system
+
+
+def truss_grid(nx=10, ny=4):
+    system = SystemElements(EA=15000)
+    for j in range(ny + 1):
+        for i in range(nx):
+            system.add_element([[i, j], [i + 1, j]], element_type="truss")
+    for j in range(ny):
+        for i in range(nx + 1):
+            system.add_element([[i, j], [i, j + 1]], element_type="truss")
+        for i in range(nx):
+            system.add_element([[i, j], [i + 1, j + 1]], element_type="truss")
+    system.add_support_hinged(1)
+    system.add_support_roll(nx + 1)
+    for i in range(nx + 1):
+        system.point_load(ny * (nx + 1) + i + 1, Fy=-10)
+    return system
+
+
+def describe_solver_backends():
+    def it_solves_identically_with_every_backend():
+        expected = portal_frame(Fx=5)
+        expected.set_solver_backend("lu")
+        displacements = expected.solve()
+        for backend in ("auto", "cholesky", "banded", "sparse", "cg"):
+            system = portal_frame(Fx=5)
+            system.set_solver_backend(backend)
+            assert system.solve() == approx(displacements, rel=1e-8, abs=1e-12)
+            assert system._factorization.backend in (backend, "cholesky")
+
+    def it_selects_a_backend_from_the_matrix():
+        auto = AutoBackend()
+        system = chain()
+        system.solve()
+        assert auto.select(system.reduced_system_matrix).name == "banded"
+        assert system._factorization.backend == "banded"
+
+        system = portal_frame(Fx=5)
+        system.solve()
+        assert system._factorization.backend == "cholesky"
+
+        system = portal_frame(Fx=5, spring={1: 3000})
+        system.solve()
+        assert system._factorization.backend == "lu"
+
+    def it_assembles_narrow_banded_structures_in_band_storage():
+        expected = chain()
+        expected.set_solver_backend("lu")
+        displacements = expected.solve()
+        assert not sparse.issparse(expected.system_matrix)
+
+        system = chain()
+        scale = np.abs(displacements).max()
+        assert system.solve() == approx(displacements, rel=1e-8, abs=1e-10 * scale)
+        assert sparse.issparse(system.system_matrix)
+        factorization = system._factorization
+        assert factorization.backend == "banded"
+        # upper form band storage of the reduced matrix: a half bandwidth of 4
+        assert factorization.factor.shape == (5, system.reduced_system_matrix.shape[0])
+        assert band_storage(system.reduced_system_matrix) == approx(
+            band_storage(expected.reduced_system_matrix)
+        )
+
+        # small structures are assembled dense
+        system = portal_frame(Fx=5)
+        system.solve()
+        assert not sparse.issparse(system.system_matrix)
+
+    def it_rejects_an_unsymmetric_matrix_for_symmetric_backends():
+        system = portal_frame(Fx=5, spring={1: 3000})
+        system.set_solver_backend("cholesky")
+        with raises(FEMException):
+            system.solve()
+
+    def it_rejects_unknown_backends():
+        with raises(FEMException):
+            portal_frame(Fx=5).set_solver_backend("qr")
+
+    def it_detects_an_unstable_structure():
+        system = SystemElements()
+        system.add_element([[0, 0], [5, 0]])
+        system.add_element([[5, 0], [10, 0]])
+        system.add_support_roll(1)
+        system.point_load(2, Fy=-10)
+        assert not system.validate()
+        system.set_solver_backend("cholesky")
+        assert not system.validate()
+        with raises(FEMException):
+            system.solve()
+
+    def it_validates_with_a_minimum_pivot():
+        system = portal_frame(Fx=5)
+        assert system.validate(min_pivot=1e-9)
+        assert not system.validate(min_pivot=1e12)
+        with warns(DeprecationWarning, match="min_pivot"):
+            assert system.validate(1e-9)
+        with warns(DeprecationWarning):
+            assert not system.validate(min_eigen=1e12)
+
+    def it_is_used_by_non_linear_and_adjoint_solves():
+        system = portal_frame(Fx=5)
+        system.set_solver_backend(IterativeBackend(rtol=1e-12))
+        system.solve()
+        sensitivity = displacement_sensitivity(system, 2, 1)
+
+        expected = portal_frame(Fx=5)
+        expected.solve()
+        assert sensitivity.EI == approx(
+            displacement_sensitivity(expected, 2, 1).EI, rel=1e-6
+        )
+
+        system = portal_frame(Fx=5, mp={2: 10})
+        system.set_solver_backend("sparse")
+        linear = np.array(system.solve(force_linear=True))
+        assert np.max(np.abs(system.solve() - linear)) > 1e-6
+        assert system._factorization.backend == "sparse"
+
+
+def describe_iterative_backend():
+    def it_solves_a_truss_grid_with_every_preconditioner():
+        expected = truss_grid()
+        expected.set_solver_backend("lu")
+        displacements = expected.solve()
+        for method in ("cg", "minres"):
+            for preconditioner in ("jacobi", "ilu", "amg"):
+                system = truss_grid()
+                backend = IterativeBackend(method, preconditioner)
+                system.set_solver_backend(backend)
+                assert system.solve() == approx(displacements, rel=1e-6, abs=1e-9)
+                report = backend.history[-1]
+                assert report.converged and report.residual <= 10 * report.rtol
+                assert report.method == method and report.iterations > 0
+
+    def it_assembles_a_sparse_system_matrix():
+        system = truss_grid()
+        system.set_solver_backend("cg")
+        system.solve()
+        assert sparse.issparse(system.system_matrix)
+        assert sparse.issparse(system.reduced_system_matrix)
+
+        system.set_element_stiffness(5, EA=30000)
+        expected = truss_grid()
+        expected.set_element_stiffness(5, EA=30000)
+        assert system.solve() == approx(expected.solve(), rel=1e-6, abs=1e-9)
+        assert sparse.issparse(system.system_matrix)
+
+        system.set_solver_backend("lu")
+        system.solve()
+        assert isinstance(system.system_matrix, np.ndarray)
+
+    def it_warm_starts_from_the_previous_solution():
+        system = truss_grid()
+        backend = IterativeBackend(preconditioner="jacobi")
+        system.set_solver_backend(backend)
+        system.solve()
+        cold = backend.history[-1]
+        system.point_load(8, Fx=1)
+        system.solve()
+        warm = backend.history[-1]
+        assert not cold.warm_started and warm.warm_started
+        assert warm.iterations < cold.iterations
+
+    def it_raises_if_it_does_not_converge():
+        system = truss_grid()
+        backend = IterativeBackend(preconditioner="jacobi", maxiter=2)
+        system.set_solver_backend(backend)
+        with raises(FEMException):
+            system.solve()
+        assert not backend.history[-1].converged
+
+    def it_rejects_unknown_preconditioners():
+        with raises(FEMException):
+            IterativeBackend(preconditioner="multigrid")
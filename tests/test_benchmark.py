@@ -0,0 +1,67 @@
+import copy
+
+from tests.benchmark.suite import compare, import_time, run
+
+
+def describe_benchmark_suite():
+    def _results():
+        return run(
+            ["chain", "truss_king_post"],
+            ["build", "solve", "buckling"],
+            [5, 10],
+            repeats=1,
+            log=lambda _: None,
+        )
+
+    def it_measures_every_applicable_stage_and_size():
+        results = _results()
+        measured = {
+            (m["model"], m["stage"], m["size"]) for m in results["measurements"]
+        }
+        assert measured == {
+            ("chain", "build", 5),
+            ("chain", "build", 10),
+            ("chain", "solve", 5),
+            ("chain", "solve", 10),
+            ("chain", "buckling", 5),
+            ("chain", "buckling", 10),
+            ("truss_king_post", "build", 5),
+            ("truss_king_post", "solve", 5),
+        }
+        assert set(results["scaling"]["chain"]) == {"build", "solve", "buckling"}
+        assert "truss_king_post" not in results["scaling"]
+        assert not results["failures"]
+
+    def it_reports_regressions_against_a_baseline():
+        results = _results()
+        assert not compare(results, results)
+
+        baseline = copy.deepcopy(results)
+        for m in baseline["measurements"]:
+            m["seconds"] /= 10
+            m["peak_bytes"] //= 10
+        regressions = compare(results, baseline, noise_floor=0.0)
+        assert len(regressions) == 2 * len(results["measurements"])
+
+        baseline = copy.deepcopy(results)
+        baseline["import"]["seconds"] /= 10
+        baseline["import"]["modules"] = []
+        results["import"]["modules"] = ["matplotlib"]
+        assert compare(results, baseline) == [
+            f"import anastruct: {baseline['import']['seconds']:.5f} s -> "
+            f"{results['import']['seconds']:.5f} s",
+            "import anastruct: loads matplotlib",
+        ]
+
+
+def describe_import():
+    def it_loads_heavy_dependencies_on_first_use():
+        imported = import_time(repeats=1)
+        assert imported["modules"] == []
+        assert imported["seconds"] > 0
+
+    def it_imports_truss_lazily():
+        import anastruct
+        from anastruct.preprocess import truss
+
+        assert anastruct.truss is truss
@@ -0,0 +1,107 @@
+import pickle
+
+import numpy as np
+from pytest import approx, raises, warns
+from scipy import sparse  # type: ignore
+from scipy.linalg import LinAlgWarning  # type: ignore
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem.compiled import DenseLU, SparseLU
+
+from .fixtures.models import portal_frame
+
+
+def describe_compiled_system():
+    def it_solves_the_loads_at_compile_time():
+        system = portal_frame(Fx=5)
+        compiled = system.compile()
+        results = compiled.solve()
+
+        expected = portal_frame(Fx=5)
+        assert results.displacements == approx(expected.solve())
+        for index, element_id in enumerate(compiled.element_ids):
+            element = expected.element_map[element_id]
+            assert results.element_forces[index] == approx(
+                element.element_force_vector + element.element_primary_force_vector
+            )
+        reaction = expected.reaction_forces[1]
+        assert results.reactions[compiled.dof(1, 1)] == approx(reaction.Fx)
+        assert results.reactions[compiled.dof(1, 2)] == approx(reaction.Fy)
+        assert results.reactions[compiled.dof(1, 3)] == approx(reaction.Tz)
+
+    def it_solves_multiple_load_cases_at_once():
+        compiled = portal_frame().compile()
+        forces = np.zeros((2, compiled.n_dofs))
+        forces[0, compiled.dof(2, 1)] = 5
+        forces[1, compiled.dof(3, 3)] = 12
+        results = compiled.solve(forces)
+        assert results.displacements.shape == (2, compiled.n_dofs)
+
+        first = portal_frame(q=0.0, Fx=5)
+        assert results.displacements[0] == approx(first.solve())
+        reaction = first.reaction_forces[1]
+        assert results.reactions[0, compiled.dof(1, 1)] == approx(reaction.Fx)
+        second = portal_frame(q=0.0)
+        second.moment_load(3, Tz=12)
+        assert results.displacements[1] == approx(second.solve())
+
+    def it_is_immutable_and_independent_of_the_structure():
+        system = portal_frame()
+        compiled = system.compile()
+        before = compiled.solve().displacements
+        with raises(AttributeError):
+            compiled.n_dofs = 3  # type: ignore
+        with raises(ValueError):
+            compiled.element_stiffness[0, 0, 0] = 0
+
+        system.set_element_stiffness(2, EI=12000)
+        system.solve()
+        assert compiled.solve().displacements == approx(before)
+
+    def it_leaves_a_structure_with_changes_untouched():
+        system = portal_frame()
+        displacements = system.solve()
+        factorization = system._factorization
+        system.set_element_stiffness(2, EI=12000)
+        system.point_load(3, Fx=4)
+        compiled = system.compile()
+
+        assert system._factorization is factorization
+        assert system.system_displacement_vector is displacements
+        assert system._loads_changed
+        expected = portal_frame()
+        expected.set_element_stiffness(2, EI=12000)
+        expected.point_load(3, Fx=4)
+        assert compiled.solve().displacements == approx(expected.solve())
+        assert system.solve() == approx(expected.system_displacement_vector)
+
+    def it_pickles():
+        compiled = portal_frame().compile()
+        copied = pickle.loads(pickle.dumps(compiled))
+        assert copied.solve().displacements == approx(compiled.solve().displacements)
+
+    def it_keeps_sparse_system_matrices_sparse():
+        expected = portal_frame(Fx=5)
+        displacements = expected.solve()
+        for backend in ("sparse", "banded", "cg"):
+            system = portal_frame(Fx=5)
+            system.set_solver_backend(backend)
+            compiled = pickle.loads(pickle.dumps(system.compile()))
+            assert isinstance(compiled.factorization, SparseLU)
+            assert sparse.issparse(compiled.support_rows)
+            results = compiled.solve()
+            assert results.displacements == approx(displacements)
+            reaction = expected.reaction_forces[1]
+            assert results.reactions[compiled.dof(1, 1)] == approx(reaction.Fx)
+
+        system = portal_frame(Fx=5)
+        system.set_solver_backend("cholesky")
+        assert isinstance(system.compile().factorization, DenseLU)
+
+    def it_rejects_an_unstable_structure():
+        system = SystemElements()
+        system.add_element([[0, 0], [5, 0]])
+        system.add_support_roll(1)
+        with raises(FEMException), warns(LinAlgWarning):
+            system.compile()
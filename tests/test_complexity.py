@@ -0,0 +1,74 @@
+import numpy as np
+
+from anastruct import SystemElements
+
+
+def build(n=12):
+    system = SystemElements(EA=15000, EI=5000)
+    # number the nodes badly: bottom chord first, then the top chord
+    for i in range(n):
+        system.add_element([[i, 0], [i + 1, 0]])
+    for i in range(n):
+        system.add_element([[i, 1], [i + 1, 1]])
+    for i in range(n + 1):
+        system.add_element([[i, 0], [i, 1]])
+    system.add_support_fixed(1)
+    system.add_support_hinged(n + 1)
+    system.point_load(n // 2, Fy=-10)
+    return system
+
+
+def describe_model_complexity():
+    def it_matches_the_assembled_system_matrix():
+        system = build()
+        complexity = system.complexity()
+        assert system.system_matrix is None  # nothing assembled
+
+        system.solve()
+        reduced = system.reduced_system_matrix
+        rows, cols = np.nonzero(reduced)
+        assert complexity.n_nodes == len(system.node_map)
+        assert complexity.n_dofs == system.shape_system_matrix
+        assert complexity.n_free_dofs == reduced.shape[0]
+        assert complexity.nnz >= rows.size
+        assert complexity.bandwidth == np.max(np.abs(rows - cols))
+
+    def it_reduces_the_bandwidth_by_reordering():
+        complexity = build().complexity()
+        assert complexity.optimized_bandwidth < complexity.bandwidth
+        assert complexity.optimized_profile < complexity.profile
+        assert complexity.envelope_bytes < complexity.dense_bytes
+        assert "bandwidth" in complexity.report()
+
+    def it_reports_the_memory_of_the_results():
+        system = build()
+        before = system.complexity()
+        system.solve()
+        after = system.complexity()
+        assert after.element_array_bytes > before.element_array_bytes
+        assert after.system_array_bytes > before.system_array_bytes
+        assert after.object_bytes > 0
+
+    def it_removes_the_same_dofs_as_the_solve():
+        bay = SystemElements(EA=15000, EI=5000)
+        bay.add_element([[0, 0], [2, 2]])
+        bay.add_element([[2, 2], [4, 0]])
+        system = SystemElements(EA=15000, EI=5000)
+        system.add_element([[0, 0], [0, 3]])
+        system.add_element([[0, 3], [4, 3]])
+        system.add_element([[4, 3], [4, 0]])
+        system.add_truss_element([[0, 3], [4, 0]])
+        system.add_internal_hinge(3)
+        # couples the dofs of nodes 1 and 4
+        system.add_superelement(bay.condense([1, 3]))
+        system.add_support_hinged(1)
+        system.add_support_roll(4, direction="x")
+        system.point_load(2, Fx=10)
+        complexity = system.complexity()
+
+        system.solve()
+        reduced = system.reduced_system_matrix
+        rows, cols = np.nonzero(reduced)
+        assert complexity.n_free_dofs == reduced.shape[0]
+        assert complexity.nnz >= rows.size
+        assert complexity.bandwidth == np.max(np.abs(rows - cols))
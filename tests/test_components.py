@@ -0,0 +1,110 @@
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem.components import ComponentFactorization, factorize_components
+
+
+def portal(system, x0=0.0, load=5.0):
+    system.add_element([[x0, 0], [x0, 4]])
+    system.add_element([[x0, 4], [x0 + 6, 4]])
+    system.add_element([[x0 + 6, 4], [x0 + 6, 0]])
+    system.add_support_fixed(system.find_node_id([x0, 0]))
+    system.add_support_hinged(system.find_node_id([x0 + 6, 0]))
+    system.q_load(q=-10, element_id=len(system.element_map) - 1)
+    system.point_load(system.find_node_id([x0, 4]), Fx=load)
+
+
+def describe_connected_components():
+    def it_solves_independent_parts_separately():
+        expected = SystemElements(EA=15000, EI=5000)
+        portal(expected)
+        expected.solve()
+        system = SystemElements(EA=15000, EI=5000)
+        for i in range(3):
+            portal(system, 10 * i)
+        system.solve()
+
+        components = system.connected_components()
+        assert [component.node_ids for component in components] == [
+            (1, 2, 3, 4),
+            (5, 6, 7, 8),
+            (9, 10, 11, 12),
+        ]
+        assert components[1].element_ids == (4, 5, 6)
+        assert all(component.supported for component in components)
+        assert isinstance(system._factorization, ComponentFactorization)
+        assert len(system._factorization.blocks) == 3
+        for i in range(3):
+            node = system.get_node_displacements(system.find_node_id([10 * i, 4]))
+            assert node["ux"] == approx(expected.get_node_displacements(2)["ux"])
+        assert system.get_element_results(5)["Mmax"] == approx(
+            expected.get_element_results(2)["Mmax"]
+        )
+
+    def it_factorizes_large_parts_in_parallel():
+        system = SystemElements(EA=15000, EI=5000)
+        for i in range(3):
+            portal(system, 10 * i, load=i + 1)
+        expected = system.solve()
+        for backend in ("lu", "sparse"):
+            system.set_solver_backend(backend)
+            system.solve()
+            matrix = system.reduced_system_matrix
+            dofs = np.array(system._remainder_indexes)
+            factorization = factorize_components(
+                system, system._solver_backend, matrix, dofs, parallel_min_dofs=1
+            )
+            assert factorization.parallel
+            rhs = system.reduced_force_vector
+            assert factorization.solve(rhs) == approx(expected[dofs])
+            assert factorization.is_stable()
+
+    def it_reports_floating_parts():
+        system = SystemElements()
+        portal(system)
+        system.add_element([[10, 0], [14, 0]])
+        system.add_element([[14, 0], [18, 0]])
+        system.point_load(system.find_node_id([14, 0]), Fy=-10)
+        assert not system.connected_components()[1].supported
+        with raises(FEMException, match="nodes 5, 6, 7"):
+            system.solve()
+        system.add_support_hinged(5)
+        system.add_support_roll(7)
+        system.solve()
+        assert system.get_node_results_system(5)["Fy"] == approx(-5)
+
+    def it_requires_restraint_in_both_directions():
+        system = SystemElements()
+        portal(system)
+        system.add_element([[10, 0], [14, 0]])
+        system.add_support_roll(5, direction="x")
+        system.add_support_roll(6, direction="x")
+        assert not system.connected_components()[1].supported
+        with raises(FEMException, match="nodes 5, 6"):
+            system.solve()
+        system.add_support_spring(5, translation=1, k=100, roll=True)
+        assert system.connected_components()[1].supported
+
+    def it_counts_inclined_rolls():
+        system = SystemElements()
+        system.add_element([[0, 0], [4, 0]])
+        system.add_support_roll(1, direction="x")
+        system.add_support_roll(2, angle=0)
+        assert not system.connected_components()[0].supported
+        system.add_support_roll(2, angle=30)
+        assert system.connected_components()[0].supported
+
+    def it_connects_the_nodes_of_superelements():
+        bay = SystemElements()
+        bay.add_element([[0, 0], [2, 2]])
+        bay.add_element([[2, 2], [4, 0]])
+        superelement = bay.condense([1, 3])
+        system = SystemElements()
+        system.add_superelement(superelement)
+        system.add_superelement(superelement, offset=(10, 0))
+        system.add_support_hinged([1, 2])
+        components = system.connected_components()
+        assert [component.superelement_ids for component in components] == [(1,), (2,)]
+        assert not components[1].supported
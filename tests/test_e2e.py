@@ -2,6 +2,7 @@ import numpy as np
 from pytest import approx, raises
 
 from anastruct import LoadCase, LoadCombination, SystemElements
+from anastruct.basic import FEMException
 
 from .fixtures.e2e_fixtures import *
 from .utils import pspec_context
@@ -650,3 +651,154 @@ def describe_end_to_end_tests():
             assert results["combination"].get_node_results_system(5)["Fy"] == approx(
                 wind_Fy + cables_Fy
             )
+
+
+def describe_resolve_after_model_changes():
+    def _build(EI_2=5000.0, load=-10.0):
+        system = SystemElements(EA=15000, EI=5000)
+        system.add_element(location=[[0, 0], [0, 5]])
+        system.add_element(location=[[0, 5], [5, 5]], EI=EI_2)
+        system.add_element(location=[[5, 5], [5, 0]])
+        system.add_support_fixed(node_id=1)
+        system.add_support_hinged(node_id=4)
+        system.q_load(q=load, element_id=2)
+        return system
+
+    def it_reuses_the_factorization_when_only_loads_change():
+        system = _build()
+        system.solve()
+        factorization = system._factorization
+        system.q_load(q=-20, element_id=2)
+        system.point_load(node_id=2, Fx=5)
+
+        expected = _build(load=-20)
+        expected.point_load(node_id=2, Fx=5)
+        assert system.solve() == approx(expected.solve())
+        assert system._factorization is factorization
+
+    def it_updates_a_changed_element_stiffness():
+        system = _build()
+        system.solve()
+        system.set_element_stiffness(2, EI=12000)
+
+        expected = _build(EI_2=12000)
+        assert system.solve() == approx(expected.solve())
+        assert system.system_matrix == approx(expected.system_matrix)
+
+    def it_processes_supports_added_after_solving():
+        system = _build()
+        system.solve()
+        system.add_support_hinged(node_id=2)
+
+        expected = _build()
+        expected.add_support_hinged(node_id=2)
+        assert system.solve() == approx(expected.solve())
+        assert system.get_node_displacements(2)["ux"] == approx(0)
+
+    def it_does_not_duplicate_internal_hinges():
+        system = _build()
+        system.add_internal_hinge(3)
+        system.solve()
+        system.q_load(q=-5, element_id=2)
+        system.solve()
+        assert len(system.internal_hinges) == 1
+
+    def it_keeps_the_nodes_connected_after_solving():
+        system = _build()
+        system.solve()
+        assert set(system.node_map[2].elements) == {1, 2}
+        system.add_internal_hinge(2)
+        system.solve()
+        assert [el.springs for el in system.node_element_map[2]] == [{2: 0}, {1: 0}]
+        system.remove_element(3)
+        assert set(system.node_map[3].elements) == {2}
+
+    def it_reanalyzes_with_a_low_rank_correction():
+        system = _build()
+        system.solve()
+        factorization = system._factorization
+        system.reanalyze({2: {"EI": 12000}, 3: {"EA": 30000, "EI": 8000}})
+
+        expected = _build(EI_2=12000)
+        expected.set_element_stiffness(3, EA=30000, EI=8000)
+        assert system.system_displacement_vector == approx(expected.solve())
+        assert system.reduced_system_matrix == approx(expected.reduced_system_matrix)
+        assert system._factorization is factorization
+
+        system.q_load(q=-20, element_id=2)
+        expected.q_load(q=-20, element_id=2)
+        assert system.solve() == approx(expected.solve())
+        assert system._factorization is factorization
+
+    def it_refactorizes_past_the_maximum_number_of_low_rank_elements():
+        system = _build()
+        system.max_low_rank_elements = 1
+        system.solve()
+        factorization = system._factorization
+        system.reanalyze({1: {"EI": 12000}, 2: {"EI": 12000}})
+
+        expected = _build(EI_2=12000)
+        expected.set_element_stiffness(1, EI=12000)
+        assert system.system_displacement_vector == approx(expected.solve())
+        assert system._factorization is not factorization
+        assert not system._factorized_matrices
+
+
+def describe_truss_elements():
+    def _truss():
+        system = SystemElements()
+        system.add_truss_element(location=[[0, 0], [0, 5]], EA=5000)
+        system.add_truss_element(location=[[0, 5], [5, 5]], EA=5000)
+        system.add_truss_element(location=[[5, 5], [5, 0]], EA=5000)
+        system.add_truss_element(location=[[0, 0], [5, 5]], EA=5000 * np.sqrt(2))
+        system.add_support_hinged(node_id=1)
+        system.add_support_hinged(node_id=4)
+        system.point_load(Fx=10, node_id=2)
+        return system
+
+    def it_eliminates_the_rotations_of_truss_nodes():
+        system = _truss()
+        displacements = system.solve()
+        # 2 translations per node, minus the hinged supports
+        assert system.reduced_system_matrix.shape == (4, 4)
+        assert displacements[[3, 4, 6, 7]] == approx([0.04, 0, 0.03, 0.01], abs=1e-9)
+        assert displacements[2::3] == approx(0)
+        assert system.get_element_results(4)["Nmax"] == approx(10 * np.sqrt(2))
+
+    def it_keeps_the_rotation_of_nodes_with_bending_elements():
+        system = _truss()
+        system.add_element(location=[[5, 5], [9, 5]], EA=5000, EI=2000)
+        system.add_support_roll(node_id=5, direction="x")
+        system.q_load(q=-10, element_id=5)
+        system.solve()
+        # nodes 3 and 5 keep their rotation
+        assert system.reduced_system_matrix.shape == (7, 7)
+        assert system.get_element_results(5)["Mmin"] == approx(-20, rel=1e-3)
+
+    def it_supports_trapezoidal_loads_as_simply_supported():
+        system = _truss()
+        system.q_load(q=(0, -6), element_id=2, direction="element")
+        system.solve()
+        element = system.element_map[2]
+        # q linear from 0 to 6 over 5 m: end shears of W/3 and 2W/3
+        assert element.element_primary_force_vector[[1, 4]] == approx([-5, -10])
+        assert element.element_primary_force_vector[[2, 5]] == approx(0)
+
+    def it_keeps_the_truss_type_when_inserting_a_node():
+        system = _truss()
+        system.insert_node(element_id=4, factor=0.5)
+        assert {el.type for el in system.element_map.values()} == {"truss"}
+        assert all(el.EI == 0 for el in system.element_map.values())
+
+    def it_rejects_a_moment_load_on_a_truss_node():
+        system = SystemElements()
+        system.add_truss_element(location=[[0, 0], [3, 4]], EA=5000)
+        system.add_truss_element(location=[[3, 4], [6, 0]], EA=5000)
+        system.add_truss_element(location=[[0, 0], [6, 0]], EA=5000)
+        system.add_support_hinged(node_id=1)
+        system.add_support_roll(node_id=3)
+        system.point_load(node_id=2, Fy=-10)
+        system.solve()
+        system.moment_load(node_id=2, Tz=50)
+        with raises(FEMException, match="Node 2 has a moment load"):
+            system.solve()
@@ -0,0 +1,115 @@
+import io
+
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem.export import element_chunks
+
+from .fixtures.models import wide_portal_frame
+
+
+def build():
+    system = wide_portal_frame(truss=True)
+    system.q_load(q=-10, element_id=2)
+    system.point_load(2, Fx=5)
+    system.solve()
+    return system
+
+
+def describe_export():
+    def it_writes_csv():
+        system = build()
+        buffer = io.StringIO()
+        assert system.export_results(buffer, "nodes") == "csv"
+        buffer.seek(0)
+        assert buffer.readline() == "node_id,Fx,Fy,Tz,ux,uy,phi_z\n"
+        table = np.loadtxt(buffer, delimiter=",")
+        assert table[:, 0].tolist() == [1, 2, 3, 4]
+        node = system.get_node_results_system(3)
+        assert table[2, 1:] == approx(
+            [node[key] for key in ("Fx", "Fy", "Tz", "ux", "uy", "phi_z")]
+        )
+
+        buffer = io.StringIO()
+        system.export_results(buffer, "reactions")
+        buffer.seek(0)
+        table = np.loadtxt(buffer, delimiter=",", skiprows=1)
+        assert table[:, 0].tolist() == [1, 4]
+        assert table[1, 1:] == approx(
+            [
+                system.reaction_forces[4].Fx,
+                system.reaction_forces[4].Fy,
+                system.reaction_forces[4].Tz,
+            ]
+        )
+
+    def it_writes_element_diagrams_in_chunks(tmp_path):
+        system = build()
+        chunks = list(element_chunks(system, 2))
+        assert [len(chunk["element_id"]) for chunk in chunks] == [20, 10]
+
+        system.export_results(tmp_path / "elements.csv", chunk_size=2)
+        assert system.export_results(tmp_path / "elements", file_format="npy") == "npy"
+        csv = np.genfromtxt(tmp_path / "elements.csv", delimiter=",", names=True)
+        for column in ("element_id", "station", "x", "N", "V", "M", "w"):
+            values = np.load(tmp_path / "elements" / f"{column}.npy", mmap_mode="r")
+            assert values.shape == (30,)
+            assert csv[column] == approx(np.asarray(values), nan_ok=True)
+        moment = np.load(tmp_path / "elements" / "M.npy")
+        assert moment[10:20] == approx(system.element_map[2].bending_moment)
+        assert moment[20:] == approx(0)
+        assert csv["x"][10:20] == approx(np.linspace(0, 6, 10))
+
+        # a new export replaces the columns
+        system.export_results(tmp_path / "elements", file_format="npy", chunk_size=1)
+        assert np.load(tmp_path / "elements" / "N.npy").shape == (30,)
+
+    def it_requires_results():
+        system = SystemElements()
+        system.add_element([[0, 0], [1, 0]])
+        with raises(FEMException, match="solved"):
+            system.export_results(io.StringIO())
+
+
+def describe_iter_element_results():
+    def it_yields_records():
+        system = build()
+        records = system.iter_element_results()
+        first = next(records)
+        expected = system.get_element_results(1)
+        assert first == {key: expected[key] for key in first}
+        assert set(first) == set(expected) - {"u", "w", "wtot", "M", "Q", "N"}
+
+        over = [
+            record["id"]
+            for record in system.iter_element_results(["Mmin"])
+            if record.get("Mmin", 0) < -20
+        ]
+        assert over == [2]
+        truss = list(system.iter_element_results(["Nmax", "Mmax"]))[2]
+        assert set(truss) == {"id", "Nmax"}
+
+    def it_yields_chunks():
+        system = build()
+        chunks = list(system.iter_element_results(["Mmax", "M", "q"], chunk_size=2))
+        assert [chunk["id"].tolist() for chunk in chunks] == [[1, 2], [3]]
+        assert chunks[0]["M"].shape == (2, 10)
+        assert chunks[0]["M"][1] == approx(system.element_map[2].bending_moment)
+        assert chunks[0]["Mmax"][1] == approx(system.get_element_results(2)["Mmax"])
+        assert chunks[0]["q"][1] == approx(system.element_map[2].q_load)
+        # the truss element has no bending results
+        assert np.isnan(chunks[1]["M"]).all()
+        assert np.isnan(chunks[1]["Mmax"]).all()
+        assert np.isnan(chunks[1]["q"]).all()
+        mixed = next(system.iter_element_results(chunk_size=3))
+        assert mixed["q"].shape == (3, 2)
+        assert mixed["q"][1] == approx(system.element_map[2].q_load)
+        assert np.isnan(mixed["q"][2]).all()
+        assert chunks[1]["q"].shape == (1, 2)
+        truss = next(system.iter_element_results(["N", "Nmax"], chunk_size=3))
+        assert truss["N"][2] == approx(system.element_map[3].axial_force)
+        assert truss["Nmax"][2] == approx(system.get_element_results(3)["Nmax"])
+        with raises(FEMException, match="Unknown"):
+            next(system.iter_element_results(["moment"]))
@@ -0,0 +1,96 @@
+import gc
+
+import numpy as np
+from pytest import approx, raises
+
+from anastruct.fem.fork import paused_gc
+
+from .fixtures.models import portal_frame
+
+
+def describe_fork():
+    def it_solves_other_loads_with_the_same_factorization():
+        system = portal_frame()
+        expected = system.solve()
+        loads = dict(system.loads_point)
+        fork = system.fork(results=False)
+        assert fork.element_map[2].bending_moment is None
+        fork.point_load(2, Fx=5)
+        assert fork.solve() == approx(portal_frame(Fx=5).solve())
+        assert fork._factorization is system._factorization
+        assert (
+            fork.element_map[2].stiffness_matrix
+            is system.element_map[2].stiffness_matrix
+        )
+
+        # the structure is unaffected
+        assert system.loads_point == loads
+        assert system.system_displacement_vector == approx(expected)
+        system.solve()
+        assert system.system_displacement_vector == approx(expected)
+
+    def it_copies_on_write_when_the_stiffness_changes():
+        system = portal_frame(Fx=5)
+        expected = system.solve()
+        matrix = system.system_matrix.copy()
+        fork = system.fork()
+        fork.set_element_stiffness(2, EI=10000)
+        stiffer = fork.solve()
+
+        assert not np.allclose(stiffer, expected)
+        assert system.system_matrix == approx(matrix)
+        assert system.element_map[2].EI == 5000
+        assert system.solve() == approx(expected)
+
+    def it_copies_the_results():
+        system = portal_frame(Fx=5)
+        system.solve()
+        fork = system.fork()
+        assert fork.get_element_results(2) == system.get_element_results(2)
+        assert fork.get_node_results_system(1) == system.get_node_results_system(1)
+        fork.node_map[2].ux = 1.0
+        fork.element_map[2].node_map[2].Fx = 1.0
+        assert system.node_map[2].ux != 1.0
+        assert system.element_map[2].node_map[2].Fx != 1.0
+        assert fork.node_map[2].elements[2] is fork.element_map[2]
+        assert fork.supports_fixed[0] is fork.node_map[1]
+
+    def it_shares_nothing_mutable_in_deep_mode():
+        system = portal_frame(Fx=5)
+        expected = system.solve()
+        fork = system.fork(deep=True)
+        assert fork.system_displacement_vector is None
+        assert not np.shares_memory(fork.system_matrix, system.system_matrix)
+        for element_id, element in fork.element_map.items():
+            original = system.element_map[element_id]
+            assert not np.shares_memory(
+                element.stiffness_matrix, original.stiffness_matrix
+            )
+        assert fork.solve() == approx(expected)
+
+    def it_keeps_the_structure_intact_on_validation():
+        system = portal_frame(Fx=5)
+        system.solve()
+        forces = [
+            el.element_primary_force_vector.copy() for el in system.element_map.values()
+        ]
+        assert system.validate()
+        for element, primary in zip(system.element_map.values(), forces):
+            assert element.element_primary_force_vector == approx(primary)
+
+
+def describe_paused_gc():
+    def it_restores_the_garbage_collector():
+        assert gc.isenabled()
+        with raises(ValueError):
+            with paused_gc():
+                assert not gc.isenabled()
+                raise ValueError
+        assert gc.isenabled()
+        gc.disable()
+        try:
+            with paused_gc():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
@@ -0,0 +1,118 @@
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import LoadCase, LoadCombination, ResultStore
+from anastruct.basic import FEMException
+
+from .fixtures.models import wide_portal_frame
+
+
+def combinations():
+    dead = LoadCase("dead")
+    dead.q_load(q=-10, element_id=2)
+    wind = LoadCase("wind")
+    wind.point_load(2, Fx=5)
+    for factor in (0.5, 1.0, 1.5):
+        combination = LoadCombination(f"wind {factor}")
+        combination.add_load_case(dead, 1.2)
+        combination.add_load_case(wind, factor)
+        yield combination
+
+
+def describe_result_store():
+    def it_stores_load_combinations(tmp_path):
+        system = wide_portal_frame()
+        store = ResultStore(tmp_path / "store")
+        expected = {}
+        for combination in combinations():
+            expected[combination.name] = combination.solve(system, store=store)[
+                "combination"
+            ]
+
+        assert store.cases == ["wind 0.5", "wind 1.0", "wind 1.5"]
+        assert store["bending_moment"].shape == (3, 3, 10)
+        case = store.case("wind 1.5")
+        combination = expected["wind 1.5"]
+        assert case["bending_moment"][1] == approx(
+            combination.element_map[2].bending_moment
+        )
+        assert case["reactions"][9:12] == approx(
+            [
+                combination.reaction_forces[4].Fx,
+                combination.reaction_forces[4].Fy,
+                combination.reaction_forces[4].Tz,
+            ]
+        )
+        single = wide_portal_frame()
+        single.q_load(q=-12, element_id=2)
+        single.point_load(2, Fx=7.5)
+        assert case["displacements"] == approx(single.solve())
+        assert case["element_forces"][0] == approx(
+            [
+                single.element_map[1].node_1.Fx,
+                single.element_map[1].node_1.Fy,
+                single.element_map[1].node_1.Tz,
+                single.element_map[1].node_2.Fx,
+                single.element_map[1].node_2.Fy,
+                single.element_map[1].node_2.Tz,
+            ]
+        )
+
+        low, high = store.envelope("bending_moment")
+        moments = np.array(
+            [expected[name].element_map[2].bending_moment for name in store.cases]
+        )
+        assert low[1] == approx(moments.min(axis=0))
+        assert high[1] == approx(moments.max(axis=0))
+
+    def it_resumes_an_interrupted_run(tmp_path):
+        system = wide_portal_frame()
+        store = ResultStore(tmp_path)
+        sweep = list(combinations())
+        sweep[0].solve(system, store=store)
+        complete = np.array(store["displacements"])
+
+        # a second case interrupted after writing its data, before recording it
+        system.q_load(q=-10, element_id=2)
+        system.solve()
+        store.append("interrupted", system)
+        with open(tmp_path / "cases.txt", "r+b") as fp:
+            fp.truncate(len(b"wind 0.5\ninterr"))
+
+        resumed = ResultStore(tmp_path)
+        assert resumed.cases == ["wind 0.5"]
+        assert sweep[0].solve(wide_portal_frame(), store=resumed) == {}
+        for combination in sweep[1:]:
+            combination.solve(wide_portal_frame(), store=resumed)
+        assert resumed.cases == ["wind 0.5", "wind 1.0", "wind 1.5"]
+        assert resumed["displacements"][0] == approx(complete[0])
+        assert ResultStore(tmp_path)["displacements"].shape == (3, 12)
+        assert np.load(tmp_path / "displacements.npy").shape == (3, 12)
+
+    def it_extends_with_arrays(tmp_path):
+        system = wide_portal_frame()
+        system.q_load(q=-10, element_id=2)
+        compiled = system.compile()
+        forces = np.zeros((4, compiled.n_dofs))
+        forces[:, compiled.dof(2, 1)] = [1, 2, 3, 4]
+        results = compiled.solve(forces)
+
+        store = ResultStore(tmp_path)
+        arrays = {
+            "displacements": results.displacements,
+            "reactions": results.reactions,
+        }
+        store.extend(["a", "b"], {name: value[:2] for name, value in arrays.items()})
+        store.extend(["c", "d"], {name: value[2:] for name, value in arrays.items()})
+        assert store["displacements"] == approx(results.displacements)
+        assert not store["displacements"].flags.writeable
+
+        with raises(FEMException, match="unique"):
+            store.extend(["a"], {name: value[:1] for name, value in arrays.items()})
+        with raises(FEMException, match="quantities"):
+            store.extend(["e"], {"displacements": results.displacements[:1]})
+        with raises(FEMException, match="shape"):
+            store.extend(
+                ["e"],
+                {"displacements": np.zeros((1, 3)), "reactions": np.zeros((1, 3))},
+            )
@@ -0,0 +1,98 @@
+import json
+
+from pytest import approx, raises
+
+from anastruct import LoadCase, LoadCombination, SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem import schema
+
+from .fixtures.models import mixed_model
+
+
+def describe_schema():
+    def it_round_trips_through_json():
+        system = mixed_model()
+        wind = LoadCase("wind")
+        wind.point_load(node_id=2, Fx=5)
+        combination = LoadCombination("ULS")
+        combination.add_load_case(wind, 1.5)
+        data = json.loads(json.dumps(system.to_dict(combinations=[combination])))
+
+        loaded = SystemElements.from_dict(data)
+        assert loaded.loads_point == approx(system.loads_point)
+        assert loaded.loads_q.keys() == system.loads_q.keys()
+        for element_id, load in system.loads_q.items():
+            assert loaded.loads_q[element_id] == [approx(load[0]), approx(load[1])]
+        assert loaded.non_linear_elements == system.non_linear_elements
+        assert loaded.inclined_roll == approx(system.inclined_roll)
+        assert loaded.element_map[4].springs == system.element_map[4].springs
+        assert loaded.element_map[3].type == "truss"
+        for element_id, element in system.element_map.items():
+            # the bulk path compiles the same, shared matrices as add_element
+            batch = loaded.element_map[element_id]
+            assert batch.stiffness_matrix == approx(element.stiffness_matrix)
+            assert batch.angle == approx(element.angle, abs=1e-15)
+        exported = loaded.to_dict()
+        for table in ("nodes", "elements", "hinges"):
+            assert exported[table] == data[table]
+        assert loaded.solve() == approx(system.solve())
+
+        combinations = schema.combinations_from_dict(data)
+        results = combinations["ULS"].solve(SystemElements.from_dict(data))
+        assert results["wind"].loads_point[2] == approx((5 * 1.5, 0))
+
+    def it_reads_a_minimal_model_with_sections():
+        data = {
+            "nodes": {"id": [1, 2, 3], "x": [0, 4, 8], "y": [0, 0, 0]},
+            "sections": {"name": ["beam"], "EA": [20000], "EI": [8000], "g": [1.0]},
+            "elements": {
+                "node_1": [1, 2],
+                "node_2": [2, 3],
+                "section": ["beam", None],
+            },
+            "supports": {"hinged": [1], "roll": {"node": [3]}},
+            "loads": {"point": {"node": [2], "Fy": [-10]}},
+        }
+        system = SystemElements.from_dict(data)
+        assert (system.element_map[1].EA, system.element_map[1].EI) == (20000, 8000)
+        assert system.element_map[1].dead_load == 1.0
+        assert system.element_map[2].EI == system.EI
+
+        expected = SystemElements()
+        expected.add_element([[0, 0], [4, 0]], EA=20000, EI=8000, g=1.0)
+        expected.add_element([[4, 0], [8, 0]])
+        expected.add_support_hinged(1)
+        expected.add_support_roll(3)
+        expected.point_load(2, Fy=-10)
+        assert system.solve() == approx(expected.solve())
+
+    def it_applies_q_loads_of_negative_element_ids():
+        system = mixed_model()
+        expected = mixed_model()
+        system.q_load(q=(-4, -2), element_id=-1, direction="parallel", q_perp=1)
+        expected.q_load(q=(-4, -2), element_id=4, direction="parallel", q_perp=1)
+        assert system.loads_q[4] == expected.loads_q[4]
+        assert system.element_map[4].q_angle == approx(system.element_map[4].angle)
+        with raises(FEMException, match="Direction should be"):
+            system.q_load(q=1, element_id=1, direction="z")  # type: ignore
+
+    def it_rejects_invalid_models():
+        with raises(FEMException, match="differ in length"):
+            SystemElements.from_dict({"nodes": {"id": [1, 2], "x": [0], "y": [0, 1]}})
+        with raises(FEMException, match="column node_2"):
+            SystemElements.from_dict(
+                {
+                    "nodes": {"id": [1, 2], "x": [0, 1], "y": [0, 0]},
+                    "elements": {"node_1": [1]},
+                }
+            )
+        with raises(FEMException, match="already in use"):
+            SystemElements.from_dict(
+                {"nodes": {"id": [1, 2], "x": [0, 0], "y": [1, 1]}}
+            )
+        with raises(FEMException, match="not unique"):
+            SystemElements.from_dict(
+                {"nodes": {"id": [1, 1], "x": [0, 1], "y": [1, 1]}}
+            )
+        with raises(FEMException, match="schema version"):
+            SystemElements.from_dict({"version": schema.SCHEMA_VERSION + 1})
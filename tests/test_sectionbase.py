@@ -1,7 +1,13 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import numpy as np
 
 from anastruct.fem import system
 from anastruct.sectionbase import section_base
+from anastruct.sectionbase.catalog import SectionCatalog, load_catalog
 
 
 class SimpleUnitTest(unittest.TestCase):
@@ -141,6 +147,109 @@ class SimpleUnitTest(unittest.TestCase):
         self.assertEqual(sections[0], "CAE 100x10")
         self.assertEqual(len(sections), 2145)
 
+    def test_section_catalog(self):
+        catalog = section_base.catalog
+        self.assertEqual(len(catalog), 2145)
+        self.assertIn("HE 100 B", catalog)
+        row = catalog.row("HE 100 B")
+        self.assertEqual(row["figure"], "HEB")
+        self.assertAlmostEqual(
+            row["Ax"], catalog.columns["Ax"][catalog.index["HE 100 B"]]
+        )
+        with self.assertRaises(ValueError):
+            section_base.get_section_parameters("HE 100 X")
+
+    def test_cached_parameters_follow_units(self):
+        param = section_base.get_section_parameters("HE 100 B")
+        param["Ax"] = 0
+        self.assertAlmostEqual(
+            section_base.get_section_parameters("HE 100 B")["Ax"] / 26e-4, 1, places=2
+        )
+        section_base.set_unit_system(length="cm", mass_unit="kg", force_unit="N")
+        self.assertAlmostEqual(
+            section_base.get_section_parameters("HE 100 B")["Ax"] / 26, 1, places=2
+        )
+
+    def test_duplicate_section_names(self):
+        # the British database lists some angles twice, the first one is used
+        section_base.set_database_name("UK")
+        sections = section_base.available_sections
+        self.assertEqual(len(sections), 2051)
+        self.assertGreater(sections.count("L 20x20x3"), 1)
+        self.assertEqual(
+            section_base.catalog.index["L 20x20x3"], sections.index("L 20x20x3")
+        )
+
+    def test_compiled_database_cache(self):
+        xml = section_base._database_path()
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(os.environ, {"ANASTRUCT_CACHE_DIR": directory}):
+                catalog = load_catalog(xml)
+                (cache,) = os.listdir(directory)
+                self.assertTrue(cache.startswith("sectionbase_EuropeanSectionDatabase"))
+
+                cached = SectionCatalog.load(os.path.join(directory, cache))
+                self.assertEqual(cached.names, catalog.names)
+                self.assertEqual(cached.figures, catalog.figures)
+                self.assertEqual(cached.columns.keys(), catalog.columns.keys())
+                for key, column in catalog.columns.items():
+                    np.testing.assert_array_equal(cached.columns[key], column)
+
+                # a damaged cache is compiled again
+                with open(os.path.join(directory, cache), "wb") as fp:
+                    fp.write(b"damaged")
+                self.assertEqual(load_catalog(xml).names, catalog.names)
+                self.assertEqual(
+                    SectionCatalog.load(os.path.join(directory, cache)).names,
+                    catalog.names,
+                )
+
+            with mock.patch.dict(os.environ, {"ANASTRUCT_CACHE_DIR": ""}):
+                self.assertEqual(len(load_catalog(xml)), 2145)
+
+    def test_select_sections(self):
+        selected = section_base.select_sections(
+            {"Iy": 8e-5}, {"Iy": 2e-4}, figure="IPE"
+        )
+        self.assertEqual(
+            selected["sectionname"].tolist(), ["IPE 300", "IPE 330", "IPE 360"]
+        )
+        self.assertTrue(np.all(np.diff(selected["mass"]) >= 0))
+        self.assertAlmostEqual(
+            selected["Iy"][0], section_base.get_section_parameters("IPE 300")["Iy"]
+        )
+
+        section_base.set_unit_system(length="cm", mass_unit="kg", force_unit="N")
+        selected = section_base.select_sections({"Iy": 8e3}, {"Iy": 2e4}, figure="IPE")
+        self.assertEqual(selected["sectionname"][0], "IPE 300")
+
+    def test_lightest_sections(self):
+        names = section_base.lightest_sections(
+            {"Iy": [1e-5, 8e-5, 1.0], "Ax": 2e-3}, figure=["HEA", "IPE"]
+        )
+        self.assertEqual(names.tolist(), ["IPE 180", "IPE 300", ""])
+
+        table = section_base.section_table
+        requirements = {"Iy": np.linspace(0, 1e-3, 20), "Ax": np.linspace(0, 1e-2, 20)}
+        for i, name in enumerate(section_base.lightest_sections(requirements)):
+            fits = (table["Iy"] >= requirements["Iy"][i]) & (
+                table["Ax"] >= requirements["Ax"][i]
+            )
+            row = list(table["sectionname"]).index(name)
+            self.assertTrue(fits[row])
+            self.assertEqual(table["mass"][row], table["mass"][fits].min())
+
+        names = section_base.lightest_sections({"Iy": [1e-5, 8e-5]}, figure="NOPE")
+        self.assertEqual(names.tolist(), ["", ""])
+        with self.assertRaises(ValueError):
+            section_base.lightest_sections({})
+
+    def test_nearest_sections(self):
+        names = section_base.nearest_sections("Iy", [0, 8.4e-5, 1.0], figure="IPE")
+        self.assertEqual(names.tolist(), ["IPE 80", "IPE 300", "IPE 750222"])
+        with self.assertRaises(ValueError):
+            section_base.nearest_sections("Iy", 1.0, figure="XYZ")
+
     def test_available_units(self):
         self.assertEqual(section_base.available_units["length"][0], "m")
 
@@ -0,0 +1,88 @@
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem.sensitivity import (
+    displacement_sensitivity,
+    element_force_sensitivity,
+    reaction_force_sensitivity,
+)
+
+
+def build(change=None):
+    system = SystemElements(EA=15000, EI=5000)
+    system.add_element([[0, 0], [0, 5]])
+    system.add_element([[0, 5], [5, 6]], spring={1: 3000})
+    system.add_element([[5, 6], [9, 5]], EA=9000, EI=3000)
+    system.add_element([[9, 5], [9, 0]])
+    system.add_truss_element([[0, 0], [5, 6]], EA=2000)
+    system.add_support_fixed(1)
+    system.add_support_hinged(5)
+    system.add_internal_hinge(3)
+    system.q_load(q=-10, element_id=2)
+    system.point_load(4, Fx=20)
+    if change is not None:
+        element_id, name, value = change
+        system.set_element_stiffness(element_id, **{name: value})
+    system.solve()
+    return system
+
+
+def finite_differences(response):
+    system = build()
+    result = {"EA": [], "EI": []}
+    for element in system.element_map.values():
+        for name in result:
+            if name == "EI" and element.type == "truss":
+                result[name].append(0.0)
+                continue
+            value = getattr(element, name)
+            step = value * 1e-6
+            upper = response(build((element.id, name, value + step)))
+            lower = response(build((element.id, name, value - step)))
+            result[name].append((upper - lower) / (2 * step))
+    return result
+
+
+def describe_adjoint_sensitivity():
+    def it_matches_finite_differences_of_a_displacement():
+        sensitivity = displacement_sensitivity(build(), node_id=4, direction=1)
+        expected = finite_differences(lambda s: s.system_displacement_vector[9])
+        assert list(sensitivity.element_ids) == [1, 2, 3, 4, 5]
+        assert sensitivity.EA == approx(expected["EA"], rel=1e-4, abs=1e-12)
+        assert sensitivity.EI == approx(expected["EI"], rel=1e-4, abs=1e-12)
+
+    def it_matches_finite_differences_of_a_reaction_force():
+        sensitivity = reaction_force_sensitivity(build(), node_id=1, direction=3)
+        expected = finite_differences(lambda s: s.reaction_forces[1].Tz)
+        assert sensitivity.EA == approx(expected["EA"], rel=1e-4, abs=1e-10)
+        assert sensitivity.EI == approx(expected["EI"], rel=1e-4, abs=1e-10)
+
+    def it_matches_finite_differences_of_an_end_moment():
+        def end_moment(system):
+            element = system.element_map[2]
+            return (
+                element.element_force_vector[2]
+                + element.element_primary_force_vector[2]
+            )
+
+        sensitivity = element_force_sensitivity(build(), 2, node=1, direction=3)
+        expected = finite_differences(end_moment)
+        assert sensitivity.EA == approx(expected["EA"], rel=1e-4, abs=1e-10)
+        assert sensitivity.EI == approx(expected["EI"], rel=1e-4, abs=1e-10)
+
+    def it_uses_the_low_rank_update_after_reanalysis():
+        system = build()
+        system.reanalyze({3: {"EI": 6000}})
+        sensitivity = displacement_sensitivity(system, node_id=4, direction=1)
+        expected = displacement_sensitivity(build((3, "EI", 6000)), 4, 1)
+        assert sensitivity.EA == approx(expected.EA)
+        assert sensitivity.EI == approx(expected.EI)
+
+    def it_requires_a_solved_system():
+        system = build()
+        system.set_element_stiffness(1, EA=20000)
+        with raises(FEMException):
+            displacement_sensitivity(system, node_id=4, direction=1)
+        assert np.all(np.isfinite(system.solve()))
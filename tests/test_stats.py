@@ -0,0 +1,81 @@
+from anastruct import SystemElements
+from anastruct.fem.stats import SolveStats
+
+
+def build():
+    system = SystemElements(EA=15000, EI=5000)
+    system.add_element([[0, 0], [0, 5]])
+    system.add_element([[0, 5], [5, 5]], mp={2: 10})
+    system.add_element([[5, 5], [5, 0]])
+    system.add_support_fixed(1)
+    system.add_support_fixed(4)
+    system.q_load(q=-10, element_id=2)
+    return system
+
+
+def describe_solve_stats():
+    def it_records_nothing_by_default():
+        system = build()
+        system.solve(force_linear=True)
+        assert system.solve_stats is None
+
+    def it_records_the_phases_of_a_solve():
+        system = build()
+        stats = system.enable_solve_stats()
+        system.solve(force_linear=True)
+
+        assert stats.solves == 1
+        assert stats.total_seconds > 0
+        for name in (
+            "process_supports",
+            "prep_matrix_forces",
+            "assemble_system_matrix",
+            "factorization",
+            "linear_solve",
+            "element_forces",
+            "element_results",
+        ):
+            assert stats.phases[name].calls == 1
+        assert sum(s.seconds for s in stats.phases.values()) <= stats.total_seconds
+        assert "solves" in stats.as_dict()
+        assert "factorization" in stats.report()
+
+    def it_resets_on_every_solve():
+        system = build()
+        stats = system.enable_solve_stats()
+        system.solve(force_linear=True)
+        system.point_load(2, Fx=5)
+        system.solve(force_linear=True)
+
+        assert stats.solves == 1
+        assert "factorization" not in stats.phases
+        assert stats.phases["linear_solve"].calls == 1
+
+    def it_counts_the_nested_solves_of_a_non_linear_calculation():
+        system = build()
+        stats = system.enable_solve_stats()
+        system.solve()
+
+        iterations = stats.phases["nonlinear_iteration"].calls
+        assert iterations > 1
+        assert stats.solves == iterations + 1
+        # the outer solve only dispatches to the non-linear solver
+        assert stats.phases["linear_solve"].calls == stats.solves - 1
+
+    def it_calls_the_callbacks_after_every_phase():
+        calls = []
+        system = build()
+        system.enable_solve_stats(
+            callbacks=[lambda name, seconds, blocks: calls.append(name)]
+        )
+        system.solve(force_linear=True)
+        assert calls[-1] == "element_results"
+        assert len(calls) == sum(s.calls for s in system.solve_stats.phases.values())
+
+    def it_traces_the_peak_memory():
+        stats = SolveStats(track_memory=True)
+        with stats.solve():
+            with stats.phase("allocate"):
+                data = bytearray(10**6)
+        del data
+        assert stats.phases["allocate"].peak_bytes >= 10**6
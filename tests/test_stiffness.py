@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+
+from anastruct.fem import elements
 from anastruct.fem import system as se
 
 
@@ -30,6 +33,39 @@ class TestSystemElements(unittest.TestCase):
         self.assertIsNone(stiffness_matrix)
         print("Handled invalid element ID correctly.")
 
+    def test_identical_elements_share_stiffness_matrix(self):
+        system = se.SystemElements()
+        system.add_element(location=[[0, 0], [5, 0]])
+        system.add_element(location=[[5, 0], [10, 0]])
+        system.add_element(location=[[10, 0], [10, 5]])
+
+        el1, el2, el3 = system.element_map.values()
+        self.assertIs(el1.stiffness_matrix, el2.stiffness_matrix)
+        self.assertIsNot(el1.stiffness_matrix, el3.stiffness_matrix)
+        self.assertFalse(el1.stiffness_matrix.flags.writeable)
+
+    def test_element_matrix_cache_statistics(self):
+        elements.clear_element_matrix_cache()
+        system = se.SystemElements()
+        system.add_element_grid(np.arange(11), np.zeros(11))
+
+        info = elements.element_matrix_cache_info()
+        self.assertEqual(info["stiffness"]["misses"], 1)
+        self.assertEqual(info["stiffness"]["hits"], 9)
+        self.assertEqual(info["stiffness"]["maxsize"], elements.CACHE_BOUND)
+
+    def test_update_stiffness_does_not_modify_shared_matrix(self):
+        system = se.SystemElements()
+        system.add_element(location=[[0, 0], [5, 0]])
+        system.add_element(location=[[5, 0], [10, 0]])
+        el1, el2 = system.element_map.values()
+        original = np.array(el2.stiffness_matrix)
+
+        el1.update_stiffness(0.5, 1)
+        self.assertIsNone(el1.matrix_key)
+        np.testing.assert_allclose(el2.stiffness_matrix, original)
+        self.assertFalse(np.allclose(el1.stiffness_matrix, original))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+import io
+
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+from anastruct.fem import storage
+from anastruct.fem.system_components import bulk
+
+from .fixtures.models import mixed_model
+
+
+def save(system, **kwargs):
+    file = io.BytesIO()
+    system.save(file, **kwargs)
+    file.seek(0)
+    return file
+
+
+def describe_storage():
+    def it_round_trips_the_model():
+        system = mixed_model(mesh=20)
+        loaded = SystemElements.load(save(system))
+        assert list(loaded.node_map) == list(system.node_map)
+        for element_id, element in system.element_map.items():
+            other = loaded.element_map[element_id]
+            assert (other.node_id1, other.node_id2) == (
+                element.node_id1,
+                element.node_id2,
+            )
+            assert (other.EA, other.EI, other.type) == (
+                element.EA,
+                element.EI,
+                element.type,
+            )
+            assert other.springs == element.springs
+            assert other.q_load == element.q_load
+            assert other.q_direction == element.q_direction
+        assert loaded.loads_point == system.loads_point
+        assert loaded.loads_q == system.loads_q
+        assert loaded.loads_moment == system.loads_moment
+        assert loaded.non_linear_elements == system.non_linear_elements
+        assert loaded.inclined_roll == system.inclined_roll
+        assert loaded.system_spring_map == system.system_spring_map
+        assert loaded.solve() == approx(system.solve())
+
+    def it_round_trips_the_results():
+        system = mixed_model(mesh=20)
+        system.solve()
+        loaded = SystemElements.load(save(system))
+        assert loaded.system_displacement_vector == approx(
+            system.system_displacement_vector
+        )
+        for element_id in system.element_map:
+            assert loaded.get_element_results(element_id) == approx(
+                system.get_element_results(element_id)
+            )
+            assert loaded.element_map[element_id].deflection == approx(
+                system.element_map[element_id].deflection
+            )
+        assert loaded.get_node_results_system() == approx(
+            system.get_node_results_system()
+        )
+        assert (
+            SystemElements.load(save(system), results=False)
+            .element_map[1]
+            .bending_moment
+            is None
+        )
+
+    def it_reads_the_results_lazily():
+        system = mixed_model(mesh=20)
+        system.solve()
+        results = storage.load_results(save(system))
+        assert results["element_ids"].tolist() == [1, 2, 3, 4]
+        assert results["bending_moment"][1] == approx(
+            system.element_map[2].bending_moment
+        )
+        with raises(FEMException, match="no results"):
+            storage.load_results(save(system, results=False))
+
+    def it_rejects_newer_versions():
+        arrays = storage.model_arrays(mixed_model(mesh=20))
+        arrays["format_version"] = np.array(storage.FORMAT_VERSION + 1)
+        file = io.BytesIO()
+        np.savez(file, **arrays)
+        file.seek(0)
+        with raises(FEMException, match="format version"):
+            SystemElements.load(file)
+
+    def it_rejects_superelements():
+        bay = SystemElements()
+        bay.add_element([[0, 0], [2, 2]])
+        bay.add_element([[2, 2], [4, 0]])
+        system = SystemElements()
+        system.add_superelement(bay.condense([1, 3]))
+        with raises(FEMException, match="superelements"):
+            system.save(io.BytesIO())
+
+
+def describe_bulk():
+    def it_adds_elements_like_add_element():
+        expected = SystemElements()
+        expected.add_element([[0, 0], [3, 0]])
+        expected.add_element([[6, 0], [3, 0]], spring={2: 0})
+        expected.add_support_hinged(1)
+        expected.add_support_fixed(3)
+        expected.point_load(2, Fy=-10)
+
+        system = SystemElements()
+        bulk.add_nodes(system, [1, 2, 3], np.array([[0, 0], [3, 0], [6, 0]]))
+        ids = bulk.add_elements(
+            system,
+            [1, 3],
+            [2, 2],
+            [15000, 15000],
+            [5000, 5000],
+            spring=np.array([[np.nan, np.nan], [np.nan, 0]]),
+        )
+        assert ids == [1, 2]
+        system.add_support_hinged(1)
+        system.add_support_fixed(3)
+        system.point_load(2, Fy=-10)
+        assert system.element_map[2].node_id1 == 2
+        assert system.element_map[2].springs == expected.element_map[2].springs
+        assert system.solve() == approx(expected.solve())
+        with raises(FEMException, match="not unique"):
+            bulk.add_elements(system, [1], [3], [1], [1], element_ids=[2])
@@ -0,0 +1,137 @@
+import numpy as np
+from pytest import approx, raises
+
+from anastruct import SystemElements
+from anastruct.basic import FEMException
+
+
+def bay(system, x0=0.0):
+    # a braced frame bay on top of a beam, connected at (x0, 0) and (x0 + 4, 0)
+    system.add_element([[x0, 0], [x0 + 1, 3]], EA=20000, EI=3000)
+    system.add_element([[x0 + 1, 3], [x0 + 3, 3]], EA=20000, EI=3000)
+    system.add_element([[x0 + 3, 3], [x0 + 4, 0]], EA=20000, EI=3000)
+    system.add_truss_element([[x0, 0], [x0 + 3, 3]], EA=8000)
+    system.q_load(q=-5, element_id=len(system.element_map) - 2)
+
+
+def frame(superelement=None, n=3):
+    # a beam on n + 1 columns, with a bay on top of every span
+    system = SystemElements(EA=20000, EI=3000)
+    for i in range(n):
+        system.add_element([[4 * i, 0], [4 * i + 4, 0]])
+    for i in range(n + 1):
+        system.add_element([[4 * i, 0], [4 * i, -3]])
+        system.add_support_fixed(system.find_node_id([4 * i, -3]))
+    for i in range(n):
+        if superelement is None:
+            bay(system, 4 * i)
+        else:
+            system.add_superelement(superelement, offset=(4 * i, 0))
+    system.point_load(system.find_node_id([0, 0]), Fx=8)
+    return system
+
+
+def condensed_bay():
+    system = SystemElements()
+    bay(system)
+    return system.condense([system.find_node_id([0, 0]), system.find_node_id([4, 0])])
+
+
+def describe_superelements():
+    def it_matches_the_full_model():
+        expected = frame()
+        expected.solve()
+        system = frame(condensed_bay())
+        system.solve()
+
+        # the 4 nodes of the beam, instead of also the 6 nodes of the tops of the bays
+        assert system.reduced_system_matrix.shape == (12, 12)
+        assert expected.reduced_system_matrix.shape == (30, 30)
+        for vertex in ([0, 0], [4, 0], [12, 0]):
+            node = system.get_node_displacements(system.find_node_id(vertex))
+            full = expected.get_node_displacements(expected.find_node_id(vertex))
+            assert [node["ux"], node["uy"], node["phi_z"]] == approx(
+                [full["ux"], full["uy"], full["phi_z"]]
+            )
+        for vertex in ([0, -3], [12, -3]):
+            node = system.get_node_results_system(system.find_node_id(vertex))
+            full = expected.get_node_results_system(expected.find_node_id(vertex))
+            assert [node["Fx"], node["Fy"], node["Tz"]] == approx(
+                [full["Fx"], full["Fy"], full["Tz"]]
+            )
+
+    def it_recovers_the_interior_results():
+        expected = frame()
+        expected.solve()
+        system = frame(condensed_bay())
+        system.solve()
+
+        results = system.get_superelement_results(2)
+        top = results.get_node_displacements(results.find_node_id([1, 3]))
+        full = expected.get_node_displacements(expected.find_node_id([5, 3]))
+        assert [top["ux"], top["uy"], top["phi_z"]] == approx(
+            [full["ux"], full["uy"], full["phi_z"]]
+        )
+        # the beam of the second bay
+        beam = expected.find_node_id([5, 3]), expected.find_node_id([7, 3])
+        element = next(
+            el
+            for el in expected.element_map.values()
+            if (el.node_id1, el.node_id2) == beam
+        )
+        assert results.get_element_results(2)["Mmin"] == approx(
+            expected.get_element_results(element.id)["Mmin"]
+        )
+
+    def it_shares_one_condensation_between_placements():
+        superelement = condensed_bay()
+        system = frame(superelement)
+        assert all(
+            placed.superelement is superelement
+            for placed in system.superelement_map.values()
+        )
+        assert not superelement.stiffness_matrix.flags.writeable
+        assert not superelement.free_rotations.any()
+
+    def it_solves_with_a_sparse_backend():
+        expected = frame(condensed_bay())
+        system = frame(condensed_bay())
+        system.set_solver_backend("sparse")
+        assert system.solve() == approx(expected.solve())
+
+    def it_eliminates_rotations_without_stiffness():
+        truss = SystemElements()
+        truss.add_truss_element([[0, 0], [2, 1]], EA=5000)
+        truss.add_truss_element([[2, 1], [4, 0]], EA=5000)
+        truss.point_load(2, Fy=-10)
+        superelement = truss.condense([1, 3])
+        assert superelement.free_rotations.all()
+
+        system = SystemElements()
+        system.add_superelement(superelement)
+        system.add_support_hinged([1, 2])
+        system.solve()
+        # all the translations are supported and the rotations are eliminated
+        assert system.reduced_system_matrix.shape == (0, 0)
+        assert system.get_node_results_system(1)["Fy"] == approx(-5)
+        results = system.get_superelement_results(1)
+        assert results.get_element_results(1)["Nmax"] == approx(-5 * np.sqrt(5))
+
+    def it_rejects_invalid_boundaries():
+        system = SystemElements()
+        bay(system)
+        with raises(FEMException):
+            system.condense([])
+        with raises(FEMException):
+            system.condense([1, 1])
+        with raises(FEMException):
+            system.condense([99])
+
+        chain = SystemElements()
+        chain.add_element([[0, 0], [2, 0]])
+        chain.add_element([[2, 0], [4, 0]])
+        chain.add_internal_hinge(2)
+        with raises(FEMException):
+            # the second element is a mechanism when only the first node is a boundary node
+            chain.condense([1])
+        assert chain.condense([1, 3]).stiffness_matrix.shape == (6, 6)
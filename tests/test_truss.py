@@ -545,6 +545,23 @@ def describe_integration_tests():
                 # Element should have a q_load attribute after applying
                 assert hasattr(element, "q_load")
 
+        def it_solves_with_the_supports_at_the_chord_ends():
+            truss = HoweFlatTruss(width=20, height=2.5, unit_width=2.0)
+            truss.apply_q_load_to_top_chord(q=-10, direction="y")
+            truss.system.solve()
+
+            assert min(truss.system.node_map) == 1
+            reactions = truss.system.reaction_forces
+            assert sorted(reactions) == sorted(
+                node_index + 1 for node_index in truss.support_definitions
+            )
+            top_chord_length = sum(
+                truss.system.element_map[el_id].l
+                for el_id in truss.get_element_ids_of_chord("top")
+            )
+            total_load = sum(r.Fy for r in reactions.values())
+            assert abs(total_load) == approx(10 * top_chord_length)
+
     def describe_roof_truss_integration():
         def it_applies_loads_to_chord_segments():
             truss = QueenPostRoofTruss(width=12, roof_pitch_deg=30)